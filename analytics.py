@@ -0,0 +1,107 @@
+"""
+가격 행렬(날짜 x 기업)로 수익률 상관계수, 공분산, 롤링 베타를 계산합니다.
+
+모든 계산은 기업 쌍을 파이썬에서 반복하지 않고 행렬 곱으로 처리하며,
+상장 시점이 달라 생기는 NaN은 쌍마다 두 기업이 모두 값이 있는 날만 사용합니다(pairwise).
+기업 수가 많을 때는 float32와 열 묶음(chunk) 단위 계산으로 메모리 사용을 제한합니다.
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from indicators import _rolling_sum
+
+# 한 번에 계산하는 결과 행(기업) 수
+DEFAULT_CHUNK_SIZE = 256
+
+
+def log_returns(prices, dtype='float32'):
+    """가격 행렬의 일간 로그 수익률 행렬을 반환합니다. 첫 행(전일 가격 없음)은 제외합니다."""
+    values = prices.to_numpy(dtype='float64')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.diff(np.log(values), axis=0)
+    return pd.DataFrame(returns.astype(dtype), index=prices.index[1:], columns=prices.columns)
+
+
+def _pairwise_moment_blocks(returns, chunk_size):
+    """
+    결과 행을 chunk_size개씩 나눠 쌍별 (공통 관측 수, x 합, y 합, x 제곱합, y 제곱합, xy 합)을
+    행렬 곱으로 계산해 (행 범위, 모멘트들) 형태로 차례로 반환합니다.
+    각 모멘트는 (묶음 크기 x 기업 수) 크기이므로, 중간 메모리는 기업 수의 제곱이 아니라 묶음 크기에 비례합니다.
+    (i, j)는 i와 j가 모두 값이 있는 날만 포함합니다.
+    """
+    values = returns.to_numpy()
+    dtype = values.dtype
+    mask = ~np.isnan(values)
+    x = np.where(mask, values, 0).astype(dtype)
+    m = mask.astype(dtype)
+    x2 = x * x
+
+    for start in range(0, values.shape[1], chunk_size):
+        block = slice(start, start + chunk_size)
+        xb, mb, x2b = x[:, block], m[:, block], x2[:, block]
+        yield block, (
+            mb.T @ m,    # 공통 관측 수
+            xb.T @ m,    # i의 합 (j도 값이 있는 날만)
+            mb.T @ x,    # j의 합 (i도 값이 있는 날만)
+            x2b.T @ m,   # i의 제곱합
+            mb.T @ x2,   # j의 제곱합
+            xb.T @ x,    # i*j의 합
+        )
+
+
+def covariance_matrix(returns, chunk_size=DEFAULT_CHUNK_SIZE):
+    """쌍별 표본 공분산 행렬을 DataFrame으로 반환합니다."""
+    n_cols = returns.shape[1]
+    cov = np.empty((n_cols, n_cols), dtype=returns.to_numpy().dtype)
+    for block, (n, sx, sy, _, _, sxy) in _pairwise_moment_blocks(returns, chunk_size):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            part = (sxy - sx * sy / n) / (n - 1)
+        part[n < 2] = np.nan
+        cov[block] = part
+    return pd.DataFrame(cov, index=returns.columns, columns=returns.columns)
+
+
+def correlation_matrix(returns, chunk_size=DEFAULT_CHUNK_SIZE):
+    """쌍별 피어슨 상관계수 행렬을 DataFrame으로 반환합니다."""
+    n_cols = returns.shape[1]
+    corr = np.empty((n_cols, n_cols), dtype=returns.to_numpy().dtype)
+    for block, (n, sx, sy, sxx, syy, sxy) in _pairwise_moment_blocks(returns, chunk_size):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            numerator = n * sxy - sx * sy
+            denominator = np.sqrt(np.maximum(n * sxx - sx * sx, 0) * np.maximum(n * syy - sy * sy, 0))
+            part = np.clip(numerator / denominator, -1, 1)
+        part[n < 2] = np.nan
+        corr[block] = part
+    return pd.DataFrame(corr, index=returns.columns, columns=returns.columns)
+
+
+def rolling_beta(returns, market_returns, window=60, min_periods=None):
+    """
+    기준 수익률(market_returns) 대비 각 기업의 롤링 베타를 모든 기업에 대해 한 번에 계산합니다.
+    beta = Cov(r_i, r_m) / Var(r_m), 창 안에서 둘 다 값이 있는 날이 min_periods 미만이면 NaN입니다.
+    """
+    if min_periods is None:
+        min_periods = window // 2
+    r = returns.to_numpy(dtype='float64')
+    rm = np.asarray(market_returns, dtype='float64').reshape(-1, 1)
+    mask = ~np.isnan(r) & ~np.isnan(rm)
+    x = np.where(mask, r, 0.0)
+    y = np.where(mask, rm, 0.0)
+
+    n = _rolling_sum(mask.astype('float64'), window)
+    sx, sy = _rolling_sum(x, window), _rolling_sum(y, window)
+    sxy, syy = _rolling_sum(x * y, window), _rolling_sum(y * y, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = (sxy - sx * sy / n) / (syy - sy * sy / n)
+    beta[~(n >= min_periods)] = np.nan
+    return pd.DataFrame(beta, index=returns.index, columns=returns.columns)
+
+
+def equal_weight_market(returns):
+    """값이 있는 기업들의 날짜별 평균 수익률(동일가중 지수)을 반환합니다."""
+    with warnings.catch_warnings():
+        # 모든 기업이 NaN인 날은 경고 없이 NaN으로 둠
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return pd.Series(np.nanmean(returns.to_numpy(dtype='float64'), axis=1), index=returns.index)
@@ -0,0 +1,103 @@
+"""
+관광지 지도(folium)를 만드는 함수들입니다.
+
+선택한 관광지와 번호를 붙인 근처 명소는 개별 마커로 그립니다.
+지도에 보이는 범위의 지점처럼 많은 마커는 viewport_layer()로 GeoJSON 레이어 하나에 담아 보냅니다
+(마커 객체를 하나씩 만들지 않으므로 수천 개도 가볍게 그려짐).
+"""
+import folium
+
+from attractions import distance_label
+
+
+def _number_icon(number, color='blue'):
+    """번호 아이콘입니다 (근처 명소는 파란색, 방문 순서는 초록색)."""
+    return folium.DivIcon(
+        html=f"""
+        <div style="font-size: 12px; color: {color}; background-color: white;
+                    border: 1px solid {color}; border-radius: 50%; width: 24px; height: 24px;
+                    display: flex; align-items: center; justify-content: center;">
+            <b>{number}</b>
+        </div>"""
+    )
+
+
+def build_spot_map(spot, location, nearby_spots, zoom_start=12):
+    """
+    선택한 관광지(빨간 마커)와 근처 명소(번호 마커)를 그린 folium 지도를 만듭니다.
+    근처 명소가 있으면 모두 보이도록 지도 범위를 맞춥니다.
+    """
+    lat, lon = location
+    m = folium.Map(location=[lat, lon], zoom_start=zoom_start)
+
+    # 메인 관광지 마커 추가 (빨간색)
+    folium.Marker(
+        location=[lat, lon],
+        tooltip=f"**{spot}**",
+        popup=f"**{spot}**",
+        icon=folium.Icon(color='red', icon='info-sign')
+    ).add_to(m)
+
+    # 근처 명소 마커 추가 (파란색, 번호 아이콘, 실제 좌표)
+    for i, spot_data in enumerate(nearby_spots):
+        folium.Marker(
+            location=spot_data['location'],
+            tooltip=f"{i+1}. {spot_data['name']}",
+            popup=f"**{i+1}. {spot_data['name']}** ({distance_label(spot_data['distance_km'])})",
+            icon=_number_icon(i + 1)
+        ).add_to(m)
+
+    # 근처 명소가 모두 보이도록 지도 범위 조정
+    if nearby_spots:
+        points = [[lat, lon]] + [spot_data['location'] for spot_data in nearby_spots]
+        m.fit_bounds([[min(p[0] for p in points), min(p[1] for p in points)],
+                      [max(p[0] for p in points), max(p[1] for p in points)]])
+    return m
+
+
+# 지도 범위 레이어에서 지점 종류별 원 색상
+_KIND_COLORS = {'spot': 'red', 'poi': 'gray'}
+
+
+def viewport_layer(rows):
+    """
+    지도 범위 안의 지점([위도, 경도, 이름, 종류] 목록)을 GeoJSON 원 마커 하나의 레이어로 만듭니다.
+    st_folium의 feature_group_to_add로 넘기면 지도를 다시 만들지 않고 이 레이어만 교체됩니다.
+    """
+    layer = folium.FeatureGroup(name="지도 범위의 지점")
+    # 종류별로 GeoJSON 레이어를 나눠 색을 정함 (지점마다 스타일을 계산하지 않음)
+    for kind, color in _KIND_COLORS.items():
+        features = [{
+            'type': 'Feature',
+            'geometry': {'type': 'Point', 'coordinates': [round(lon, 5), round(lat, 5)]},
+            'properties': {'name': name},
+        } for lat, lon, name, row_kind in rows if row_kind == kind]
+        if not features:
+            continue
+        folium.GeoJson(
+            {'type': 'FeatureCollection', 'features': features},
+            marker=folium.CircleMarker(radius=5, color=color, fill=True, fill_color=color, fill_opacity=0.7, weight=1),
+            tooltip=folium.GeoJsonTooltip(fields=['name'], labels=False),
+        ).add_to(layer)
+    return layer
+
+
+def route_layer(rows, legs_km):
+    """
+    방문 순서대로 놓인 지점([위도, 경도, 이름, 종류] 목록)을 잇는 경로 레이어를 만듭니다.
+    legs_km는 각 구간의 직선거리이며, 지점마다 방문 순서 번호를 붙입니다.
+    """
+    layer = folium.FeatureGroup(name="방문 경로")
+    points = [[lat, lon] for lat, lon, _, _ in rows]
+    folium.PolyLine(points, color='green', weight=4, opacity=0.8,
+                    tooltip=f"총 {sum(legs_km):.1f} km").add_to(layer)
+    for i, (lat, lon, name, _) in enumerate(rows):
+        leg = f" (이전 지점에서 {distance_label(legs_km[i - 1])})" if i else " (출발)"
+        folium.Marker(location=[lat, lon], tooltip=f"{i + 1}. {name}{leg}",
+                      icon=_number_icon(i + 1, color='green')).add_to(layer)
+    return layer
+
+
+def map_html_bytes(m):
+    """지도를 HTML로 렌더링했을 때의 크기(바이트)를 반환합니다 (브라우저로 보내는 양의 근사치)."""
+    return len(m.get_root().render().encode('utf-8'))
@@ -0,0 +1,213 @@
+"""
+관광지 데이터 저장소입니다.
+
+관광지는 한 줄에 하나씩 JSON으로 저장합니다 (attractions.jsonl).
+    {"kind": "spot", "country": ..., "city": ..., "name": ..., "location": [위도, 경도],
+     "description": 마크다운, "image_url": ...}
+    {"kind": "poi", "country": ..., "city": ..., "name": ..., "location": [위도, 경도]}
+kind가 spot인 관광지는 선택 목록에 나오고, poi(주변 명소)는 근처 명소 검색에만 쓰입니다.
+
+파일을 처음 열 때 (도시, 관광지) -> 파일 위치 색인과 모든 지점의 좌표 공간 색인만 만들고, 관광지 내용은
+도시를 선택했을 때 그 도시의 줄만 읽어 파싱합니다. 파싱한 결과는 최근 사용한 도시 순으로 캐시합니다.
+근처 명소는 따로 적어 두지 않고, 선택한 관광지 좌표에서 반경 검색으로 찾아 실제 거리를 계산합니다.
+ViewportLoader는 지도에 보이는 영역의 지점을 웹 지도 타일 단위로 읽어 세션마다 캐시합니다.
+"""
+import json
+import os
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+from geo import GeoGridIndex, tile_bounds, tiles_in_bounds
+
+# 기본 관광지 데이터 파일 (환경 변수 ATTRACTIONS_FILE로 변경 가능)
+DEFAULT_ATTRACTIONS_PATH = os.environ.get(
+    "ATTRACTIONS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "attractions.jsonl"))
+
+# 파싱한 관광지 내용을 캐시해 둘 최대 도시 수
+DEFAULT_CITY_CACHE_SIZE = 256
+
+# 근처 명소 검색 기본 반경(km)과 최대 개수
+DEFAULT_NEARBY_RADIUS_KM = 10.0
+DEFAULT_NEARBY_LIMIT = 10
+
+# 직선거리로 이동 시간을 어림할 때의 속도 (km/h)와 도보로 안내하는 최대 거리 (km)
+WALKING_SPEED_KMH = 4.5
+DRIVING_SPEED_KMH = 40.0
+MAX_WALKING_KM = 2.0
+
+# 타일 하나에 표시할 최대 지점 수. 확대할수록 타일이 작아지므로 같은 넓이에 더 많은 지점이 보입니다.
+DEFAULT_POINTS_PER_TILE = 100
+# 지점을 읽는 타일 단계의 범위와 한 화면에서 읽을 최대 타일 수
+MIN_TILE_ZOOM = 2
+MAX_TILE_ZOOM = 16
+MAX_VIEWPORT_TILES = 64
+
+
+def distance_label(distance_km):
+    """직선거리를 '1.2 km · 도보 약 16분' 형태의 안내 문구로 바꿉니다."""
+    if distance_km <= MAX_WALKING_KM:
+        mode, speed = "도보", WALKING_SPEED_KMH
+    else:
+        mode, speed = "차량", DRIVING_SPEED_KMH
+    minutes = max(1, round(distance_km / speed * 60))
+    return f"{distance_km:.1f} km · {mode} 약 {minutes}분"
+
+
+class AttractionStore:
+    """
+    JSON lines 관광지 파일을 도시/관광지 이름으로 색인해 필요한 도시만 읽는 저장소입니다.
+    도시와 관광지의 순서는 파일에 적힌 순서를 따릅니다.
+    """
+
+    def __init__(self, path=DEFAULT_ATTRACTIONS_PATH, cache_size=DEFAULT_CITY_CACHE_SIZE):
+        self.path = path
+        self._build_index()
+        self._load_city = lru_cache(maxsize=cache_size)(self._read_city)
+
+    def _build_index(self):
+        """
+        파일을 한 번 훑어 {도시: {관광지: (바이트 위치, 길이)}} 색인과
+        모든 지점(관광지와 주변 명소)의 이름/도시/종류 목록, 좌표 공간 색인을 만듭니다.
+        """
+        self._index = {}
+        names, cities, kinds, coords = [], [], [], []
+        offset = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    kind = record.get('kind', 'spot')
+                    if kind == 'spot':
+                        self._index.setdefault(record['city'], {})[record['name']] = (offset, len(line))
+                    names.append(record['name'])
+                    cities.append(record['city'])
+                    kinds.append(kind)
+                    coords.append(record['location'])
+                offset += len(line)
+        self._point_names, self._point_cities, self._point_kinds = names, cities, kinds
+        coords = np.asarray(coords, dtype='float64').reshape(-1, 2)
+        self.geo_index = GeoGridIndex(coords[:, 0], coords[:, 1])
+
+    def _read_city(self, city):
+        """city의 관광지 줄만 읽어 {관광지: 레코드}로 반환합니다."""
+        spots = {}
+        with open(self.path, 'rb') as f:
+            for name, (offset, length) in self._index.get(city, {}).items():
+                f.seek(offset)
+                spots[name] = json.loads(f.read(length))
+        return spots
+
+    def __len__(self):
+        """관광지(kind가 spot) 수를 반환합니다 (주변 명소 제외)."""
+        return sum(len(spots) for spots in self._index.values())
+
+    def cities(self):
+        """도시 이름 목록을 반환합니다."""
+        return list(self._index)
+
+    def spot_names(self, city):
+        """city의 관광지 이름 목록을 반환합니다 (없는 도시면 빈 목록)."""
+        return list(self._index.get(city, {}))
+
+    def city_spots(self, city):
+        """city의 {관광지: 레코드}를 반환합니다. 반환값은 캐시와 공유하므로 수정하지 마세요."""
+        return self._load_city(city)
+
+    def get(self, city, spot):
+        """관광지 하나의 레코드를 반환합니다 (없으면 None)."""
+        if spot not in self._index.get(city, {}):
+            return None
+        return self.city_spots(city)[spot]
+
+    def city_point_indices(self, city):
+        """city의 모든 지점(관광지와 주변 명소) 번호를 파일 순서로 반환합니다."""
+        return np.asarray([i for i, point_city in enumerate(self._point_cities) if point_city == city], dtype=np.int64)
+
+    def points_in_bbox(self, south, west, north, east, limit=None):
+        """
+        위경도 영역 안의 지점 번호를 반환합니다. limit개가 넘으면 관광지(spot)를 먼저 고르고,
+        나머지는 칸 순서로 고르게 건너뛰며 골라 영역 전체에 퍼지도록 합니다.
+        """
+        indices = self.geo_index.query_bbox(south, west, north, east)
+        if limit is None or len(indices) <= limit:
+            return indices
+        is_spot = np.fromiter((self._point_kinds[i] == 'spot' for i in indices.tolist()), dtype=bool, count=len(indices))
+        spots, others = indices[is_spot][:limit], indices[~is_spot]
+        n_others = limit - len(spots)
+        picks = np.linspace(0, len(others) - 1, n_others).round().astype(np.int64) if n_others > 0 else []
+        return np.concatenate([spots, others[picks]])
+
+    def point_rows(self, indices):
+        """지점 번호들을 [위도, 경도, 이름, 종류] 목록으로 반환합니다."""
+        lat, lon = self.geo_index.lat[indices].tolist(), self.geo_index.lon[indices].tolist()
+        return [[la, lo, self._point_names[i], self._point_kinds[i]] for la, lo, i in zip(lat, lon, np.asarray(indices).tolist())]
+
+    def nearby(self, city, spot, radius_km=DEFAULT_NEARBY_RADIUS_KM, limit=DEFAULT_NEARBY_LIMIT):
+        """
+        관광지에서 radius_km 이내의 다른 지점(관광지와 주변 명소)을 가까운 순서로 최대 limit개 반환합니다.
+        각 항목은 {'name', 'city', 'kind', 'location', 'distance_km'} dict입니다.
+        """
+        record = self.get(city, spot)
+        if record is None:
+            return []
+        lat, lon = record['location']
+        # 자기 자신도 거리 0으로 검색되므로 하나 더 찾은 뒤 제외
+        indices, distances = self.geo_index.query_radius(lat, lon, radius_km, limit=limit + 1)
+        results = []
+        for i, distance in zip(indices.tolist(), distances.tolist()):
+            if self._point_names[i] == spot and self._point_cities[i] == city:
+                continue
+            results.append({
+                'name': self._point_names[i],
+                'city': self._point_cities[i],
+                'kind': self._point_kinds[i],
+                'location': [float(self.geo_index.lat[i]), float(self.geo_index.lon[i])],
+                'distance_km': distance,
+            })
+        return results[:limit]
+
+
+class ViewportLoader:
+    """
+    지도에 보이는 영역의 지점을 타일 단위로 읽는 세션별 로더입니다.
+    한 번 읽은 타일은 최근 사용 순으로 max_tiles개까지 보관하므로, 지도를 옮기면 새로 보이는 타일만 색인에서 읽습니다.
+    타일마다 지점 수를 points_per_tile개로 제한하므로 축소하면 대표 지점만, 확대하면 더 많은 지점이 보입니다.
+    """
+
+    def __init__(self, store, points_per_tile=DEFAULT_POINTS_PER_TILE, max_tiles=1024):
+        self.store = store
+        self.points_per_tile = points_per_tile
+        self.max_tiles = max_tiles
+        self._tiles = OrderedDict()
+        self.tiles_fetched = 0
+
+    def _tile(self, key):
+        """타일 하나의 지점 번호 배열을 반환합니다 (캐시에 없으면 색인에서 읽음)."""
+        indices = self._tiles.get(key)
+        if indices is None:
+            indices = self.store.points_in_bbox(*tile_bounds(key[1], key[2], key[0]), limit=self.points_per_tile)
+            self._tiles[key] = indices
+            self.tiles_fetched += 1
+            while len(self._tiles) > self.max_tiles:
+                self._tiles.popitem(last=False)
+        else:
+            self._tiles.move_to_end(key)
+        return indices
+
+    def load(self, south, west, north, east, zoom):
+        """
+        영역을 덮는 타일들의 지점을 읽어 ([위도, 경도, 이름, 종류] 목록, 타일 수, 새로 읽은 타일 수)를 반환합니다.
+        화면에 타일이 너무 많이 걸치면 한 단계 낮은 타일을 사용합니다.
+        """
+        tile_zoom = min(max(int(zoom), MIN_TILE_ZOOM), MAX_TILE_ZOOM)
+        tiles = tiles_in_bounds(south, west, north, east, tile_zoom)
+        while len(tiles) > MAX_VIEWPORT_TILES and tile_zoom > MIN_TILE_ZOOM:
+            tile_zoom -= 1
+            tiles = tiles_in_bounds(south, west, north, east, tile_zoom)
+        fetched_before = self.tiles_fetched
+        parts = [self._tile(key) for key in tiles]
+        # 타일 경계 위의 지점은 양쪽 타일에 모두 들어 있을 수 있으므로 중복 제거
+        indices = np.unique(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+        return self.store.point_rows(indices), len(tiles), self.tiles_fetched - fetched_before
@@ -0,0 +1,1307 @@
+"""
+네트워크 없이 앱의 주요 경로 성능을 측정하는 벤치마크 스크립트입니다.
+
+사용 예:
+    python bench.py download
+    python bench.py matrix --tickers 500 --years 10
+    python bench.py downsample --years 30 --width 1200
+    python bench.py live --hours 12
+    python bench.py indicators --tickers 1000
+    python bench.py correlation --tickers 500
+    python bench.py startup --repeat 5
+    python bench.py attractions
+    python bench.py geo --points 100000
+    python bench.py map
+    python bench.py viewport --points 100000
+    python bench.py images --images 24
+    python bench.py route --stops 50 200 500
+    python bench.py search --docs 10000
+    python bench.py quiz --questions 1000 10000
+    python bench.py slider --reruns 100
+    python bench.py curves
+    python bench.py quizstore --students 300
+    python bench.py pipeline --tickers 20 --slow 5
+    python bench.py sessions --sessions 50
+    python bench.py exports --tickers 500 --years 10
+    python bench.py pages --reruns 20
+    python bench.py pages --update-baseline
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+import analytics
+import attraction_map
+import attractions
+import copy
+import exports
+import fetch_pipeline
+import frame_cache
+import geo
+import image_cache
+import indicators
+import itinerary
+import live_feed
+import search_index
+import market_data
+import price_store
+import quadratic_charts
+import quiz_bank
+import quiz_store
+import stock_charts
+import stock_data
+
+
+def bench_download(latency):
+    """합성 공급자(요청당 latency초 지연)로 티커별 순차 요청과 묶음 요청의 콜드 로드 시간을 비교합니다."""
+    end = pd.Timestamp.today().normalize()
+    start = end - pd.Timedelta(days=3 * 365)
+    for n in (10, 100):
+        tickers = [f"T{i:03d}" for i in range(n)]
+
+        provider = market_data.SyntheticProvider(latency)
+        t0 = time.perf_counter()
+        for ticker in tickers:
+            stock_data.download_stock_data([ticker], start, end, downloader=provider.download)
+        serial = time.perf_counter() - t0
+
+        provider = market_data.SyntheticProvider(latency)
+        t0 = time.perf_counter()
+        for batch in stock_data.chunked(tickers, stock_data.DEFAULT_BATCH_SIZE):
+            stock_data.download_stock_data(batch, start, end, downloader=provider.download)
+        batched = time.perf_counter() - t0
+
+        print(f"{n:>4} tickers | serial {serial:7.3f}s | batched {batched:7.3f}s "
+              f"({provider.calls} calls)")
+
+
+def make_price_frames(n_tickers, years, seed=0):
+    """n_tickers개 기업의 합성 일봉 데이터를 만듭니다. 일부 기업은 기간 중간에 상장한 것으로 둡니다."""
+    index = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=252 * years)
+    rng = np.random.default_rng(seed)
+    frames = {}
+    for i in range(n_tickers):
+        price = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(index))))
+        listed_at = rng.integers(0, len(index) // 2) if i % 10 == 0 else 0
+        frames[f"T{i:03d}"] = pd.DataFrame({'Price': price[listed_at:]}, index=index[listed_at:])
+    return frames
+
+
+def _measure(func):
+    """func 실행 시간(초)과 최대 할당 메모리(MB)를 반환합니다."""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def bench_matrix(n_tickers, years, figures):
+    """컬럼 단위 추가 + iloc[0] 정규화와 한 번의 concat + 벡터화 정규화를 비교합니다."""
+    frames = make_price_frames(n_tickers, years)
+
+    def column_by_column():
+        all_price_data = pd.DataFrame()
+        with warnings.catch_warnings():
+            # 컬럼을 반복 추가할 때 나오는 PerformanceWarning(조각화 경고)은 숨깁니다.
+            warnings.simplefilter('ignore', pd.errors.PerformanceWarning)
+            for name, df in frames.items():
+                all_price_data[name] = df['Price']
+        normalized = all_price_data.dropna(axis=1, how='all')
+        normalized = normalized / normalized.iloc[0] * 100
+        if figures:
+            fig = go.Figure()
+            for col in normalized.columns:
+                fig.add_trace(go.Scatter(x=normalized.index, y=normalized[col], mode='lines', name=col))
+
+    def single_concat():
+        normalized = stock_data.normalize_to_base(stock_data.build_price_matrix(frames))
+        if figures:
+            stock_charts.normalized_price_figure(normalized)
+
+    print(f"{n_tickers} tickers x {years} years")
+    for label, func in (("column-by-column", column_by_column), ("single concat", single_concat)):
+        elapsed, peak_mb = _measure(func)
+        print(f"  {label:<17} {elapsed:7.3f}s  peak {peak_mb:8.1f} MB")
+
+
+def bench_downsample(years, width):
+    """상세 차트와 정규화 차트의 다운샘플링 전후 JSON 크기와 생성 시간을 비교합니다."""
+    frames = make_price_frames(10, years)
+    data = frames['T001']
+    close = data['Price']
+    data = data.assign(Open=close * 0.995, High=close * 1.01, Low=close * 0.99, Close=close)
+    normalized = stock_data.normalize_to_base(stock_data.build_price_matrix(frames))
+    max_points = width * 2
+    max_candles = width // stock_charts.PIXELS_PER_CANDLE
+
+    cases = (
+        ("line", lambda: stock_charts.price_line_figure("T001", data),
+         lambda: stock_charts.price_line_figure("T001", data, max_points=max_points)),
+        ("candlestick", lambda: stock_charts.candlestick_figure("T001", data),
+         lambda: stock_charts.candlestick_figure("T001", data, max_bars=max_candles)),
+        ("normalized x10", lambda: stock_charts.normalized_price_figure(normalized),
+         lambda: stock_charts.normalized_price_figure(normalized, max_points=max_points)),
+    )
+    print(f"{len(data)} bars, width {width}px")
+    for label, full, reduced in cases:
+        t0 = time.perf_counter()
+        full_kb = stock_charts.figure_payload_bytes(full()) / 1024
+        t1 = time.perf_counter()
+        reduced_kb = stock_charts.figure_payload_bytes(reduced()) / 1024
+        t2 = time.perf_counter()
+        print(f"  {label:<15} {full_kb:9.1f} KB ({t1 - t0:.3f}s) -> {reduced_kb:9.1f} KB ({t2 - t1:.3f}s)")
+
+
+def bench_live(hours):
+    """합성 분봉으로 실시간 모드를 hours시간 돌리며 갱신 1회당 처리 시간과 전송 크기를 기록합니다."""
+    source = live_feed.SyntheticTickSource("LIVE")
+    buffer = live_feed.BarBuffer()
+    fig = stock_charts.live_candlestick_figure("LIVE")
+    now = pd.Timestamp.now().floor('D') + pd.Timedelta(hours=9, minutes=30)
+    for minute in range(hours * 60 + 1):
+        tick_time = now + pd.Timedelta(minutes=minute)
+        t0 = time.perf_counter()
+        buffer.extend(source.fetch_new_bars(since=buffer.last_time, now=tick_time))
+        times, values = buffer.arrays()
+        stock_charts.update_live_figure(fig, times, values)
+        payload_kb = stock_charts.figure_payload_bytes(fig) / 1024
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        if minute % 60 == 0:
+            print(f"  {minute // 60:>2}h  bars {len(buffer):>4}  update {elapsed_ms:6.1f} ms  payload {payload_kb:7.1f} KB")
+
+
+def bench_indicators(n_tickers, years):
+    """지표별로 전체 계산과 새 봉 1개 증분 계산의 기업당 비용을 측정합니다."""
+    frames = make_price_frames(n_tickers, years)
+    print(f"{n_tickers} tickers x {years} years (per-ticker cost)")
+    for name in indicators.INDICATORS:
+        engine = indicators.IndicatorEngine(max_entries=n_tickers)
+        t0 = time.perf_counter()
+        for ticker, df in frames.items():
+            engine.compute(ticker, name, df['Price'].iloc[:-1])
+        full = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for ticker, df in frames.items():
+            engine.compute(ticker, name, df['Price'])
+        incremental = time.perf_counter() - t0
+        print(f"  {name:<11} full {full / n_tickers * 1e6:8.1f} us  "
+              f"+1 bar {incremental / n_tickers * 1e6:8.1f} us  ({engine.incremental_updates} incremental)")
+
+
+def bench_correlation(n_tickers, years):
+    """상관계수/공분산/롤링 베타 계산 시간과 최대 메모리를 float64와 float32로 비교합니다."""
+    prices = stock_data.build_price_matrix(make_price_frames(n_tickers, years))
+    print(f"{n_tickers} tickers x {years} years")
+    for dtype in ('float64', 'float32'):
+        returns = analytics.log_returns(prices, dtype=dtype)
+        for label, func in (
+            ("correlation", lambda: analytics.correlation_matrix(returns)),
+            ("covariance", lambda: analytics.covariance_matrix(returns)),
+            ("rolling beta", lambda: analytics.rolling_beta(returns, analytics.equal_weight_market(returns))),
+        ):
+            elapsed, peak_mb = _measure(func)
+            print(f"  {dtype:<8} {label:<13} {elapsed:7.3f}s  peak {peak_mb:8.1f} MB")
+
+
+# 새 파이썬 프로세스에서 페이지 스크립트를 한 번 실행하고 걸린 시간을 출력하는 코드 (콜드 스타트 측정용)
+_STARTUP_SCRIPT = """
+import sys, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+t1 = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=120).run()
+t2 = time.perf_counter()
+print(t1 - t0, t2 - t1, len(at.exception))
+"""
+
+
+def bench_startup(repeat, root):
+    """
+    페이지마다 새 프로세스에서 첫 실행(콜드 스타트)에 걸리는 시간을 측정합니다.
+    streamlit 자체 import 시간과 페이지 스크립트 첫 실행 시간(페이지가 import하는 모듈 포함)을 나눠 보여줍니다.
+    주식 페이지는 합성 공급자와 매번 비어 있는 임시 가격 저장소를 사용합니다.
+    """
+    pages = [os.path.join(root, 'main.py')] + sorted(
+        os.path.join(root, 'pages', name) for name in os.listdir(os.path.join(root, 'pages')) if name.endswith('.py'))
+    print(f"{root} (median of {repeat})")
+    for page in pages:
+        base_times, run_times, errors = [], [], 0
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory() as store_dir:
+                env = dict(os.environ, MARKET_DATA_PROVIDER='synthetic', PRICE_STORE_DIR=store_dir)
+                out = subprocess.run([sys.executable, '-c', _STARTUP_SCRIPT, page], cwd=root, env=env,
+                                     capture_output=True, text=True, check=True).stdout.split()
+            base_times.append(float(out[-3]))
+            run_times.append(float(out[-2]))
+            errors += int(out[-1])
+        note = f"  ({errors} runs raised)" if errors else ""
+        print(f"  {os.path.basename(page):<22} streamlit import {statistics.median(base_times):6.2f}s  "
+              f"first run {statistics.median(run_times):6.2f}s{note}")
+
+
+def make_attraction_records(n_spots, spots_per_city=10, seed=0):
+    """n_spots개의 합성 관광지 레코드를 만듭니다 (도시마다 spots_per_city개, 설명은 실제 데이터와 비슷한 길이)."""
+    rng = np.random.default_rng(seed)
+    description = "**관광지 설명**\n\n" + "여행자를 위한 안내 문장입니다. " * 40
+    records = []
+    for i in range(n_spots):
+        lat, lon = 42 + rng.random() * 9, -4 + rng.random() * 12
+        records.append({
+            'country': "프랑스", 'city': f"도시 {i // spots_per_city:05d}", 'name': f"관광지 {i:05d}",
+            'location': [lat, lon], 'description': description,
+            'image_url': f"https://example.com/{i}.jpg",
+            'nearby': [{'name': f"근처 {i}-{k}", 'distance': "도보 5분"} for k in range(3)],
+        })
+    return records
+
+
+def bench_attractions(sizes, reruns):
+    """
+    관광지 수에 따른 재실행 1회 비용을 비교합니다.
+    기존 방식은 모든 관광지를 담은 dict 리터럴을 매 실행마다 다시 만들고,
+    저장소 방식은 색인(프로세스당 한 번)을 만든 뒤 도시 목록과 선택한 도시의 관광지만 읽습니다.
+    """
+    print(f"median of {reruns} reruns")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_spots in sizes:
+            records = make_attraction_records(n_spots)
+            cities = {}
+            for record in records:
+                cities.setdefault(record['city'], {})[record['name']] = record
+            literal = compile(f"cities = {cities!r}", "<cities>", "exec")
+            path = os.path.join(tmp, f"attractions_{n_spots}.jsonl")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+            def literal_rerun():
+                namespace = {}
+                exec(literal, namespace)
+                city = next(iter(namespace['cities']))
+                return namespace['cities'][city]
+
+            t0 = time.perf_counter()
+            store = attractions.AttractionStore(path)
+            index_ms = (time.perf_counter() - t0) * 1000
+            # cache_size=0이면 매번 파일에서 도시를 다시 읽음 (도시를 처음 선택했을 때의 비용)
+            uncached_store = attractions.AttractionStore(path, cache_size=0)
+
+            def store_rerun(store=store):
+                city = store.cities()[0]
+                store.spot_names(city)
+                return store.city_spots(city)
+
+            timings = {}
+            for label, func in (("dict literal", literal_rerun), ("store", store_rerun),
+                                ("uncached", lambda: store_rerun(uncached_store))):
+                samples = []
+                for _ in range(reruns):
+                    t0 = time.perf_counter()
+                    func()
+                    samples.append((time.perf_counter() - t0) * 1000)
+                timings[label] = statistics.median(samples)
+            print(f"  {n_spots:>6} spots | dict literal {timings['dict literal']:8.3f} ms | "
+                  f"store {timings['store']:7.3f} ms (uncached city {timings['uncached']:6.3f} ms, "
+                  f"index build {index_ms:6.1f} ms once per process)")
+
+
+def bench_geo(n_points, n_queries, radii):
+    """
+    n_points개 지점(절반은 도시 주변에 몰림)에서 반경 검색 1회의 시간을
+    모든 지점 haversine 계산(전수 조사)과 격자 색인으로 비교하고, 두 결과가 같은지 확인합니다.
+    """
+    rng = np.random.default_rng(0)
+    n_uniform = n_points // 2
+    centers = rng.uniform((42.0, -4.0), (51.0, 8.0), size=(50, 2))
+    clustered = centers[rng.integers(0, len(centers), n_points - n_uniform)] + rng.normal(0, 0.05, (n_points - n_uniform, 2))
+    points = np.vstack([rng.uniform((42.0, -4.0), (51.0, 8.0), size=(n_uniform, 2)), clustered])
+    queries = points[rng.integers(0, n_points, n_queries)]
+
+    t0 = time.perf_counter()
+    index = geo.GeoGridIndex(points[:, 0], points[:, 1])
+    build_ms = (time.perf_counter() - t0) * 1000
+    print(f"{n_points} points, {n_queries} queries (index build {build_ms:.1f} ms)")
+
+    for radius in radii:
+        brute, grid, found = [], [], 0
+        for lat, lon in queries:
+            t0 = time.perf_counter()
+            distances = geo.haversine_km(lat, lon, points[:, 0], points[:, 1])
+            expected = np.flatnonzero(distances <= radius)
+            t1 = time.perf_counter()
+            indices, _ = index.query_radius(lat, lon, radius)
+            t2 = time.perf_counter()
+            brute.append(t1 - t0)
+            grid.append(t2 - t1)
+            found += len(indices)
+            assert np.array_equal(np.sort(indices), expected)
+        print(f"  radius {radius:5.1f} km | brute force {statistics.median(brute) * 1000:7.3f} ms | "
+              f"grid index {statistics.median(grid) * 1000:7.3f} ms | avg {found / n_queries:8.1f} hits")
+
+
+def bench_map(sizes):
+    """
+    마커 수별로 folium 지도 생성+렌더링 시간과 HTML 크기를 비교합니다.
+    개별 마커(기존 방식), viewport_layer()의 GeoJSON 레이어, 캐시된 지도의 복사본 렌더링(재실행 시 경로)을 측정합니다.
+    """
+    import folium
+
+    rng = np.random.default_rng(0)
+    center = [48.8566, 2.3522]
+    for n_markers in sizes:
+        points = [[center[0] + rng.normal(0, 0.05), center[1] + rng.normal(0, 0.05), f"지점 {i}", 'poi']
+                  for i in range(n_markers)]
+
+        def individual_markers():
+            m = folium.Map(location=center, zoom_start=12)
+            for lat, lon, name, _ in points:
+                folium.Marker(location=[lat, lon], tooltip=name).add_to(m)
+            return attraction_map.map_html_bytes(m)
+
+        def geojson_layer():
+            m = attraction_map.build_spot_map("중심", center, [])
+            attraction_map.viewport_layer(points).add_to(m)
+            return attraction_map.map_html_bytes(m)
+
+        cached = attraction_map.build_spot_map("중심", center, [])
+        attraction_map.viewport_layer(points).add_to(cached)
+
+        print(f"{n_markers} markers")
+        for label, func in (("markers", individual_markers), ("geojson", geojson_layer),
+                            ("cached copy", lambda: attraction_map.map_html_bytes(copy.deepcopy(cached)))):
+            t0 = time.perf_counter()
+            size = func()
+            elapsed = time.perf_counter() - t0
+            print(f"  {label:<12} build+render {elapsed * 1000:8.1f} ms  HTML {size / 1024:8.1f} KB")
+
+
+def bench_viewport(n_points, steps, zoom):
+    """
+    n_points개 지점에서 지도를 steps번 옮길 때 한 번 갱신에 걸리는 시간을 비교합니다.
+    매번 화면 전체를 다시 읽는 경우(캐시 없음)와 세션 타일 캐시로 새 타일만 읽는 경우를 측정합니다.
+    """
+    rng = np.random.default_rng(0)
+    centers = rng.uniform((43.0, -1.0), (49.0, 7.0), size=(30, 2))
+    coords = centers[rng.integers(0, len(centers), n_points)] + rng.normal(0, 0.1, (n_points, 2))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "points.jsonl")
+        with open(path, 'w', encoding='utf-8') as f:
+            for i, (lat, lon) in enumerate(coords):
+                f.write(json.dumps({'kind': 'poi', 'city': f"도시 {i % 30}", 'name': f"지점 {i}",
+                                    'location': [lat, lon]}, ensure_ascii=False) + "\n")
+        store = attractions.AttractionStore(path)
+
+    # 700x600 픽셀 지도가 zoom 단계에서 덮는 위경도 범위 (타일 한 장 256픽셀)
+    width = 700 / 256 * 360 / 2 ** zoom
+    height = width * 600 / 700 * 0.66
+    south, west = centers[0][0] - height / 2, centers[0][1] - width / 2
+    print(f"{n_points} points, {steps} pans of 20% at zoom {zoom}")
+
+    cached = attractions.ViewportLoader(store)
+    for label, make_loader in (("full reload", lambda: attractions.ViewportLoader(store)),
+                               ("tile cache", lambda: cached)):
+        samples, fetched, shown = [], 0, 0
+        for step in range(steps):
+            box_west = west + step * width * 0.2
+            loader = make_loader()
+            t0 = time.perf_counter()
+            rows, _, new_tiles = loader.load(south, box_west, south + height, box_west + width, zoom)
+            attraction_map.viewport_layer(rows)
+            samples.append(time.perf_counter() - t0)
+            fetched += new_tiles
+            shown += len(rows)
+        print(f"  {label:<12} per pan {statistics.median(samples) * 1000:7.2f} ms  "
+              f"tiles read {fetched:4d}  avg points {shown / steps:7.1f}")
+
+
+def bench_images(n_images, latency, workers):
+    """
+    로컬 HTTP 서버(요청당 latency초 지연)가 내려주는 이미지로 이미지 캐시를 측정합니다.
+    원본을 매번 받는 경우와 캐시 첫 요청(받기 + 썸네일), 캐시 재요청, 미리 받기(prewarm) 동시 요청 수별 시간,
+    그리고 깨진 링크(404, 이미지가 아닌 응답, 시간 초과)가 섞인 링크 상태 점검 결과를 보여 줍니다.
+    """
+    import http.server
+    import io
+    import threading
+    from PIL import Image
+
+    rng = np.random.default_rng(0)
+    images = {}
+    for i in range(n_images):
+        pixels = rng.integers(0, 256, (1600 // 8, 2400 // 8, 3), dtype=np.uint8)
+        out = io.BytesIO()
+        Image.fromarray(pixels).resize((2400, 1600)).save(out, format='JPEG', quality=90)
+        images[f"/img/{i}.jpg"] = out.getvalue()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency * (20 if self.path == '/slow.jpg' else 1))
+            if self.path == '/not-image.jpg':
+                body, content_type = b"<html>moved</html>", 'text/html'
+            elif self.path in images:
+                body, content_type = images[self.path], 'image/jpeg'
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [base + path for path in images]
+    avg_kb = sum(map(len, images.values())) / len(images) / 1024
+    print(f"{n_images} images of 2400x1600 (avg {avg_kb:.0f} KB), {latency * 1000:.0f} ms server latency")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = image_cache.ImageCache(os.path.join(tmp, "one"), timeout=latency * 10)
+            t0 = time.perf_counter()
+            for url in urls:
+                cache._download(url)
+            remote = (time.perf_counter() - t0) / n_images
+            t0 = time.perf_counter()
+            paths = [cache.get(url) for url in urls]
+            cold = (time.perf_counter() - t0) / n_images
+            t0 = time.perf_counter()
+            for url in urls:
+                cache.get(url)
+            warm = (time.perf_counter() - t0) / n_images
+            thumb_kb = sum(os.path.getsize(path) for path in paths) / n_images / 1024
+            print(f"  remote every run  {remote * 1000:8.2f} ms/image  {avg_kb:7.0f} KB")
+            print(f"  cache first get   {cold * 1000:8.2f} ms/image  {thumb_kb:7.0f} KB thumbnail")
+            print(f"  cache warm get    {warm * 1000:8.2f} ms/image")
+
+            for n_workers in sorted({1, workers}):
+                cache = image_cache.ImageCache(os.path.join(tmp, f"prewarm{n_workers}"), timeout=latency * 10)
+                t0 = time.perf_counter()
+                cache.prewarm(urls, workers=n_workers)
+                print(f"  prewarm {n_workers:2d} workers {time.perf_counter() - t0:8.2f} s")
+
+            broken = [base + path for path in ('/missing.jpg', '/not-image.jpg', '/slow.jpg')]
+            records = cache.prewarm(urls[:3] + broken, workers=workers, force=True)
+            print(image_cache.format_health_report(records).replace(base, ""))
+    finally:
+        server.shutdown()
+
+
+def bench_route(stop_counts, city_points):
+    """
+    city_points개 지점이 있는 도시에서 stop_counts개씩 골라 방문 순서를 계산하는 시간을 측정합니다.
+    요청마다 드는 고른 지점 사이의 거리 행렬 계산, 최근접 이웃 + 2-opt 시간, 경로 길이를 비교합니다.
+    """
+    rng = np.random.default_rng(0)
+    lat, lon = rng.uniform(48.80, 48.91, city_points), rng.uniform(2.25, 2.42, city_points)
+    print(f"{city_points} city points")
+    for n_stops in stop_counts:
+        stops = rng.choice(city_points, size=min(n_stops, city_points), replace=False)
+        t0 = time.perf_counter()
+        dist = itinerary.distance_matrix(lat[stops], lon[stops])
+        t_matrix = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        nn = itinerary.nearest_neighbour_tour(dist)
+        t_nn = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        route, legs = itinerary.plan_route(dist, range(1, len(stops)), 0)
+        t_plan = time.perf_counter() - t0
+        print(f"  {len(stops):4d} stops  distance matrix {t_matrix * 1000:6.1f} ms"
+              f"  nearest neighbour {t_nn * 1000:6.1f} ms {itinerary.tour_length(dist, nn).sum():7.1f} km"
+              f"  + 2-opt {t_plan * 1000:6.1f} ms {legs.sum():7.1f} km")
+
+
+def bench_search(n_docs, n_queries):
+    """
+    n_docs개 합성 관광지(실제 설명의 단어를 섞어 만든 이름과 설명)로 검색 색인을 측정합니다.
+    색인 생성/저장/읽기 시간, 검색어 1개당 시간(전체 문서 부분 문자열 검색과 비교),
+    관광지 이름에서 한 글자를 바꾼 오타 검색어로 원래 관광지를 찾는 비율을 보여 줍니다.
+    """
+    rng = np.random.default_rng(0)
+    with open(attractions.DEFAULT_ATTRACTIONS_PATH, encoding='utf-8') as f:
+        words = sorted({word for line in f for word in search_index._WORD_RE.findall(json.loads(line).get('description', ''))
+                        if len(word) >= 2 and search_index._HANGUL_RE.search(word)})
+    records = [{'city': f"도시 {i // 10:04d}", 'name': " ".join(rng.choice(words, 2)) + f" {i}",
+                'description': " ".join(rng.choice(words, 150))} for i in range(n_docs)]
+    print(f"{n_docs} documents, {len(words)} distinct words, {n_queries} queries")
+
+    t0 = time.perf_counter()
+    index = search_index.SearchIndex.build(records)
+    t_build = time.perf_counter() - t0
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "index.npz")
+        index.save(path, "bench")
+        t0 = time.perf_counter()
+        index = search_index.SearchIndex.load(path, "bench")
+        t_load = time.perf_counter() - t0
+        size = os.path.getsize(path)
+    print(f"  build {t_build:.2f} s, saved {size / 1024 / 1024:.1f} MB, load {t_load * 1000:.0f} ms")
+
+    targets = rng.integers(0, n_docs, n_queries)
+    exact = [records[i]['name'].rsplit(" ", 1)[0] for i in targets]
+    typo = []
+    for query in exact:
+        chars = list(query)
+        positions = [k for k, ch in enumerate(chars) if '가' <= ch <= '힣']
+        k = positions[rng.integers(len(positions))]
+        chars[k] = chr(ord('가') + int(rng.integers(0, 11172)))
+        typo.append("".join(chars))
+
+    texts = [record['name'] + " " + record['description'] for record in records]
+    samples = []
+    for query in exact:
+        t0 = time.perf_counter()
+        [i for i, text in enumerate(texts) if query in text]
+        samples.append(time.perf_counter() - t0)
+    print(f"  substring scan      {statistics.median(samples) * 1000:7.2f} ms/query (exact text only)")
+    for label, queries in (("index exact name", exact), ("index 1-char typo", typo)):
+        samples, top1, top10 = [], 0, 0
+        for target, query in zip(targets, queries):
+            t0 = time.perf_counter()
+            results = index.search(query, limit=10)
+            samples.append(time.perf_counter() - t0)
+            # 이름 단어 두 개가 같은 다른 관광지도 있으므로 같은 단어 조합이면 맞은 것으로 셈
+            names = [name.rsplit(" ", 1)[0] for _, name, _ in results]
+            top1 += bool(names) and names[0] == exact[list(targets).index(target)]
+            top10 += exact[list(targets).index(target)] in names
+        print(f"  {label:<19} {statistics.median(samples) * 1000:7.2f} ms/query (p95 "
+              f"{np.percentile(samples, 95) * 1000:.2f})  top-1 {top1 / n_queries:5.1%}  top-10 {top10 / n_queries:5.1%}")
+
+
+def bench_quiz(sizes, reruns):
+    """
+    이차함수 퀴즈 문제 n개를 만드는 비용과 재실행 1회의 곡선 계산 비용을 비교합니다.
+    기존 방식은 문제마다 random.choice로 계수를 고르고 재실행마다 400점 곡선을 새로 계산하고,
+    문제 은행은 계수/정답/꼭짓점/근/곡선을 NumPy로 한 번에 만든 뒤 재실행에서는 행 하나를 꺼냅니다.
+    """
+    import random
+
+    tier = quiz_bank.DIFFICULTY_TIERS[quiz_bank.DEFAULT_DIFFICULTY]
+    for n in sizes:
+        t0 = time.perf_counter()
+        for _ in range(n):
+            a, b, c = random.choice(tier['a']), random.choice(tier['b']), random.choice(tier['c'])
+            signs = [quiz_bank.sign_label(v) for v in (a, b, c)]
+            x = np.linspace(-10, 10, 400)
+            y = a * x**2 + b * x + c
+        t_loop = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        bank = quiz_bank.generate_bank(n)
+        t_bank = time.perf_counter() - t0
+        print(f"{n:6d} questions  one by one {t_loop * 1000:8.1f} ms  bank {t_bank * 1000:7.1f} ms  "
+              f"({bank['y'].nbytes / 1024 / 1024:.1f} MB of curves)")
+
+    a, b, c = 2, -3, 1
+    samples = []
+    for _ in range(reruns):
+        t0 = time.perf_counter()
+        x = np.linspace(-10, 10, 400)
+        y = a * x**2 + b * x + c
+        samples.append(time.perf_counter() - t0)
+    t_fresh = statistics.median(samples)
+    samples = []
+    for i in range(reruns):
+        t0 = time.perf_counter()
+        quiz_bank.question(bank, i)
+        x, y = bank['x'], bank['y'][i]
+        samples.append(time.perf_counter() - t0)
+    print(f"per rerun: fresh curve {t_fresh * 1e6:.1f} us  bank lookup {statistics.median(samples) * 1e6:.1f} us")
+
+
+def bench_slider(reruns, root):
+    """
+    이차함수 페이지에서 위젯을 한 번 조작할 때의 재실행 시간(AppTest)을 측정합니다.
+    포물선 닮음 탐구는 a1 슬라이더를 앞뒤로 끌고, 퀴즈는 부호 선택을 바꿉니다.
+    --root에 이전 버전 체크아웃을 주면 변경 전후를 비교할 수 있습니다.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    page = os.path.join(root, 'pages', '01_이차함수.py')
+    sys.path.insert(0, root)
+    at = AppTest.from_file(page, default_timeout=120).run()
+    at = at.sidebar.radio[0].set_value("포물선 닮음 탐구").run()
+    samples = []
+    for i in range(reruns):
+        # -4.5 ~ 4.5를 0.5 간격으로 왕복 (슬라이더 끌기)
+        step = i % 36
+        at.slider(key="sim_a1").set_value(-4.5 + 0.5 * (step if step < 18 else 36 - step) or 0.1)
+        t0 = time.perf_counter()
+        at = at.run()
+        samples.append(time.perf_counter() - t0)
+    print(f"{root} (median of {reruns} reruns)")
+    print(f"  similarity slider drag {statistics.median(samples) * 1000:7.1f} ms  p95 {np.percentile(samples, 95) * 1000:7.1f} ms")
+
+    at = at.sidebar.radio[0].set_value("이차함수 퀴즈").run()
+    samples = []
+    for i in range(reruns):
+        at.selectbox(key="a_select").set_value(["양수", "음수"][i % 2])
+        t0 = time.perf_counter()
+        at = at.run()
+        samples.append(time.perf_counter() - t0)
+    print(f"  quiz answer change     {statistics.median(samples) * 1000:7.1f} ms  p95 {np.percentile(samples, 95) * 1000:7.1f} ms")
+
+
+def bench_curves(zooms, width, height):
+    """
+    포물선 닮음 탐구의 보기 범위(확대 배율별)에서 곡선 샘플링 방식을 비교합니다.
+    균등 샘플링(x 범위를 같은 간격으로)과 뷰포트 기준 적응형 샘플링의 점 수, 화면 안에 들어오는 점 수,
+    그리고 width x height 픽셀 화면에서 선분으로 이은 곡선과 실제 곡선의 최대 차이(픽셀)를 보여 줍니다.
+    """
+    def max_error_px(x, y, a, b, c, x_range, y_range):
+        dense_x = np.linspace(*x_range, 200001)
+        dense_y = (a * dense_x + b) * dense_x + c
+        shown = (dense_y >= y_range[0]) & (dense_y <= y_range[1])
+        if not shown.any():
+            return 0.0
+        px, py = width / (x_range[1] - x_range[0]), height / (y_range[1] - y_range[0])
+        # 세로 차이를 곡선의 기울기로 나눠 곡선에 수직인 거리로 바꿈
+        slope = py / px * (2 * a * dense_x + b)
+        error = np.abs(np.interp(dense_x, x, y) - dense_y) * py / np.sqrt(1 + slope * slope)
+        return error[shown].max()
+
+    aspect = width / height
+    parabolas = ((1.0, 0.0, 0.0), (5.0, 2.0, -3.0), (-3.0, 8.0, 5.0))
+    print(f"{width}x{height} px view, worst of {len(parabolas)} parabolas per zoom")
+    print(f"  {'zoom':>5}  {'uniform 400':>24}  {'uniform 120':>24}  {'adaptive 120':>24}")
+    for zoom in zooms:
+        x_range, y_range = (-10 / zoom, 10 / zoom), (-20 / zoom, 20 / zoom)
+        cells = []
+        for label, sample in (("uniform 400", lambda a, b, c: quadratic_charts.curve(a, b, c, *x_range, 400)),
+                              ("uniform 120", lambda a, b, c: quadratic_charts.curve(a, b, c, *x_range, 120)),
+                              ("adaptive 120", lambda a, b, c: quadratic_charts.adaptive_curve(
+                                  a, b, c, x_range, y_range, aspect=aspect))):
+            errors, in_view = [], []
+            for a, b, c in parabolas:
+                x, y = sample(a, b, c)
+                errors.append(max_error_px(x, y, a, b, c, x_range, y_range))
+                in_view.append(int(((y >= y_range[0]) & (y <= y_range[1])).sum()))
+            cells.append(f"{max(errors):7.3f} px, {min(in_view):3d}-{max(in_view):3d} shown")
+        print(f"  {zoom:5.1f}  " + "  ".join(f"{cell:>24}" for cell in cells))
+
+
+def bench_quizstore(students, answers, rows):
+    """
+    퀴즈 기록 저장소를 students개 스레드(세션)가 동시에 쓸 때 답 하나를 기록하는 시간(재실행 안에서 기다리는 시간)을
+    답마다 바로 쓰는 경우(batch_size=1)와 모아서 쓰는 경우로 비교하고,
+    rows개 답이 쌓인 뒤 학급 통계 쿼리 시간을 색인이 있을 때와 없을 때로 비교합니다.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    bank = quiz_bank.generate_bank(100)
+    questions = [quiz_bank.question(bank, i) for i in range(100)]
+    signs = ["양수", "음수", "0"]
+
+    def student(store, k):
+        quiz = quiz_store.QuizSession(session_id=f"s{k:05d}", student=f"학생 {k}",
+                                      difficulty=quiz_bank.DEFAULT_DIFFICULTY)
+        rng = np.random.default_rng(k)
+        samples = []
+        for i in range(answers):
+            question = questions[(k + i) % len(questions)]
+            picks = {c: signs[rng.integers(3)] for c in 'abc'}
+            t0 = time.perf_counter()
+            store.record_answer(quiz, question, picks)
+            quiz.question_number += 1
+            store.save_session(quiz)
+            samples.append(time.perf_counter() - t0)
+        return samples
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{students} concurrent sessions x {answers} answers")
+        for label, batch_size in (("write per answer", 1), ("batched", quiz_store.DEFAULT_BATCH_SIZE)):
+            store = quiz_store.QuizStore(os.path.join(tmp, label), batch_size=batch_size)
+            t0 = time.perf_counter()
+            with ThreadPoolExecutor(students) as pool:
+                samples = [s for result in pool.map(lambda k: student(store, k), range(students)) for s in result]
+            store.flush()
+            elapsed = time.perf_counter() - t0
+            print(f"  {label:17s} median {statistics.median(samples) * 1000:7.2f} ms  "
+                  f"p99 {np.percentile(samples, 99) * 1000:7.1f} ms  max {max(samples) * 1000:7.1f} ms  "
+                  f"total {elapsed:5.2f} s ({len(samples) / elapsed:,.0f} answers/s)")
+
+        # 통계 쿼리: rows개 답을 한 번에 채운 뒤 색인 유무로 비교
+        store = quiz_store.QuizStore(os.path.join(tmp, "stats"))
+        rng = np.random.default_rng(0)
+        difficulties = list(quiz_bank.DIFFICULTY_TIERS)
+        with closing(store._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT INTO answers (session_id, student, difficulty, answered_at, a_sign, b_sign, c_sign, "
+                "a_ok, b_ok, c_ok, all_ok) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ((f"s{k % 500}", f"학생 {k % 500}", difficulties[k % 3], float(k),
+                  *rng.integers(-1, 2, 3).tolist(), *rng.integers(0, 2, 4).tolist()) for k in range(rows)))
+        print(f"dashboard queries over {rows:,} answers")
+        for label in ("indexed", "no index"):
+            if label == "no index":
+                with closing(store._connect()) as conn, conn:
+                    for name in ("answers_a", "answers_b", "answers_c", "answers_student"):
+                        conn.execute(f"DROP INDEX {name}")
+            for query in (store.accuracy_by_sign, store.student_summary):
+                samples = []
+                for _ in range(5):
+                    t0 = time.perf_counter()
+                    query()
+                    samples.append(time.perf_counter() - t0)
+                print(f"  {label:9s} {query.__name__:17s} {statistics.median(samples) * 1000:8.1f} ms")
+
+
+def bench_pipeline(n_tickers, latency, slow_latency, timeout):
+    """
+    주식 페이지의 데이터 로딩을 티커 하나가 느릴 때(slow_latency초), 공급자가 계속 실패할 때, 모든 요청이
+    slow_latency초 동안 멈출 때로 나눠 비교합니다. 기존 방식은 묶음 요청 하나가 가장 느린 티커를 기다리고,
+    파이프라인은 티커별로 동시에 받아 끝나는 대로 내놓습니다. 파이프라인의 공급자 요청은 페이지처럼
+    티커 시간 제한보다 짧은 예산(시간 제한의 80%) 안에서만 재시도하고, 시간 초과는 차단기에 실패로 기록합니다.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    class UnevenProvider(market_data.SyntheticProvider):
+        """티커마다 지연이 다르고, failing이면 모든 요청이 실패하는 합성 공급자 (묶음 요청은 가장 느린 티커만큼 걸림)."""
+        def __init__(self, latencies, failing=False):
+            super().__init__(policy=market_data.FetchPolicy(retries=0, timeout=60, max_concurrency=16))
+            self.latencies = latencies
+            self.failing = failing
+
+        def _fetch(self, tickers, start, end):
+            time.sleep(max(self.latencies[t] for t in tickers))
+            if self.failing:
+                raise ConnectionError("공급자 응답 없음")
+            return super()._fetch(tickers, start, end)
+
+    end = pd.Timestamp.today().normalize()
+    start = end - pd.Timedelta(days=3 * 365)
+    tickers = [f"T{i:03d}" for i in range(n_tickers)]
+    latencies = {t: latency for t in tickers}
+    latencies[tickers[0]] = slow_latency
+    executor = ThreadPoolExecutor(fetch_pipeline.DEFAULT_MAX_WORKERS)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scenarios = (("one slow ticker", latencies, False), ("provider down", latencies, True),
+                     ("provider hangs", dict.fromkeys(tickers, slow_latency), False))
+        for scenario, scenario_latencies, failing in scenarios:
+            provider = UnevenProvider(scenario_latencies, failing)
+            print(f"{scenario}: {n_tickers} tickers, {latency * 1000:.0f} ms each, "
+                  f"{tickers[0]} {slow_latency:g} s, timeout {timeout:g} s")
+
+            store = price_store.PriceStore(os.path.join(tmp, f"{scenario}-batched"))
+            t0 = time.perf_counter()
+            store.sync(tickers, start, end, downloader=provider.download)
+            store.load_many(tickers, start, end)
+            elapsed = time.perf_counter() - t0
+            print(f"  batched (before)  first chart {elapsed:6.2f} s  all {elapsed:6.2f} s  (failures not reported)")
+
+            store = price_store.PriceStore(os.path.join(tmp, f"{scenario}-pipeline"))
+            breaker, metrics = fetch_pipeline.CircuitBreaker(), fetch_pipeline.FetchMetrics()
+
+            def fetch_one(ticker):
+                breaker.call(store.sync, [ticker], start, end, downloader=provider.download, raise_errors=True,
+                             timeout=timeout * 0.8)
+                return store.load(ticker, start, end)
+
+            t0 = time.perf_counter()
+            finished = []
+            for ticker, frame, fetch in fetch_pipeline.fetch_all(tickers, fetch_one, executor, timeout=timeout,
+                                                                 fallback=lambda t: store.load(t, start, end),
+                                                                 metrics=metrics, breaker=breaker):
+                finished.append((time.perf_counter() - t0, fetch))
+            counts = {status: sum(f.status == status for _, f in finished) for status in fetch_pipeline.STATUS_LABELS}
+            print(f"  pipeline (after)  first chart {finished[0][0]:6.2f} s  all {finished[-1][0]:6.2f} s  "
+                  f"{', '.join(f'{k} {v}' for k, v in counts.items() if v)}, breaker {breaker.state}")
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _rss_mb():
+    """현재 프로세스의 상주 메모리(RSS, MB)."""
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return float('nan')
+
+
+def bench_sessions(sessions, n_tickers, years, latency, mode):
+    """
+    세션 sessions개가 동시에 주식 페이지를 처음 열 때(같은 티커 n_tickers개)의 다운로드 수와 상주 메모리를 비교합니다.
+    cache_data는 기존 st.cache_data(꺼낼 때마다 pickle 복사본), shared는 SharedFrameCache(읽기 전용 한 벌 공유)이며,
+    메모리를 깨끗하게 재도록 방식마다 새 프로세스에서 실행합니다.
+    """
+    if mode is None:
+        for mode in ('cache_data', 'shared'):
+            subprocess.run([sys.executable, os.path.abspath(__file__), 'sessions', '--sessions', str(sessions),
+                            '--tickers', str(n_tickers), '--years', str(years), '--latency', str(latency),
+                            '--mode', mode], check=True)
+        return
+
+    import logging
+    import threading
+
+    end = pd.Timestamp.today().normalize()
+    start = end - pd.Timedelta(days=365 * years)
+    tickers = [f"T{i:03d}" for i in range(n_tickers)]
+    provider = market_data.SyntheticProvider(latency)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = price_store.PriceStore(tmp)
+
+        def load(ticker):
+            store.sync([ticker], start, end, downloader=provider.download)
+            return store.load(ticker, start, end)
+
+        if mode == 'cache_data':
+            import streamlit as st
+            # 스크립트 밖(bare mode)의 스레드에서 st.cache_data를 부를 때 나오는 경고를 숨김
+            logging.getLogger('streamlit.runtime.scriptrunner_utils.script_run_context').setLevel(logging.ERROR)
+            get = st.cache_data(ttl="1d", max_entries=512)(load)
+        else:
+            cache = frame_cache.SharedFrameCache()
+            get = lambda ticker: cache.get_or_load((ticker, start, end), load, ticker)
+
+        # import와 SQLite 연결 등 준비 비용을 빼고 재도록 다른 티커로 한 번 실행
+        load("WARMUP")
+        base = _rss_mb()
+        barrier = threading.Barrier(sessions)
+        held = [None] * sessions
+
+        def session(k):
+            barrier.wait()
+            order = tickers[k % n_tickers:] + tickers[:k % n_tickers]
+            held[k] = {ticker: get(ticker) for ticker in order}
+
+        t0 = time.perf_counter()
+        threads = [threading.Thread(target=session, args=(k,)) for k in range(sessions)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        cold = time.perf_counter() - t0
+        rss = _rss_mb() - base
+
+        samples = []
+        for _ in range(200):
+            t = time.perf_counter()
+            get(tickers[0])
+            samples.append(time.perf_counter() - t)
+        distinct = len({id(frame) for frames in held for frame in frames.values()})
+        frame_mb = sum(frame.memory_usage().sum() for frame in held[0].values()) / 1024 / 1024
+        print(f"{mode:10s} {sessions} sessions x {n_tickers} tickers ({frame_mb:.1f} MB per session): "
+              f"downloads {provider.calls - 1}, cold {cold:5.2f} s, RSS +{rss:6.1f} MB, "
+              f"distinct frames {distinct}, warm get {statistics.median(samples) * 1e6:7.1f} us")
+
+
+def bench_exports(n_tickers, years, chunk_days):
+    """
+    저장소의 가격 행렬을 파일로 내보낼 때 기간 전체를 한 번에 읽는 방식과 chunk_days일씩 나눠 쓰는 방식의
+    시간과 최대 할당 메모리를 형식별로 비교합니다.
+    """
+    frames = make_price_frames(n_tickers, years)
+    tickers = list(frames)
+    start = min(frame.index[0] for frame in frames.values())
+    end = max(frame.index[-1] for frame in frames.values()) + pd.Timedelta(days=1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = price_store.PriceStore(tmp)
+        for ticker, frame in frames.items():
+            store.append(ticker, frame, start.date(), end.date())
+        del frames
+
+        print(f"{n_tickers} tickers x {years} years")
+        for fmt in exports.DATA_FORMATS:
+            for label, days in (('whole', 366 * years + 1), (f'{chunk_days}d chunks', chunk_days)):
+                path = os.path.join(tmp, f"prices.{fmt}")
+                elapsed, peak = _measure(lambda: exports.write_frames(
+                    exports.iter_price_matrix(store, tickers, start, end, normalized=True, chunk_days=days), path, fmt))
+                print(f"  {fmt:8s} {label:12s} {elapsed:6.2f} s  peak {peak:7.1f} MB  "
+                      f"file {os.path.getsize(path) / 1e6:6.1f} MB")
+
+
+# bench.py pages가 측정하는 페이지와 기준값 파일
+_PAGE_FILES = {
+    'main': 'main.py',
+    'stock': os.path.join('pages', '00_주식데이터 시각화.py'),
+    'quadratic': os.path.join('pages', '01_이차함수.py'),
+}
+DEFAULT_PAGES_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_baseline.json')
+# 시간과 메모리는 기준값보다 비율(--tolerance)과 이 절대값을 모두 넘게 나빠져야 회귀로 봄 (작은 값의 측정 잡음을 무시)
+_REGRESSION_FLOORS = {'median_ms': 5.0, 'peak_mb': 2.0}
+# 화면 데이터 크기와 요소 수는 측정 잡음이 없으므로 기준값과 조금이라도 다르면 회귀로 봄 (빠진 요소도 잡도록)
+_EXACT_METRICS = ('payload_bytes', 'elements')
+# 주가 기간을 정하는 기준 시각 (날짜가 바뀌어도 같은 데이터로 측정하도록 고정)
+_PAGES_NOW = pd.Timestamp("2026-01-02 18:00", tz=stock_data.MARKET_TZ).to_pydatetime()
+
+
+def _tree_size(node):
+    """
+    AppTest 요소 트리의 (요소 메시지 크기(바이트) 합계, 요소 수). 크기는 브라우저로 보내는 화면 데이터 크기의 어림값입니다.
+    """
+    proto = getattr(node, 'proto', None)
+    size, count = (proto.ByteSize(), 1) if hasattr(proto, 'ByteSize') else (0, 0)
+    for child in getattr(node, 'children', {}).values():
+        child_size, child_count = _tree_size(child)
+        size, count = size + child_size, count + child_count
+    return size, count
+
+
+def _button(at, label):
+    return next(button for button in at.button if button.label == label)
+
+
+def _page_interactions(page, at):
+    """
+    페이지별 (조작 이름, 조작 함수) 목록입니다. 조작 함수는 반복 번호 i를 받아 위젯 값을 바꾸고,
+    측정할 재실행은 호출한 쪽에서 합니다 (조작 전에 필요한 준비 실행은 조작 함수 안에서 함).
+    재실행하면 요소 트리가 새로 만들어지므로 위젯은 조작할 때마다 at에서 다시 찾습니다.
+    """
+    if page == 'main':
+        def change_city(i):
+            city = at.selectbox(key="selected_city")
+            city.set_value(city.options[(i + 1) % 2])
+
+        def change_spot(i):
+            # 도시 바꾸기를 몇 번 했는지와 관계없이 관광지가 여러 곳인 첫 도시에서 잼
+            city = at.selectbox(key="selected_city")
+            if city.value != city.options[0]:
+                city.set_value(city.options[0])
+                at.run()
+            spot = at.selectbox(key="selected_spot")
+            spot.set_value(spot.options[(i + 1) % len(spot.options)])
+
+        return [
+            ("city change", change_city),
+            ("spot change", change_spot),
+            ("radius slider drag", lambda i: at.sidebar.slider[0].set_value(5 + i % 10)),
+        ]
+
+    if page == 'stock':
+        def switch_chart_type(i):
+            chart_type = at.radio[0]
+            chart_type.set_value(chart_type.options[(i + 1) % len(chart_type.options)])
+
+        return [
+            ("ticker toggle", lambda i: at.sidebar.checkbox[0].set_value(i % 2 == 1)),
+            ("chart type switch", switch_chart_type),
+        ]
+
+    def submit_answer(i):
+        # 매번 새 문제에 처음 답하도록 새 문제를 받은 뒤 부호를 골라 제출
+        _button(at, "새로운 문제 🔄").click()
+        at.run()
+        for key in ("a_select", "b_select", "c_select"):
+            at.selectbox(key=key).set_value("양수" if i % 2 else "음수")
+        _button(at, "정답 확인 ✅").click()
+
+    def drag_similarity(i):
+        step = i % 36
+        at.slider(key="sim_a1").set_value(-4.5 + 0.5 * (step if step < 18 else 36 - step) or 0.1)
+
+    def open_similarity(i):
+        at.sidebar.radio[0].set_value("포물선 닮음 탐구")
+        at.run()
+        drag_similarity(i)
+
+    return [
+        ("quiz submit", submit_answer),
+        ("quiz new question", lambda i: _button(at, "새로운 문제 🔄").click()),
+        ("similarity slider drag", open_similarity),
+    ]
+
+
+def _measure_page(page, reruns, root):
+    """
+    page를 AppTest로 실행해 첫 실행과 조작별 재실행의 시간(중앙값, p95), 최대 할당 메모리, 화면 데이터 크기와 요소 수(최대)를
+    반환합니다. 메모리는 시간 측정과 따로 tracemalloc을 켠 재실행 한 번에서 잽니다 (첫 실행은 import가 섞여 재지 않음).
+    화면 데이터가 같은 reruns에서 항상 같도록 주가 기간의 기준 시각과 퀴즈 시작 위치(random)를 고정합니다.
+    """
+    import logging
+    import random
+    from PIL import Image
+    from streamlit.testing.v1 import AppTest
+
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    warnings.simplefilter('ignore')
+    sys.path.insert(0, root)
+    os.chdir(root)
+
+    # 관광지 이미지는 네트워크 대신 합성 JPEG을 내려받은 것으로 함 (썸네일 만들기와 캐시 기록은 그대로 실행)
+    jpeg = io.BytesIO()
+    Image.fromarray(np.random.default_rng(0).integers(0, 256, (1067, 1600, 3), dtype=np.uint8)).save(jpeg, format='JPEG')
+    image_cache.ImageCache._download = lambda self, url, etag=None: (200, jpeg.getvalue(), None)
+    window = stock_data.trading_window(_PAGES_NOW)
+    stock_data.trading_window = lambda now=None: window
+    random.seed(0)
+
+    at = AppTest.from_file(os.path.join(root, _PAGE_FILES[page]), default_timeout=120)
+    results = {}
+    t0 = time.perf_counter()
+    at.run()
+    first = (time.perf_counter() - t0) * 1000
+    if at.exception:
+        raise RuntimeError(f"{page}: {at.exception[0].message}")
+    payload, elements = _tree_size(at._tree)
+    results['first run'] = {'median_ms': first, 'p95_ms': first, 'payload_bytes': payload, 'elements': elements}
+
+    for name, interact in [("rerun", lambda i: None)] + _page_interactions(page, at):
+        samples, payload, elements = [], 0, 0
+        for i in range(reruns):
+            interact(i)
+            t0 = time.perf_counter()
+            at.run()
+            samples.append(time.perf_counter() - t0)
+            size, count = _tree_size(at._tree)
+            payload, elements = max(payload, size), max(elements, count)
+        interact(reruns)
+        _, peak = _measure(at.run)
+        if at.exception:
+            raise RuntimeError(f"{page} / {name}: {at.exception[0].message}")
+        results[name] = {'median_ms': statistics.median(samples) * 1000, 'p95_ms': np.percentile(samples, 95) * 1000,
+                         'peak_mb': peak, 'payload_bytes': payload, 'elements': elements}
+    results['rss_mb'] = _rss_mb()
+    return results
+
+
+def bench_pages(pages, reruns, root, baseline_path, update_baseline, tolerance, page=None):
+    """
+    세 페이지를 AppTest로 헤드리스 실행해 자주 쓰는 조작(티커 켜고 끄기, 차트 형식 바꾸기, 퀴즈 제출/새 문제,
+    도시/관광지 바꾸기, 슬라이더 끌기)의 재실행 시간, 메모리, 화면 데이터 크기를 잽니다.
+    주가는 합성 공급자, 관광지 이미지는 합성 JPEG을 쓰고, 페이지마다 빈 임시 저장소를 둔 새 프로세스에서 실행합니다.
+    baseline_path의 기준값보다 시간/메모리가 tolerance를 넘게 나빠졌거나 화면 데이터 크기/요소 수가 조금이라도 다르면
+    종료 코드 1로 끝나고, --update-baseline이면 기준값을 새로 씁니다.
+    시간과 메모리는 측정한 컴퓨터에 따라 다르므로 같은 컴퓨터에서 만든 기준값과 비교해야 하고,
+    화면 데이터는 조작 횟수에 따라 달라지므로 기준값을 만들 때와 같은 reruns로 실행해야 합니다.
+    """
+    if page is not None:
+        print(json.dumps(_measure_page(page, reruns, root)))
+        return
+
+    results = {}
+    for name in pages:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, MARKET_DATA_PROVIDER='synthetic',
+                       PRICE_STORE_DIR=os.path.join(tmp, 'prices'), QUIZ_STORE_DIR=os.path.join(tmp, 'quiz'),
+                       IMAGE_CACHE_DIR=os.path.join(tmp, 'images'),
+                       SEARCH_INDEX_FILE=os.path.join(tmp, 'search_index.npz'))
+            env.pop('PAGE_PROFILE', None)
+            out = subprocess.run([sys.executable, os.path.abspath(__file__), 'pages', '--page', name,
+                                  '--reruns', str(reruns), '--root', root],
+                                 env=env, capture_output=True, text=True)
+        if out.returncode != 0:
+            sys.stderr.write(out.stderr)
+            sys.exit(f"{name} 페이지 측정 실패")
+        results[name] = json.loads(out.stdout.strip().splitlines()[-1])
+
+    baseline = {}
+    if os.path.exists(baseline_path) and not update_baseline:
+        with open(baseline_path, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('reruns') != reruns:
+            sys.exit(f"기준값은 --reruns {baseline.get('reruns')}로 만들었습니다. 같은 값으로 실행하세요.")
+
+    regressions = []
+    print(f"{root} (median of {reruns} reruns)")
+    for name, interactions in results.items():
+        print(f"  {name} (RSS {interactions.pop('rss_mb'):.0f} MB)")
+        for interaction, metrics in interactions.items():
+            base = baseline.get(name, {}).get(interaction, {})
+            flags = []
+            for metric, floor in _REGRESSION_FLOORS.items():
+                if metric in base and metric in metrics and metrics[metric] > base[metric] * (1 + tolerance) + floor:
+                    flags.append(f"{metric} {base[metric]:.1f} -> {metrics[metric]:.1f}")
+            for metric in _EXACT_METRICS:
+                if base and base.get(metric) != metrics[metric]:
+                    flags.append(f"{metric} {base.get(metric)} -> {metrics[metric]}")
+            regressions += [f"{name} / {interaction}: {flag}" for flag in flags]
+            peak = f"{metrics['peak_mb']:6.1f} MB" if 'peak_mb' in metrics else f"{'-':>6}   "
+            print(f"    {interaction:<24} {metrics['median_ms']:8.1f} ms  p95 {metrics['p95_ms']:8.1f} ms  "
+                  f"peak {peak}  payload {metrics['payload_bytes'] / 1024:7.1f} KB  {metrics['elements']:4d} elements"
+                  + ("  <- REGRESSION" if flags else ""))
+        regressions += [f"{name} / {interaction}: 측정되지 않음" for interaction in baseline.get(name, {})
+                        if interaction not in interactions]
+
+    if update_baseline:
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump({'reruns': reruns, **results}, f, indent=2, ensure_ascii=False, sort_keys=True)
+            f.write("\n")
+        print(f"기준값 저장: {baseline_path}")
+    elif not baseline:
+        print(f"기준값 파일이 없습니다 ({baseline_path}). --update-baseline으로 만드세요.")
+    elif regressions:
+        print(f"기준값 대비 나빠진 항목 {len(regressions)}개 (시간/메모리 허용 {tolerance:.0%}, 화면 데이터는 정확히 비교):")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    else:
+        print(f"기준값 대비 회귀 없음 (시간/메모리 허용 {tolerance:.0%}, 화면 데이터 일치)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('download', help='묶음 다운로드 콜드 로드 시간')
+    p.add_argument('--latency', type=float, default=0.2, help='가짜 요청 1회당 지연(초)')
+
+    p = sub.add_parser('matrix', help='가격 행렬 생성/정규화 시간과 메모리')
+    p.add_argument('--tickers', type=int, default=500)
+    p.add_argument('--years', type=int, default=10)
+    p.add_argument('--figures', action='store_true', help='Plotly Figure 생성까지 포함')
+
+    p = sub.add_parser('downsample', help='다운샘플링 전후 차트 전송 크기')
+    p.add_argument('--years', type=int, default=30)
+    p.add_argument('--width', type=int, default=1200)
+
+    p = sub.add_parser('live', help='실시간 모드 갱신 시간 추이')
+    p.add_argument('--hours', type=int, default=12)
+
+    p = sub.add_parser('indicators', help='보조 지표별 계산 비용')
+    p.add_argument('--tickers', type=int, default=1000)
+    p.add_argument('--years', type=int, default=3)
+
+    p = sub.add_parser('correlation', help='상관계수/공분산/롤링 베타 계산 비용')
+    p.add_argument('--tickers', type=int, default=500)
+    p.add_argument('--years', type=int, default=3)
+
+    p = sub.add_parser('startup', help='페이지별 콜드 스타트 시간')
+    p.add_argument('--repeat', type=int, default=3)
+    p.add_argument('--root', default=os.path.dirname(os.path.abspath(__file__)), help='측정할 앱 디렉터리')
+
+    p = sub.add_parser('attractions', help='관광지 수에 따른 재실행 비용')
+    p.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    p.add_argument('--reruns', type=int, default=20)
+
+    p = sub.add_parser('geo', help='반경 검색 (전수 조사 vs 격자 색인)')
+    p.add_argument('--points', type=int, default=100000)
+    p.add_argument('--queries', type=int, default=200)
+    p.add_argument('--radii', type=float, nargs='+', default=[1.0, 5.0, 10.0, 25.0])
+
+    p = sub.add_parser('map', help='지도 마커 수별 생성 시간과 HTML 크기')
+    p.add_argument('--sizes', type=int, nargs='+', default=[10, 1000, 10000])
+
+    p = sub.add_parser('viewport', help='지도 이동 시 범위 지점 갱신 비용')
+    p.add_argument('--points', type=int, default=100000)
+    p.add_argument('--steps', type=int, default=30)
+    p.add_argument('--zoom', type=int, default=13)
+
+    p = sub.add_parser('images', help='이미지 캐시 (로컬 HTTP 서버 사용)')
+    p.add_argument('--images', type=int, default=24)
+    p.add_argument('--latency', type=float, default=0.1, help='서버 응답 지연(초)')
+    p.add_argument('--workers', type=int, default=8)
+
+    p = sub.add_parser('route', help='방문 순서 계산 시간 (최근접 이웃 + 2-opt)')
+    p.add_argument('--stops', type=int, nargs='+', default=[10, 50, 200, 300])
+    p.add_argument('--city-points', type=int, default=2000)
+
+    p = sub.add_parser('search', help='관광지 검색 색인 생성/검색 시간과 오타 검색 정확도')
+    p.add_argument('--docs', type=int, default=10000)
+    p.add_argument('--queries', type=int, default=200)
+
+    p = sub.add_parser('quiz', help='이차함수 문제 은행 생성 비용')
+    p.add_argument('--questions', type=int, nargs='+', default=[100, 1000, 10000])
+    p.add_argument('--reruns', type=int, default=200)
+
+    p = sub.add_parser('slider', help='이차함수 페이지 위젯 조작 1회의 재실행 시간')
+    p.add_argument('--reruns', type=int, default=100)
+    p.add_argument('--root', default=os.path.dirname(os.path.abspath(__file__)), help='측정할 앱 디렉터리')
+
+    p = sub.add_parser('curves', help='포물선 곡선 샘플링 방식별 오차와 점 수')
+    p.add_argument('--zooms', type=float, nargs='+', default=[0.1, 0.5, 1.0, 5.0, 50.0])
+    p.add_argument('--width', type=int, default=1080)
+    p.add_argument('--height', type=int, default=600)
+
+    p = sub.add_parser('quizstore', help='퀴즈 기록 동시 쓰기 지연과 학급 통계 쿼리 시간')
+    p.add_argument('--students', type=int, default=300)
+    p.add_argument('--answers', type=int, default=20, help='학생 한 명이 제출하는 답 수')
+    p.add_argument('--rows', type=int, default=1000000, help='통계 쿼리를 잴 때 쌓아 둘 답 수')
+
+    p = sub.add_parser('pipeline', help='티커별 병렬 로딩: 느린 티커/공급자 장애 때 첫 차트와 전체 완료 시간')
+    p.add_argument('--tickers', type=int, default=20)
+    p.add_argument('--latency', type=float, default=0.3, help='티커 하나의 응답 지연(초)')
+    p.add_argument('--slow', type=float, default=5.0, help='느린 티커 하나의 응답 지연(초)')
+    p.add_argument('--timeout', type=float, default=2.0, help='티커별 시간 제한(초)')
+
+    p = sub.add_parser('sessions', help='동시 세션 수에 따른 다운로드 수와 상주 메모리 (st.cache_data vs 공유 캐시)')
+    p.add_argument('--sessions', type=int, default=50)
+    p.add_argument('--tickers', type=int, default=10)
+    p.add_argument('--years', type=int, default=3)
+    p.add_argument('--latency', type=float, default=0.2, help='다운로드 1회의 지연(초)')
+    p.add_argument('--mode', choices=['cache_data', 'shared'], help='한 방식만 현재 프로세스에서 측정')
+
+    p = sub.add_parser('exports', help='가격 행렬 내보내기: 전체 기간 한 번에 vs 기간별 나눠 쓰기의 시간과 메모리')
+    p.add_argument('--tickers', type=int, default=500)
+    p.add_argument('--years', type=int, default=10)
+    p.add_argument('--chunk-days', type=int, default=exports.DEFAULT_CHUNK_DAYS)
+
+    p = sub.add_parser('pages', help='세 페이지의 조작별 재실행 시간/메모리/화면 데이터 크기와 기준값 대비 회귀 검사')
+    p.add_argument('--pages', nargs='+', choices=list(_PAGE_FILES), default=list(_PAGE_FILES))
+    p.add_argument('--reruns', type=int, default=20, help='조작마다 재실행 횟수')
+    p.add_argument('--root', default=os.path.dirname(os.path.abspath(__file__)), help='측정할 앱 디렉터리')
+    p.add_argument('--baseline', default=DEFAULT_PAGES_BASELINE, help='기준값 JSON 파일')
+    p.add_argument('--update-baseline', action='store_true', help='이번 측정값을 기준값으로 저장')
+    p.add_argument('--tolerance', type=float, default=0.3, help='회귀로 보는 기준값 대비 증가 비율')
+    p.add_argument('--page', choices=list(_PAGE_FILES), help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+    if args.command == 'download':
+        bench_download(args.latency)
+    elif args.command == 'matrix':
+        bench_matrix(args.tickers, args.years, args.figures)
+    elif args.command == 'downsample':
+        bench_downsample(args.years, args.width)
+    elif args.command == 'live':
+        bench_live(args.hours)
+    elif args.command == 'indicators':
+        bench_indicators(args.tickers, args.years)
+    elif args.command == 'correlation':
+        bench_correlation(args.tickers, args.years)
+    elif args.command == 'startup':
+        bench_startup(args.repeat, args.root)
+    elif args.command == 'attractions':
+        bench_attractions(args.sizes, args.reruns)
+    elif args.command == 'geo':
+        bench_geo(args.points, args.queries, args.radii)
+    elif args.command == 'map':
+        bench_map(args.sizes)
+    elif args.command == 'viewport':
+        bench_viewport(args.points, args.steps, args.zoom)
+    elif args.command == 'images':
+        bench_images(args.images, args.latency, args.workers)
+    elif args.command == 'route':
+        bench_route(args.stops, args.city_points)
+    elif args.command == 'search':
+        bench_search(args.docs, args.queries)
+    elif args.command == 'quiz':
+        bench_quiz(args.questions, args.reruns)
+    elif args.command == 'slider':
+        bench_slider(args.reruns, args.root)
+    elif args.command == 'curves':
+        bench_curves(args.zooms, args.width, args.height)
+    elif args.command == 'quizstore':
+        bench_quizstore(args.students, args.answers, args.rows)
+    elif args.command == 'pipeline':
+        bench_pipeline(args.tickers, args.latency, args.slow, args.timeout)
+    elif args.command == 'sessions':
+        bench_sessions(args.sessions, args.tickers, args.years, args.latency, args.mode)
+    elif args.command == 'exports':
+        bench_exports(args.tickers, args.years, args.chunk_days)
+    elif args.command == 'pages':
+        bench_pages(args.pages, args.reruns, args.root, args.baseline, args.update_baseline, args.tolerance, args.page)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,264 @@
+"""
+주가 데이터와 차트를 파일로 내보내는 도구입니다 (페이지의 다운로드 버튼과 야간 보고서용 명령줄에서 함께 씀).
+
+가격 행렬과 OHLC 데이터는 로컬 가격 저장소(PriceStore)에서 기간을 chunk_days씩 나눠 읽어, 조각마다 Parquet 행 그룹이나
+Arrow 레코드 배치 하나로 이어 씁니다. 전체 기간의 행렬을 한 번에 메모리에 만들지 않으므로 기업 수나 기간이 커도 메모리가 일정합니다.
+상세 차트 이미지는 페이지와 같은 stock_charts 함수로 Figure를 만들고, image_batch개씩 묶어 한 번에 PNG/SVG로 그립니다
+(정적 이미지는 kaleido 패키지가 필요합니다).
+페이지가 재실행마다 이 모듈을 불러와도 느려지지 않도록 pandas, pyarrow, 차트 모듈은 실제로 내보낼 때 함수 안에서 불러옵니다.
+
+명령줄 사용 예:
+    python exports.py prices --out report/prices.parquet
+    python exports.py prices --out report/normalized.arrow --format arrow --normalized
+    python exports.py ohlc --out report/ohlc.parquet --tickers AAPL MSFT
+    python exports.py charts --out-dir report/charts --format svg --chart line
+"""
+import argparse
+import importlib.util
+import os
+import tempfile
+import zipfile
+from datetime import date, timedelta
+
+# 한 번에 읽어 쓰는 기간(일)과, 한 번에 그리는 차트 이미지 수
+DEFAULT_CHUNK_DAYS = 365
+DEFAULT_IMAGE_BATCH = 8
+# 정적 차트 이미지 크기(픽셀)
+DEFAULT_IMAGE_SIZE = (1200, 600)
+
+DATA_FORMATS = ('parquet', 'arrow')
+IMAGE_FORMATS = ('png', 'svg')
+CHART_TYPES = ('candlestick', 'line')
+
+# 메모리에 두다가 이 크기를 넘으면 임시 파일로 옮기는 다운로드 버퍼 크기
+_SPOOL_BYTES = 16 * 1024 * 1024
+
+
+def static_export_available():
+    """정적 이미지(PNG/SVG) 내보내기에 필요한 kaleido가 설치되어 있는지 확인합니다."""
+    return importlib.util.find_spec("kaleido") is not None
+
+
+def _as_date(value):
+    """date, datetime, Timestamp, ISO 문자열을 date로 바꿉니다."""
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value.date() if hasattr(value, 'date') else value
+
+
+def date_windows(start_date, end_date, chunk_days=DEFAULT_CHUNK_DAYS):
+    """[start_date, end_date)를 chunk_days일씩 나눈 (시작일, 종료일) 구간들을 차례로 반환합니다."""
+    start_date, end_date = _as_date(start_date), _as_date(end_date)
+    while start_date < end_date:
+        window_end = min(start_date + timedelta(days=chunk_days), end_date)
+        yield start_date, window_end
+        start_date = window_end
+
+
+def iter_price_matrix(store, tickers, start_date, end_date, names=None, normalized=False,
+                      chunk_days=DEFAULT_CHUNK_DAYS):
+    """
+    저장소의 가격(Price)을 날짜 x 기업 행렬 조각으로 기간 순서대로 반환합니다. 컬럼은 항상 tickers 순서이고,
+    names({티커: 이름})를 주면 컬럼 이름을 기업 이름으로 바꿉니다.
+    normalized가 참이면 페이지의 정규화 차트처럼 기업마다 첫 유효값을 100으로 맞춥니다 (앞 조각의 기준값을 이어서 씀).
+    """
+    import pandas as pd
+
+    tickers = list(tickers)
+    base = pd.Series(float('nan'), index=tickers)
+    for window_start, window_end in date_windows(start_date, end_date, chunk_days):
+        matrix = store.load_price_matrix(tickers, window_start, window_end)
+        if matrix.empty:
+            continue
+        if normalized:
+            base = base.fillna(matrix.bfill().iloc[0])
+            matrix = matrix / base * 100.0
+        if names:
+            matrix = matrix.rename(columns=names)
+        yield matrix
+
+
+def iter_ohlc_frames(store, tickers, start_date, end_date, chunk_days=DEFAULT_CHUNK_DAYS):
+    """
+    티커별 일봉을 (Ticker, Date, Open, High, Low, Close, Price) 긴 형식 조각으로 반환합니다.
+    티커마다 기간을 chunk_days씩 나눠 읽습니다.
+    """
+    from stock_data import OHLC_COLS
+
+    columns = OHLC_COLS + ['Price']
+    for ticker in tickers:
+        for window_start, window_end in date_windows(start_date, end_date, chunk_days):
+            frame = store.load(ticker, window_start, window_end)
+            if frame is None:
+                continue
+            frame = frame.reindex(columns=columns).astype('float64').reset_index()
+            frame.insert(0, 'Ticker', ticker)
+            yield frame
+
+
+def write_frames(frames, file, fmt='parquet'):
+    """
+    DataFrame 조각들을 하나씩 file(경로나 바이너리 파일 객체)에 이어 씁니다. 반환값은 쓴 행 수입니다.
+    parquet은 조각마다 행 그룹 하나, arrow는 Arrow IPC 파일의 레코드 배치 하나가 되며,
+    모든 조각은 첫 조각과 같은 컬럼이어야 합니다. 조각이 하나도 없으면 아무것도 쓰지 않고 0을 반환합니다.
+    """
+    if fmt not in DATA_FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt} (가능: {', '.join(DATA_FORMATS)})")
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer, schema, rows = None, None, 0
+    try:
+        for frame in frames:
+            table = pa.Table.from_pandas(frame, schema=schema, preserve_index=isinstance(frame.index, pd.DatetimeIndex))
+            if writer is None:
+                schema = table.schema
+                writer = pq.ParquetWriter(file, schema) if fmt == 'parquet' else pa.ipc.new_file(file, schema)
+            writer.write_table(table)
+            rows += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def export_file(frames, fmt='parquet'):
+    """
+    write_frames로 쓴 결과를 읽기 위치가 처음인 파일 객체로 반환합니다 (다운로드 버튼용).
+    작은 결과는 메모리에, 큰 결과는 임시 파일에 둡니다.
+    """
+    buffer = tempfile.SpooledTemporaryFile(max_size=_SPOOL_BYTES)
+    write_frames(frames, buffer, fmt)
+    buffer.seek(0)
+    return buffer
+
+
+def detail_figure(company_name, data, chart_type='candlestick', width=DEFAULT_IMAGE_SIZE[0]):
+    """
+    페이지의 상세 차트와 같은 Figure를 만듭니다. 이미지 너비에 맞춰 캔들 수와 선 점 수를 줄이고,
+    OHLC가 없는 기업은 캔들스틱 대신 종가 라인 차트로 그립니다.
+    """
+    from stock_charts import PIXELS_PER_CANDLE, candlestick_figure, price_line_figure
+    from stock_data import OHLC_COLS
+
+    if chart_type == 'candlestick' and all(col in data.columns for col in OHLC_COLS):
+        return candlestick_figure(company_name, data, max_bars=width // PIXELS_PER_CANDLE)
+    return price_line_figure(company_name, data, max_points=width * 2)
+
+
+def iter_detail_figures(store, tickers, start_date, end_date, names=None, chart_type='candlestick',
+                        width=DEFAULT_IMAGE_SIZE[0]):
+    """티커별 (파일 이름, Figure)를 차례로 반환합니다. 저장소에 데이터가 없는 티커는 건너뜁니다."""
+    names = names or {}
+    for ticker in tickers:
+        data = store.load(ticker, start_date, end_date)
+        if data is not None:
+            yield ticker, detail_figure(names.get(ticker, ticker), data, chart_type, width)
+
+
+def _batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_chart_images(figures, out_dir, fmt='png', size=DEFAULT_IMAGE_SIZE, batch_size=DEFAULT_IMAGE_BATCH):
+    """
+    (파일 이름, Figure)들을 out_dir에 <이름>.<fmt> 이미지로 씁니다. batch_size개씩 모아 한 번에 그리고,
+    다 그린 묶음의 Figure는 버리므로 기업이 많아도 Figure를 모두 메모리에 두지 않습니다. 쓴 파일 경로 목록을 반환합니다.
+    """
+    if fmt not in IMAGE_FORMATS:
+        raise ValueError(f"지원하지 않는 이미지 형식입니다: {fmt} (가능: {', '.join(IMAGE_FORMATS)})")
+    if not static_export_available():
+        raise RuntimeError("차트 이미지를 만들려면 kaleido 패키지가 필요합니다 (pip install kaleido)")
+    import plotly.io as pio
+
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for batch in _batches(figures, batch_size):
+        batch_paths = [os.path.join(out_dir, f"{name}.{fmt}") for name, _ in batch]
+        pio.write_images([fig for _, fig in batch], batch_paths, format=fmt, width=size[0], height=size[1])
+        paths.extend(batch_paths)
+    return paths
+
+
+def chart_images_zip(figures, fmt='png', size=DEFAULT_IMAGE_SIZE, batch_size=DEFAULT_IMAGE_BATCH):
+    """write_chart_images로 그린 이미지들을 ZIP 파일 객체(읽기 위치가 처음)로 반환합니다 (다운로드 버튼용)."""
+    buffer = tempfile.SpooledTemporaryFile(max_size=_SPOOL_BYTES)
+    with tempfile.TemporaryDirectory() as out_dir, zipfile.ZipFile(buffer, 'w') as archive:
+        for path in write_chart_images(figures, out_dir, fmt, size, batch_size):
+            archive.write(path, os.path.basename(path))
+    buffer.seek(0)
+    return buffer
+
+
+def figure_bytes(fig, fmt='html', size=DEFAULT_IMAGE_SIZE):
+    """Figure 하나를 html(브라우저에서 열리는 대화형 그래프), png, svg 중 하나의 바이트로 반환합니다."""
+    if fmt == 'html':
+        return fig.to_html(include_plotlyjs='cdn', full_html=True).encode('utf-8')
+    if not static_export_available():
+        raise RuntimeError("차트 이미지를 만들려면 kaleido 패키지가 필요합니다 (pip install kaleido)")
+    return fig.to_image(format=fmt, width=size[0], height=size[1])
+
+
+def main():
+    from price_store import PriceStore
+    from stock_data import DEFAULT_TICKER_CSV, load_ticker_universe, trading_window
+
+    parser = argparse.ArgumentParser(description="주가 데이터와 상세 차트 내보내기 (야간 보고서용)")
+    parser.add_argument('command', choices=('prices', 'ohlc', 'charts'),
+                        help='prices: 날짜 x 기업 가격 행렬, ohlc: 티커별 일봉, charts: 기업별 상세 차트 이미지')
+    parser.add_argument('--tickers', nargs='+', help='내보낼 티커 (기본값: 기업 목록 파일의 기본 선택 기업)')
+    parser.add_argument('--ticker-csv', default=DEFAULT_TICKER_CSV)
+    parser.add_argument('--years', type=float, default=3, help='오늘부터 거슬러 올라갈 기간(년)')
+    parser.add_argument('--offline', action='store_true', help='데이터를 새로 받지 않고 저장소에 있는 것만 씀')
+    parser.add_argument('--out', help='prices/ohlc 출력 파일')
+    parser.add_argument('--out-dir', default='charts', help='charts 출력 디렉터리')
+    parser.add_argument('--format', help='prices/ohlc: parquet|arrow (기본 parquet), charts: png|svg (기본 png)')
+    parser.add_argument('--normalized', action='store_true', help='prices: 첫 유효값을 100으로 정규화')
+    parser.add_argument('--names', action='store_true', help='prices: 컬럼 이름을 티커 대신 기업 이름으로')
+    parser.add_argument('--chart', choices=CHART_TYPES, default='candlestick')
+    parser.add_argument('--size', type=int, nargs=2, default=list(DEFAULT_IMAGE_SIZE), metavar=('WIDTH', 'HEIGHT'))
+    parser.add_argument('--chunk-days', type=int, default=DEFAULT_CHUNK_DAYS)
+    parser.add_argument('--batch', type=int, default=DEFAULT_IMAGE_BATCH, help='charts: 한 번에 그릴 이미지 수')
+    args = parser.parse_args()
+
+    if args.command == 'charts' and not static_export_available():
+        parser.error("차트 이미지를 만들려면 kaleido 패키지가 필요합니다 (pip install kaleido)")
+
+    companies, defaults = load_ticker_universe(args.ticker_csv)
+    tickers = args.tickers or list(defaults)
+    names = {ticker: companies.get(ticker, ticker) for ticker in tickers}
+    start_date, end_date, _ = trading_window(days=int(args.years * 365))
+    store = PriceStore()
+    if not args.offline:
+        store.sync(tickers, start_date, end_date)
+
+    if args.command == 'charts':
+        paths = write_chart_images(
+            iter_detail_figures(store, tickers, start_date, end_date, names, args.chart, args.size[0]),
+            args.out_dir, args.format or 'png', tuple(args.size), args.batch)
+        print(f"{len(paths)} charts -> {args.out_dir}")
+        return
+
+    if not args.out:
+        parser.error("prices/ohlc에는 --out이 필요합니다")
+    fmt = args.format or ('arrow' if args.out.endswith(('.arrow', '.feather')) else 'parquet')
+    if args.command == 'prices':
+        frames = iter_price_matrix(store, tickers, start_date, end_date, names if args.names else None,
+                                   args.normalized, args.chunk_days)
+    else:
+        frames = iter_ohlc_frames(store, tickers, start_date, end_date, args.chunk_days)
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    rows = write_frames(frames, args.out, fmt)
+    print(f"{rows:,} rows -> {args.out} ({fmt})")
+
+
+if __name__ == '__main__':
+    main()
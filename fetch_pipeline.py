@@ -0,0 +1,266 @@
+"""
+티커별 주가 데이터를 병렬로 받는 파이프라인입니다.
+
+티커마다 작업 하나를 공용 스레드 풀(서버 전체의 동시 요청 수 상한)에 넣고, 끝나는 순서대로 결과를 돌려주므로
+페이지는 느린 티커를 기다리지 않고 먼저 온 티커부터 그릴 수 있습니다.
+한 티커가 시간 제한을 넘기거나 실패하면 그 티커만 fallback(로컬 저장소의 이전 데이터)으로 대신하고 다른 티커는 계속 진행합니다.
+
+공급자가 연달아 실패하면 CircuitBreaker가 한동안 요청을 막아, 장애 중에 티커마다 시간 제한까지 기다리지 않게 합니다.
+티커별 결과(상태, 걸린 시간, 행 수, 오류)는 TickerFetch로 남기고 FetchMetrics가 모아 로그와 화면에 보여 줍니다.
+"""
+import json
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 서버 전체에서 동시에 실행할 티커 작업 수
+DEFAULT_MAX_WORKERS = 8
+# 티커 하나가 실행을 시작한 뒤 기다릴 최대 시간(초). 풀이 꽉 차 대기하는 시간도 같은 만큼만 허용합니다.
+DEFAULT_TICKER_TIMEOUT = 10.0
+# 티커 작업 안에서 공급자 요청(재시도 포함)에 줄 시간(초). 시간 초과로 포기한 작업이 풀을 오래 붙잡지 않도록
+# DEFAULT_TICKER_TIMEOUT보다 짧게 두어, 요청이 먼저 끝나거나 실패하게 합니다.
+DEFAULT_FETCH_BUDGET = 8.0
+
+# 연속 실패 몇 번에 요청을 막을지, 막은 뒤 몇 초 후에 한 번 다시 시도해 볼지
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 60.0
+
+# 티커별 결과 상태와 화면 표시 이름
+STATUS_LABELS = {
+    'ok': "정상",
+    'empty': "데이터 없음",
+    'error': "오류",
+    'timeout': "시간 초과",
+    'circuit_open': "요청 차단 중",
+}
+
+
+class CircuitOpenError(RuntimeError):
+    """CircuitBreaker가 열려 있어 요청을 보내지 않았을 때 발생합니다."""
+
+
+# fetch_all 작업을 실행 중인 스레드에 그 작업의 _Outcome을 걸어 두어 CircuitBreaker.call이 확인합니다
+_current = threading.local()
+
+
+class _Outcome:
+    """
+    fetch_all 작업 하나의 결과를 차단기에 한 번만 기록하기 위한 표입니다.
+    시간 초과 처리와 작업 스레드 중 먼저 claim()한 쪽만 기록합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._claimed = False
+
+    def claim(self):
+        with self._lock:
+            if self._claimed:
+                return False
+            self._claimed = True
+            return True
+
+
+def _claim_outcome():
+    outcome = getattr(_current, 'outcome', None)
+    return outcome is None or outcome.claim()
+
+
+@dataclass(slots=True)
+class TickerFetch:
+    """티커 하나를 받은 결과입니다. latency는 초, rows는 화면에 쓸 수 있는 데이터 행 수입니다 (이전 데이터 포함)."""
+    ticker: str
+    status: str
+    latency: float
+    rows: int = 0
+    error: str = ""
+    finished_at: float = field(default_factory=time.time)
+
+    @property
+    def ok(self):
+        return self.status == 'ok'
+
+
+class CircuitBreaker:
+    """
+    연속 실패 횟수가 failure_threshold에 닿으면 열려서(open) reset_timeout초 동안 요청을 막습니다.
+    그 뒤에는 요청 하나만 시험 삼아 보내(half-open) 성공하면 닫고, 실패하면 다시 reset_timeout초 동안 막습니다.
+    """
+
+    def __init__(self, failure_threshold=DEFAULT_FAILURE_THRESHOLD, reset_timeout=DEFAULT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    @property
+    def state(self):
+        """'closed', 'open', 'half-open' 중 하나입니다."""
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return 'open'
+            return 'half-open'
+
+    def allow(self):
+        """지금 요청을 보내도 되는지 확인합니다. half-open에서는 한 번에 요청 하나만 허용합니다."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+    def call(self, func, *args, **kwargs):
+        """
+        func를 실행하고 성공/실패를 기록합니다. 열려 있으면 실행하지 않고 CircuitOpenError를 던집니다.
+        fetch_all 작업 안에서 불렸고 그 작업이 이미 시간 초과로 기록됐다면 결과를 다시 기록하지 않습니다.
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"연속 {self.failure_threshold}회 실패로 {self.reset_timeout:.0f}초 동안 요청을 보내지 않습니다")
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            if _claim_outcome():
+                self.record_failure()
+            raise
+        if _claim_outcome():
+            self.record_success()
+        return result
+
+
+class FetchMetrics:
+    """
+    티커별 결과를 최근 history개까지 모아 둡니다. 여러 세션이 함께 사용합니다.
+    record()할 때마다 결과를 JSON 한 줄로 로그에 남깁니다.
+    """
+
+    def __init__(self, history=1000):
+        self._lock = threading.Lock()
+        self._records = deque(maxlen=history)
+
+    def record(self, fetch):
+        with self._lock:
+            self._records.append(fetch)
+        level = logging.INFO if fetch.ok else logging.WARNING
+        logger.log(level, "ticker_fetch %s", json.dumps(asdict(fetch), ensure_ascii=False))
+
+    def recent(self, limit=50):
+        """최근 결과를 새것부터 최대 limit개 반환합니다."""
+        with self._lock:
+            return list(self._records)[::-1][:limit]
+
+    def summary(self):
+        """
+        티커별 {'requests', 'errors', 'p50_ms', 'p95_ms', 'last_status'}를 반환합니다.
+        errors는 정상/데이터 없음이 아닌 결과 수입니다.
+        """
+        with self._lock:
+            records = list(self._records)
+        grouped = {}
+        for fetch in records:
+            grouped.setdefault(fetch.ticker, []).append(fetch)
+        summary = {}
+        for ticker, fetches in grouped.items():
+            latencies = np.array([f.latency for f in fetches]) * 1000
+            summary[ticker] = {
+                'requests': len(fetches),
+                'errors': sum(f.status not in ('ok', 'empty') for f in fetches),
+                'p50_ms': float(np.percentile(latencies, 50)),
+                'p95_ms': float(np.percentile(latencies, 95)),
+                'last_status': fetches[-1].status,
+            }
+        return summary
+
+
+def _rows(frame):
+    return 0 if frame is None else len(frame)
+
+
+def fetch_all(tickers, fetch_one, executor, fallback=None, timeout=DEFAULT_TICKER_TIMEOUT, metrics=None, breaker=None):
+    """
+    tickers를 executor에서 fetch_one(ticker)로 동시에 받아, 끝나는 순서대로 (티커, 데이터, TickerFetch)를 내놓습니다.
+
+    - fetch_one이 예외를 던지거나 timeout초 안에 끝나지 않으면 fallback(ticker)의 결과(없으면 None)를 대신 내놓습니다.
+      시간 제한을 넘긴 작업은 멈출 수 없으므로 뒤에서 계속 실행되고, 그 결과는 fetch_one 쪽 캐시에 남습니다.
+    - 풀이 다른 작업으로 꽉 차 timeout초 동안 시작하지 못한 티커도 시간 초과로 처리합니다.
+    - metrics가 있으면 티커마다 TickerFetch를 기록합니다.
+    - breaker가 있으면 이미 실행을 시작한 작업의 시간 초과를 실패로 기록해, 공급자가 응답하지 않을 때도 차단기가 열리게 합니다.
+      그 작업이 나중에 끝나도 fetch_one 안의 breaker.call은 결과를 다시 기록하지 않으므로 작업 하나는 한 번만 기록됩니다.
+      시작하기 전에 취소된 작업은 공급자에 닿지 않았으므로 기록하지 않습니다.
+    """
+    submitted = time.perf_counter()
+    started = {}
+    outcomes = {ticker: _Outcome() for ticker in dict.fromkeys(tickers)}
+
+    def run(ticker):
+        started[ticker] = time.perf_counter()
+        _current.outcome = outcomes[ticker]
+        try:
+            return fetch_one(ticker), None, time.perf_counter() - started[ticker]
+        except Exception as e:
+            return None, e, time.perf_counter() - started[ticker]
+        finally:
+            _current.outcome = None
+
+    def finish(ticker, data, fetch):
+        if not fetch.ok and data is None and fallback is not None:
+            data = fallback(ticker)
+        fetch.rows = _rows(data)
+        if metrics is not None:
+            metrics.record(fetch)
+        return ticker, data, fetch
+
+    futures = {executor.submit(run, ticker): ticker for ticker in dict.fromkeys(tickers)}
+    pending = set(futures)
+    while pending:
+        # 실행 중이면 시작 후 timeout초, 아직 대기 중이면 제출 후 timeout초가 지나면 포기
+        deadlines = {future: started.get(futures[future], submitted) + timeout for future in pending}
+        done, _ = wait(pending, timeout=max(0.0, min(deadlines.values()) - time.perf_counter()),
+                       return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.discard(future)
+            ticker = futures[future]
+            data, error, latency = future.result()
+            if isinstance(error, CircuitOpenError):
+                fetch = TickerFetch(ticker, 'circuit_open', latency, error=str(error))
+            elif error is not None:
+                fetch = TickerFetch(ticker, 'error', latency, error=f"{type(error).__name__}: {error}")
+            else:
+                fetch = TickerFetch(ticker, 'ok' if _rows(data) else 'empty', latency)
+            yield finish(ticker, data, fetch)
+
+        now = time.perf_counter()
+        for future in [f for f in pending if deadlines[f] <= now]:
+            pending.discard(future)
+            ticker = futures[future]
+            # 아직 시작하지 않은 작업은 취소되고 기록하지 않음. 이미 실행 중이면 그대로 두고 실패로 한 번만 기록
+            if not future.cancel() and breaker is not None and outcomes[ticker].claim():
+                breaker.record_failure()
+            fetch = TickerFetch(ticker, 'timeout', now - started.get(ticker, submitted),
+                                error=f"{timeout:g}초 안에 끝나지 않았습니다")
+            yield finish(ticker, None, fetch)
@@ -0,0 +1,122 @@
+"""
+프로세스 전체가 함께 쓰는 DataFrame 캐시입니다.
+
+st.cache_data는 값을 꺼낼 때마다 pickle로 복사본을 만들어 주므로, 세션 50개가 같은 티커를 보면 같은 가격 데이터가
+메모리에 50벌 생깁니다. SharedFrameCache는 값을 한 벌만 두고 모든 세션에 같은 객체를 돌려줍니다.
+대신 한 세션이 데이터를 바꿔 다른 세션에 영향을 주지 않도록, 저장할 때 컬럼들을 읽기 전용 NumPy 배열 하나로
+묶어 둡니다. 꺼낸 DataFrame에 값을 대입하면(df.loc[...] = x 등) ValueError가 나므로, 값을 바꿔야 하는 쪽은
+먼저 .copy()로 복사본을 만들어야 합니다. 열을 골라 계산하거나 새 DataFrame을 만드는 읽기 작업은 그대로 쓸 수 있습니다.
+
+같은 키를 여러 세션이 동시에 요청하면 처음 요청한 세션만 loader를 실행하고 나머지는 그 결과를 기다립니다(single-flight).
+loader가 실패하면 기다리던 요청 모두에 같은 예외를 던지고 결과는 캐시에 남기지 않습니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+from stock_data import CacheStats
+
+# 캐시에 둘 최대 데이터 크기(바이트)와 항목 유효 시간(초)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_TTL = 24 * 60 * 60
+
+
+def freeze_frame(frame):
+    """
+    frame을 읽기 전용 배열 하나(와 읽기 전용 인덱스)로 된 DataFrame으로 바꿉니다. None이나 빈 DataFrame은 그대로 반환합니다.
+    숫자 컬럼만 있는 DataFrame(가격 데이터)을 위한 것이며, 모든 컬럼을 float64로 맞춥니다.
+    결과에 값을 대입하면 ValueError(assignment destination is read-only)가 나므로 바꾸려면 .copy()를 먼저 하세요.
+    """
+    if frame is None or frame.empty:
+        return frame
+    values = np.array(frame.to_numpy(dtype='float64'), order='F')
+    values.flags.writeable = False
+    return pd.DataFrame(values, index=frame.index.copy(), columns=frame.columns.copy(), copy=False)
+
+
+def frame_nbytes(frame):
+    """DataFrame의 값과 인덱스가 차지하는 바이트 수 (None이면 0)."""
+    if frame is None:
+        return 0
+    return int(frame.memory_usage(index=True, deep=False).sum())
+
+
+class SharedFrameCache:
+    """
+    키별 DataFrame(또는 None)을 보관하는 LRU 캐시입니다. 전체 크기가 max_bytes를 넘으면 오래 안 쓴 항목부터 버리고,
+    ttl초가 지난 항목은 다시 불러옵니다. 여러 세션(스레드)이 함께 사용합니다.
+    요청 수와 미스(loader 실행) 수는 stats(CacheStats)에 셉니다. 다른 요청의 결과를 기다린 경우는 적중으로 칩니다.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, ttl=DEFAULT_TTL, stats=None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # 키 -> (DataFrame, 바이트 수, 저장 시각)
+        self._entries = OrderedDict()
+        # 키 -> 불러오는 중인 Future
+        self._inflight = {}
+        self.nbytes = 0
+        self.stats = stats or CacheStats()
+        self.shared_waits = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_load(self, key, loader, *args, **kwargs):
+        """
+        key의 값을 반환합니다. 없으면 loader(*args, **kwargs)로 불러와 읽기 전용으로 저장합니다.
+        같은 key를 이미 다른 스레드가 불러오는 중이면 새로 부르지 않고 그 결과를 기다립니다.
+        """
+        self.stats.record_request()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[2] < self.ttl:
+                self._entries.move_to_end(key)
+                return entry[0]
+            future = self._inflight.get(key)
+            if future is not None:
+                self.shared_waits += 1
+                owner = False
+            else:
+                future = self._inflight[key] = Future()
+                owner = True
+
+        if not owner:
+            return future.result()
+        self.stats.record_miss()
+        try:
+            frame = freeze_frame(loader(*args, **kwargs))
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._inflight[key]
+            self._store(key, frame)
+        future.set_result(frame)
+        return frame
+
+    def _store(self, key, frame):
+        """self._lock을 잡은 상태에서 호출합니다."""
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.nbytes -= old[1]
+        size = frame_nbytes(frame)
+        self._entries[key] = (frame, size, time.monotonic())
+        self.nbytes += size
+        while self.nbytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self.nbytes -= evicted_size
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
@@ -0,0 +1,115 @@
+"""
+위경도 좌표 계산 도구입니다.
+
+haversine_km()은 NumPy 브로드캐스팅으로 여러 지점 사이의 대원 거리를 한 번에 계산하고,
+GeoGridIndex는 지점들을 위경도 격자 칸으로 나눠 두어 반경/영역 검색 때 주변 칸의 지점만 확인합니다.
+tile_xy()/tile_bounds()/tiles_in_bounds()는 웹 지도(Web Mercator)의 z/x/y 타일 번호를 계산합니다.
+"""
+import math
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+# 위도 1도의 거리 (km)
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# 격자 칸 번호를 하나의 정수 키로 합칠 때 쓰는 경도 방향 칸 수의 상한
+_COL_SPAN = 1 << 24
+
+# Web Mercator가 표현하는 최대 위도
+MAX_MERCATOR_LAT = 85.05112878
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """두 지점(또는 배열) 사이의 대원 거리(km)를 계산합니다. 인자는 서로 브로드캐스팅됩니다."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype='float64')) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def tile_xy(lat, lon, zoom):
+    """(lat, lon)이 들어 있는 zoom 단계 타일의 (x, y) 번호를 반환합니다."""
+    n = 1 << zoom
+    lat = math.radians(min(max(lat, -MAX_MERCATOR_LAT), MAX_MERCATOR_LAT))
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(lat)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_bounds(x, y, zoom):
+    """타일의 (남, 서, 북, 동) 경계를 위경도로 반환합니다."""
+    n = 1 << zoom
+    west, east = x / n * 360.0 - 180.0, (x + 1) / n * 360.0 - 180.0
+    north = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    south = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
+    return south, west, north, east
+
+
+def tiles_in_bounds(south, west, north, east, zoom):
+    """위경도 영역을 덮는 zoom 단계 타일들의 (zoom, x, y) 목록을 반환합니다."""
+    x0, y0 = tile_xy(north, west, zoom)
+    x1, y1 = tile_xy(south, east, zoom)
+    return [(zoom, x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+
+
+class GeoGridIndex:
+    """
+    위경도 격자(한 칸 cell_km) 공간 색인입니다.
+    지점을 (행, 열) 칸 키로 정렬해 두고, 검색 때는 영역을 덮는 칸 범위를 행마다 이진 탐색으로 잘라
+    후보만 확인합니다(반경 검색은 haversine 거리로). 경도 ±180도 경계를 넘는 검색은 고려하지 않습니다.
+    """
+
+    def __init__(self, lat, lon, cell_km=1.0):
+        self.lat = np.asarray(lat, dtype='float64')
+        self.lon = np.asarray(lon, dtype='float64')
+        self.cell_deg = cell_km / KM_PER_DEGREE
+        keys = self._keys(np.floor(self.lat / self.cell_deg), np.floor(self.lon / self.cell_deg))
+        self._order = np.argsort(keys, kind='stable')
+        self._sorted_keys = keys[self._order]
+
+    def __len__(self):
+        return len(self.lat)
+
+    @staticmethod
+    def _keys(rows, cols):
+        return rows.astype(np.int64) * _COL_SPAN + cols.astype(np.int64)
+
+    def _cells(self, south, west, north, east):
+        """위경도 영역을 덮는 칸들에 들어 있는 지점 번호를 (행, 열) 칸 순서로 반환합니다."""
+        rows = np.arange(math.floor(south / self.cell_deg), math.floor(north / self.cell_deg) + 1)
+        col_lo = math.floor(west / self.cell_deg)
+        col_hi = math.floor(east / self.cell_deg)
+        starts = np.searchsorted(self._sorted_keys, self._keys(rows, np.full(len(rows), col_lo)), side='left')
+        ends = np.searchsorted(self._sorted_keys, self._keys(rows, np.full(len(rows), col_hi)), side='right')
+        slices = [self._order[s:e] for s, e in zip(starts, ends) if e > s]
+        if not slices:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(slices)
+
+    def _candidates(self, lat, lon, radius_km):
+        """반경을 덮는 칸들에 들어 있는 지점 번호를 반환합니다."""
+        dlat = radius_km / KM_PER_DEGREE
+        # 고위도일수록 경도 1도의 거리가 짧으므로 더 많은 열을 확인
+        dlon = dlat / max(math.cos(math.radians(min(abs(lat) + dlat, 89.9))), 1e-6)
+        return self._cells(lat - dlat, lon - dlon, lat + dlat, lon + dlon)
+
+    def query_bbox(self, south, west, north, east):
+        """위경도 영역 안(경계 포함)의 지점 번호를 (행, 열) 칸 순서로 반환합니다."""
+        candidates = self._cells(south, west, north, east)
+        lat, lon = self.lat[candidates], self.lon[candidates]
+        inside = (lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)
+        return candidates[inside]
+
+    def query_radius(self, lat, lon, radius_km, limit=None):
+        """
+        (lat, lon)에서 radius_km 이내 지점의 (번호 배열, 거리 배열)을 가까운 순서로 반환합니다.
+        limit이 있으면 가까운 limit개만 반환합니다.
+        """
+        candidates = self._candidates(lat, lon, radius_km)
+        distances = haversine_km(lat, lon, self.lat[candidates], self.lon[candidates])
+        inside = distances <= radius_km
+        candidates, distances = candidates[inside], distances[inside]
+        order = np.argsort(distances, kind='stable')
+        if limit is not None:
+            order = order[:limit]
+        return candidates[order], distances[order]
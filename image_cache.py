@@ -0,0 +1,284 @@
+"""
+관광지 이미지 로컬 캐시입니다.
+
+원격 이미지는 처음 요청할 때 한 번만 내려받아 썸네일로 줄인 뒤, 원본 내용의 해시를 파일 이름으로
+디스크에 저장합니다. 이후에는 로컬 파일을 바로 반환하므로 페이지가 외부 서버 응답을 기다리지 않습니다.
+가져오기에 실패한 링크도 기록해 두고 retry_after초 동안은 다시 요청하지 않습니다.
+이미 받은 이미지를 다시 요청할 때는 서버가 준 ETag로 조건부 요청을 보내, 바뀌지 않았으면(304) 본문을 다시 받지 않습니다.
+
+명령줄에서 미리 받아 두거나(prewarm) 링크 상태를 점검(report)할 수 있습니다.
+    python image_cache.py prewarm
+    python image_cache.py report
+"""
+import argparse
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.request
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+
+# 이미지 캐시 위치 (환경 변수 IMAGE_CACHE_DIR로 변경 가능)
+DEFAULT_IMAGE_CACHE_DIR = os.environ.get("IMAGE_CACHE_DIR", ".image_cache")
+
+# 썸네일 최대 크기 (픽셀, 비율 유지)
+DEFAULT_THUMBNAIL_SIZE = (800, 800)
+# 요청 시간 제한(초), 실패한 링크를 다시 시도하기까지의 시간(초), 받을 수 있는 최대 원본 크기(바이트)
+DEFAULT_TIMEOUT = 10
+DEFAULT_RETRY_AFTER = 3600
+MAX_SOURCE_BYTES = 20 * 1024 * 1024
+
+# 위키미디어 등은 User-Agent가 없는 요청을 거부하므로 앱 이름을 보냅니다.
+USER_AGENT = "france-travel-guide/1.0 (streamlit app image cache)"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    url          TEXT PRIMARY KEY,
+    status       TEXT NOT NULL,
+    http_status  INTEGER,
+    digest       TEXT,
+    thumb_path   TEXT,
+    source_bytes INTEGER,
+    thumb_bytes  INTEGER,
+    error        TEXT,
+    elapsed_ms   REAL,
+    checked_at   REAL NOT NULL,
+    etag         TEXT
+);
+"""
+
+_COLUMNS = ('url', 'status', 'http_status', 'digest', 'thumb_path', 'source_bytes', 'thumb_bytes', 'error',
+            'elapsed_ms', 'checked_at', 'etag')
+
+
+def make_thumbnail(data, size=DEFAULT_THUMBNAIL_SIZE):
+    """이미지 바이트를 size 안에 들어오도록 줄인 JPEG 바이트로 바꿉니다 (투명 배경은 흰색으로 채움)."""
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        image = Image.open(io.BytesIO(data))
+    except UnidentifiedImageError:
+        raise ValueError("이미지 형식이 아닌 응답입니다") from None
+    with image:
+        # JPEG은 디코딩 단계에서 1/2~1/8로 줄여 읽으므로 큰 원본도 빠르게 줄일 수 있음
+        image.draft('RGB', size)
+        image.thumbnail(size)
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, 'white')
+            background.paste(image, mask=image.getchannel('A'))
+            image = background
+        elif image.mode != 'RGB':
+            image = image.convert('RGB')
+        out = io.BytesIO()
+        image.save(out, format='JPEG', quality=85, optimize=True)
+    return out.getvalue()
+
+
+class ImageCache:
+    """
+    URL별 썸네일을 디스크에 저장하고 상태를 SQLite에 기록하는 이미지 캐시입니다.
+    같은 이미지를 가리키는 여러 URL은 원본 해시가 같으므로 썸네일 파일 하나를 함께 씁니다.
+    """
+
+    def __init__(self, directory=DEFAULT_IMAGE_CACHE_DIR, size=DEFAULT_THUMBNAIL_SIZE,
+                 timeout=DEFAULT_TIMEOUT, retry_after=DEFAULT_RETRY_AFTER):
+        self.directory = directory
+        self.size = tuple(size)
+        self.timeout = timeout
+        self.retry_after = retry_after
+        os.makedirs(os.path.join(directory, "thumbs"), exist_ok=True)
+        self.path = os.path.join(directory, "images.sqlite3")
+        self._write_lock = threading.Lock()
+        # 같은 URL을 여러 세션이 동시에 요청해도 한 번만 내려받도록 URL별 잠금을 둠
+        # (사용 중인 잠금만 남도록 약한 참조로 보관)
+        self._url_locks = weakref.WeakValueDictionary()
+        self._url_locks_lock = threading.Lock()
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+            # etag 컬럼이 생기기 전에 만든 캐시 파일이면 컬럼을 추가
+            if 'etag' not in {row[1] for row in conn.execute("PRAGMA table_info(images)")}:
+                conn.execute("ALTER TABLE images ADD COLUMN etag TEXT")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _url_lock(self, url):
+        with self._url_locks_lock:
+            lock = self._url_locks.get(url)
+            if lock is None:
+                lock = self._url_locks[url] = threading.Lock()
+            return lock
+
+    def status(self, url):
+        """URL의 마지막 기록을 dict로 반환합니다 (기록이 없으면 None)."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM images WHERE url = ?", (url,)).fetchone()
+        return dict(zip(_COLUMNS, row)) if row else None
+
+    def _record(self, record):
+        with self._write_lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO images ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                [record[column] for column in _COLUMNS],
+            )
+
+    def _download(self, url, etag=None):
+        """
+        URL 내용을 받아 (HTTP 상태, 바이트, ETag)를 반환합니다.
+        etag를 주면 조건부 요청을 보내고, 내용이 바뀌지 않았으면 (304, None, etag)를 반환합니다.
+        """
+        headers = {'User-Agent': USER_AGENT}
+        if etag:
+            headers['If-None-Match'] = etag
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                data = response.read(MAX_SOURCE_BYTES + 1)
+                if len(data) > MAX_SOURCE_BYTES:
+                    raise ValueError(f"이미지가 너무 큽니다 ({MAX_SOURCE_BYTES // (1024 * 1024)} MB 초과)")
+                return response.status, data, response.headers.get('ETag')
+        except urllib.error.HTTPError as e:
+            if etag and e.code == 304:
+                return 304, None, etag
+            raise
+
+    def _store_thumbnail(self, data):
+        """원본 바이트의 썸네일을 (없으면 만들어) 저장하고 (원본 해시, 썸네일 경로)를 반환합니다."""
+        digest = hashlib.sha256(data).hexdigest()
+        thumb_path = os.path.join(self.directory, "thumbs", digest[:2], f"{digest}_{self.size[0]}x{self.size[1]}.jpg")
+        if not os.path.exists(thumb_path):
+            thumbnail = make_thumbnail(data, self.size)
+            os.makedirs(os.path.dirname(thumb_path), exist_ok=True)
+            # 다른 스레드가 읽는 중에 덜 쓴 파일이 보이지 않도록 임시 파일에 쓴 뒤 이름을 바꿈
+            temp_path = f"{thumb_path}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(thumbnail)
+            os.replace(temp_path, thumb_path)
+        return digest, thumb_path
+
+    def fetch(self, url):
+        """
+        URL을 새로 내려받아 썸네일을 만들고 결과를 기록한 뒤 그 기록을 반환합니다.
+        이미 썸네일이 있는 URL은 ETag로 조건부 요청을 보내고, 서버가 304로 답하면 기존 썸네일을 그대로 씁니다.
+        실패해도 예외를 던지지 않고 status가 'error'인 기록을 남깁니다. 단 이미 썸네일이 있으면 그 기록(status 'ok')을
+        유지하고 error에 이번 실패만 적습니다.
+        """
+        previous = self.status(url)
+        if previous is None or previous['status'] != 'ok' or not os.path.exists(previous['thumb_path']):
+            previous = None
+        record = dict.fromkeys(_COLUMNS)
+        record['url'] = url
+        started = time.perf_counter()
+        try:
+            record['http_status'], data, record['etag'] = self._download(url, previous and previous['etag'])
+            if data is None:
+                # 304: 내용이 그대로이므로 기존 썸네일과 크기 정보를 유지
+                record.update({column: previous[column] for column in
+                               ('status', 'digest', 'thumb_path', 'source_bytes', 'thumb_bytes')})
+            else:
+                digest, thumb_path = self._store_thumbnail(data)
+                record.update(status='ok', digest=digest, thumb_path=thumb_path, source_bytes=len(data),
+                              thumb_bytes=os.path.getsize(thumb_path))
+        except urllib.error.HTTPError as e:
+            record.update(status='error', http_status=e.code, error=f"HTTP {e.code} {e.reason}")
+        except Exception as e:
+            record.update(status='error', error=f"{type(e).__name__}: {e}")
+        if record['status'] == 'error' and previous is not None:
+            # 다시 받기가 실패해도 기존 썸네일은 계속 쓰고, 실패 내용(상태 코드, 오류)만 기록
+            record = {**previous, 'http_status': record['http_status'], 'error': record['error']}
+        record['elapsed_ms'] = (time.perf_counter() - started) * 1000
+        record['checked_at'] = time.time()
+        self._record(record)
+        return record
+
+    def get(self, url):
+        """
+        URL의 로컬 썸네일 경로를 반환합니다. 캐시에 없으면 내려받아 만들고,
+        가져올 수 없는 링크면(최근 retry_after초 안에 실패한 경우 포함) None을 반환합니다.
+        """
+        record = self.status(url)
+        if not self._usable(record):
+            with self._url_lock(url):
+                # 잠금을 기다리는 동안 다른 세션이 받아 두었을 수 있으므로 다시 확인
+                record = self.status(url)
+                if not self._usable(record):
+                    record = self.fetch(url)
+        if record['status'] == 'ok' and os.path.exists(record['thumb_path']):
+            return record['thumb_path']
+        return None
+
+    def _usable(self, record):
+        """기록을 그대로 쓸 수 있는지 (썸네일이 있거나, 최근 실패라 다시 시도하지 않을지) 확인합니다."""
+        if record is None:
+            return False
+        if record['status'] == 'ok':
+            return os.path.exists(record['thumb_path'])
+        return time.time() - record['checked_at'] < self.retry_after
+
+    def prewarm(self, urls, workers=8, force=False):
+        """
+        여러 URL을 동시에 workers개씩 미리 받아 두고, URL 순서대로 기록 목록을 반환합니다.
+        force가 아니면 이미 받아 둔 URL은 다시 받지 않습니다 (force=True면 링크 상태 점검용으로 모두 다시 요청).
+        """
+        def one(url):
+            if not force:
+                self.get(url)
+                return self.status(url)
+            return self.fetch(url)
+
+        urls = list(dict.fromkeys(urls))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(one, urls))
+
+
+def format_health_report(records):
+    """
+    링크 상태 기록 목록을 사람이 읽기 쉬운 표 문자열로 만듭니다.
+    마지막 요청은 실패했지만 예전 썸네일이 남아 있는 링크는 stale로 표시하고 OK로 세지 않습니다.
+    """
+    lines = [f"{'status':<6} {'http':>4} {'ms':>7} {'source KB':>9} {'thumb KB':>8}  url / error"]
+    for record in records:
+        status = 'stale' if record['status'] == 'ok' and record['error'] else record['status']
+        source_kb = f"{record['source_bytes'] / 1024:.1f}" if record['source_bytes'] else "-"
+        thumb_kb = f"{record['thumb_bytes'] / 1024:.1f}" if record['thumb_bytes'] else "-"
+        lines.append(f"{status:<6} {record['http_status'] or '-':>4} {record['elapsed_ms']:7.0f} "
+                     f"{source_kb:>9} {thumb_kb:>8}  {record['url']}")
+        if record['error']:
+            lines.append(f"{'':>40}{record['error']}")
+    ok = sum(record['status'] == 'ok' and not record['error'] for record in records)
+    lines.append(f"{ok}/{len(records)} links OK")
+    return "\n".join(lines)
+
+
+def attraction_image_urls(path=None):
+    """관광지 데이터 파일에 있는 모든 이미지 URL을 반환합니다."""
+    from attractions import DEFAULT_ATTRACTIONS_PATH, AttractionStore
+
+    store = AttractionStore(path or DEFAULT_ATTRACTIONS_PATH)
+    return [record['image_url'] for city in store.cities() for record in store.city_spots(city).values()
+            if record.get('image_url')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="관광지 이미지 캐시 미리 받기 / 링크 상태 점검")
+    parser.add_argument('command', choices=('prewarm', 'report'),
+                        help='prewarm: 캐시에 없는 이미지만 받기, report: 모든 링크를 다시 요청해 상태 표시')
+    parser.add_argument('--attractions', help='관광지 데이터 파일 (기본값: attractions.jsonl)')
+    parser.add_argument('--cache-dir', default=DEFAULT_IMAGE_CACHE_DIR)
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    cache = ImageCache(args.cache_dir)
+    records = cache.prewarm(attraction_image_urls(args.attractions), workers=args.workers,
+                            force=args.command == 'report')
+    print(format_health_report(records))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,239 @@
+"""
+주가 보조 지표 계산 엔진입니다.
+
+모든 지표 함수는 (새 가격 배열, 이전 상태)를 받아 (결과 dict, 다음 상태)를 반환합니다.
+처음에는 state=None으로 전체 기간을 계산하고, 새 봉이 들어오면 새 봉과 이전 상태만으로
+이어서 계산하므로 전체 기간을 다시 계산하지 않습니다. 배열은 1차원(한 기업) 또는
+2차원(시점 x 기업)을 모두 받으며, 시간 축(axis 0)에 NaN이 없어야 합니다.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS_PER_YEAR = 252
+
+# 이 행 수 이하의 증분 EWM 계산은 NumPy 반복으로 처리합니다.
+_SHORT_EWM_ROWS = 32
+
+
+def _prepend(state_rows, values):
+    """이전 호출에서 남겨 둔 꼬리 행을 새 값 앞에 붙이고, 붙인 행 수를 함께 반환합니다."""
+    if state_rows is None or len(state_rows) == 0:
+        return values, 0
+    return np.concatenate([state_rows, values]), len(state_rows)
+
+
+def _rolling_sum(values, window):
+    """누적합 차이로 계산하는 O(n) 이동 합계. 앞쪽 window-1 행은 NaN입니다."""
+    cumsum = np.cumsum(values, axis=0, dtype='float64')
+    out = np.full(cumsum.shape, np.nan)
+    if len(values) >= window:
+        out[window - 1:] = cumsum[window - 1:]
+        out[window:] -= cumsum[:-window]
+    return out
+
+
+def _rolling_mean_std(values, window):
+    """이동 평균과 이동 표준편차(모표준편차)를 함께 계산합니다."""
+    mean = _rolling_sum(values, window) / window
+    mean_sq = _rolling_sum(values * values, window) / window
+    std = np.sqrt(np.maximum(mean_sq - mean * mean, 0.0))
+    return mean, std
+
+
+def _ewm(values, alpha, seed=None):
+    """
+    지수 가중 이동 평균 y[t] = (1 - alpha) * y[t-1] + alpha * x[t] 를 계산합니다.
+    seed가 주어지면 그 값을 y[-1]로 두고 이어서 계산합니다.
+    """
+    if seed is not None and len(values) <= _SHORT_EWM_ROWS:
+        # 새 봉 몇 개만 이어서 계산할 때는 pandas를 거치지 않는 편이 훨씬 빠름
+        out = np.empty(values.shape)
+        prev = seed
+        for i in range(len(values)):
+            prev = (1.0 - alpha) * prev + alpha * values[i]
+            out[i] = prev
+        return out
+    if seed is None:
+        frame = pd.DataFrame(values)
+        return frame.ewm(alpha=alpha, adjust=False).mean().to_numpy().reshape(values.shape)
+    stacked = np.concatenate([np.reshape(seed, (1,) + values.shape[1:]), values])
+    result = pd.DataFrame(stacked).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return result[1:].reshape(values.shape)
+
+
+def sma(values, window=20, state=None):
+    """단순 이동 평균. state는 직전 window-1개 가격입니다."""
+    full, skip = _prepend(state, values)
+    out = _rolling_sum(full, window)[skip:] / window
+    return {'SMA': out}, full[-(window - 1):] if window > 1 else full[:0]
+
+
+def ema(values, span=20, state=None):
+    """지수 이동 평균. state는 직전 EMA 값입니다."""
+    out = _ewm(values, 2.0 / (span + 1), seed=state)
+    return {'EMA': out}, out[-1]
+
+
+def bollinger(values, window=20, num_std=2.0, state=None):
+    """볼린저 밴드 (중심선 = 이동 평균, 상/하단 = 중심선 ± num_std × 이동 표준편차)."""
+    full, skip = _prepend(state, values)
+    mean, std = _rolling_mean_std(full, window)
+    mean, std = mean[skip:], std[skip:]
+    result = {'BB Middle': mean, 'BB Upper': mean + num_std * std, 'BB Lower': mean - num_std * std}
+    return result, full[-(window - 1):] if window > 1 else full[:0]
+
+
+def rsi(values, window=14, state=None):
+    """
+    RSI (Wilder 평활). state는 (직전 가격, 평균 상승폭, 평균 하락폭)입니다.
+    첫 계산의 첫 행은 직전 가격이 없으므로 NaN입니다.
+    """
+    if state is None:
+        deltas = np.diff(values, axis=0)
+        gain_seed = loss_seed = None
+        lead = np.full((1,) + values.shape[1:], np.nan)
+    else:
+        last_price, gain_seed, loss_seed = state
+        deltas = np.diff(np.concatenate([np.reshape(last_price, (1,) + values.shape[1:]), values]), axis=0)
+        lead = np.empty((0,) + values.shape[1:])
+    if len(deltas) == 0:
+        # 봉이 하나뿐이면 평균은 아직 없지만, 다음 봉의 변화량을 구할 수 있도록 가격은 상태로 넘김
+        if state is None and len(values):
+            state = (values[-1], None, None)
+        return {'RSI': lead[:len(values)]}, state
+
+    avg_gain = _ewm(np.maximum(deltas, 0.0), 1.0 / window, seed=gain_seed)
+    avg_loss = _ewm(np.maximum(-deltas, 0.0), 1.0 / window, seed=loss_seed)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = np.where(avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
+    return {'RSI': np.concatenate([lead, out])}, (values[-1], avg_gain[-1], avg_loss[-1])
+
+
+def macd(values, fast=12, slow=26, signal=9, state=None):
+    """MACD 선, 시그널 선, 히스토그램. state는 (빠른 EMA, 느린 EMA, 시그널 EMA)의 직전 값입니다."""
+    fast_seed, slow_seed, signal_seed = state if state is not None else (None, None, None)
+    fast_ema = _ewm(values, 2.0 / (fast + 1), seed=fast_seed)
+    slow_ema = _ewm(values, 2.0 / (slow + 1), seed=slow_seed)
+    line = fast_ema - slow_ema
+    signal_line = _ewm(line, 2.0 / (signal + 1), seed=signal_seed)
+    result = {'MACD': line, 'MACD Signal': signal_line, 'MACD Hist': line - signal_line}
+    return result, (fast_ema[-1], slow_ema[-1], signal_line[-1])
+
+
+def volatility(values, window=20, state=None):
+    """로그 수익률의 이동 표준편차를 연율화한 변동성(%). state는 직전 window개 가격입니다."""
+    full, skip = _prepend(state, values)
+    returns = np.diff(np.log(full), axis=0)
+    _, std = _rolling_mean_std(returns, window)
+    # 수익률은 가격보다 한 행 짧으므로 맨 앞에 NaN 한 행을 채워 가격과 길이를 맞춤
+    std = np.concatenate([np.full((1,) + std.shape[1:], np.nan), std])
+    out = std[skip:] * np.sqrt(TRADING_DAYS_PER_YEAR) * 100
+    return {'Volatility': out}, full[-window:]
+
+
+def drawdown(values, state=None):
+    """고점 대비 하락률(%). state는 지금까지의 최고가입니다."""
+    running_max = np.fmax.accumulate(values, axis=0)
+    if state is not None:
+        running_max = np.fmax(running_max, state)
+    out = (values / running_max - 1.0) * 100
+    return {'Drawdown': out}, running_max[-1]
+
+
+# 지표 이름 -> (계산 함수, 기본 파라미터, 가격 차트 위에 겹쳐 그릴지 여부)
+INDICATORS = {
+    'SMA': (sma, {'window': 20}, True),
+    'EMA': (ema, {'span': 20}, True),
+    'Bollinger': (bollinger, {'window': 20, 'num_std': 2.0}, True),
+    'RSI': (rsi, {'window': 14}, False),
+    'MACD': (macd, {'fast': 12, 'slow': 26, 'signal': 9}, False),
+    'Volatility': (volatility, {'window': 20}, False),
+    'Drawdown': (drawdown, {}, False),
+}
+
+
+class _Entry:
+    """캐시 항목: 시각(ns) 배열, 지표별 결과 배열, 계산에 쓴 입력 가격 배열, 이어서 계산할 상태."""
+    __slots__ = ('times', 'columns', 'values', 'state', 'frame')
+
+    def __init__(self, times, columns, values, state):
+        self.times = times
+        self.columns = columns
+        self.values = values
+        self.state = state
+        self.frame = None
+
+    def to_frame(self):
+        """결과를 DataFrame으로 만들어 반환합니다 (같은 항목이면 한 번만 만듦)."""
+        if self.frame is None:
+            self.frame = pd.DataFrame(self.columns, index=pd.DatetimeIndex(self.times))
+        return self.frame
+
+
+class IndicatorEngine:
+    """
+    (티커, 지표, 파라미터)별로 계산 결과를 캐시하는 지표 엔진입니다.
+    같은 키로 다시 요청할 때 앞부분이 같고 새 봉만 늘었다면 새 봉만 이어서 계산합니다.
+    지표 값은 기간 시작부터의 모든 봉에 따라 달라지므로, 기간 시작일이 바뀌면 처음부터 다시 계산합니다.
+    """
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.full_computes = 0
+        self.incremental_updates = 0
+
+    def _extend(self, entry, func, params, times, values):
+        """캐시 항목을 새 입력에 맞춰 이어서 계산합니다. 재사용할 수 없으면 None을 반환합니다."""
+        if entry is None or len(entry.times) == 0 or len(times) == 0:
+            return None
+        # 캐시 전체가 새 입력의 앞부분과 시각, 값 모두 같아야 함 (시작일이 바뀌었거나
+        # 수정 주가 반영 등으로 과거 값이 하나라도 바뀌었으면 전체 재계산)
+        last_pos = len(entry.times) - 1
+        if (last_pos >= len(times)
+                or not np.array_equal(times[:last_pos + 1], entry.times)
+                or not np.array_equal(values[:last_pos + 1], entry.values)):
+            return None
+
+        new_values = values[last_pos + 1:]
+        if len(new_values) == 0:
+            return entry
+        result, state = func(new_values, state=entry.state, **params)
+        columns = {name: np.concatenate([arr, result[name]]) for name, arr in entry.columns.items()}
+        self.incremental_updates += 1
+        return _Entry(times, columns, np.concatenate([entry.values, new_values]), state)
+
+    def compute(self, ticker, name, prices, **params):
+        """
+        prices(날짜 인덱스 Series)에 대한 지표를 DataFrame으로 반환합니다.
+        params를 생략하면 INDICATORS의 기본 파라미터를 사용합니다.
+        """
+        func, defaults, _ = INDICATORS[name]
+        params = {**defaults, **params}
+        key = (ticker, name, tuple(sorted(params.items())))
+
+        values = prices.to_numpy(dtype='float64')
+        times = pd.DatetimeIndex(prices.index).asi8
+        missing = np.isnan(values)
+        if missing.any():
+            values, times = values[~missing], times[~missing]
+
+        with self._lock:
+            entry = self._cache.get(key)
+
+        updated = self._extend(entry, func, params, times, values)
+        if updated is None:
+            result, state = func(values, **params)
+            updated = _Entry(times, result, values, state)
+            self.full_computes += 1
+
+        with self._lock:
+            self._cache[key] = updated
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return updated.to_frame()
@@ -0,0 +1,84 @@
+"""
+여러 관광지를 도는 방문 순서를 정하는 도구입니다.
+
+출발지와 방문할 곳들 사이의 직선거리 행렬을 만들고, 출발지에서 가장 가까운 곳을 차례로 고르는
+최근접 이웃 경로를 만든 뒤 2-opt(경로의 한 구간을 뒤집어 더 짧아지면 바꾸기)로 다듬습니다.
+경로는 출발지에서 시작해 마지막 방문지에서 끝나며 출발지로 돌아오지 않습니다.
+"""
+import time
+
+import numpy as np
+
+from geo import haversine_km
+
+# 2-opt 개선에 쓰는 최대 시간(초). 시간이 다 되면 그때까지 찾은 경로를 반환합니다.
+DEFAULT_TIME_BUDGET = 0.15
+
+
+def distance_matrix(lat, lon):
+    """지점들 사이의 직선거리(km) 행렬을 반환합니다."""
+    lat, lon = np.asarray(lat, dtype='float64'), np.asarray(lon, dtype='float64')
+    return haversine_km(lat[:, None], lon[:, None], lat[None, :], lon[None, :])
+
+
+def nearest_neighbour_tour(dist, start=0):
+    """start에서 출발해 방문하지 않은 가장 가까운 지점으로 차례로 이동하는 순서를 반환합니다."""
+    n = len(dist)
+    visited = np.zeros(n, dtype=bool)
+    tour = [start]
+    visited[start] = True
+    for _ in range(n - 1):
+        row = np.where(visited, np.inf, dist[tour[-1]])
+        nxt = int(np.argmin(row))
+        tour.append(nxt)
+        visited[nxt] = True
+    return np.asarray(tour, dtype=np.int64)
+
+
+def two_opt(dist, tour, time_budget=DEFAULT_TIME_BUDGET):
+    """
+    열린 경로 tour를 2-opt로 다듬어 반환합니다 (첫 지점은 고정).
+    매번 뒤집을 수 있는 모든 구간 (i, j)의 거리 변화를 한 번에 계산해 가장 많이 줄어드는 구간을 뒤집고,
+    더 줄일 수 없거나 time_budget초가 지나면 멈춥니다.
+    """
+    tour = np.array(tour, dtype=np.int64)
+    n = len(tour)
+    if n < 3:
+        return tour
+    deadline = time.perf_counter() + time_budget
+    # 구간 tour[i:j+1]을 뒤집으면 간선 (i-1, i), (j, j+1)이 (i-1, j), (i, j+1)로 바뀜
+    i = np.arange(1, n - 1)[:, None]
+    j = np.arange(2, n)[None, :]
+    valid = j > i
+    # 마지막 지점 다음은 없으므로 그 간선의 거리는 0으로 셈
+    has_next = j < n - 1
+    j_next = np.minimum(j + 1, n - 1)
+    while time.perf_counter() < deadline:
+        prev, first, last, after = tour[i - 1], tour[i], tour[j], tour[j_next]
+        old = dist[prev, first] + np.where(has_next, dist[last, after], 0.0)
+        new = dist[prev, last] + np.where(has_next, dist[first, after], 0.0)
+        delta = np.where(valid, new - old, 0.0)
+        best = np.unravel_index(np.argmin(delta), delta.shape)
+        if delta[best] > -1e-9:
+            break
+        a, b = int(i[best[0], 0]), int(j[0, best[1]])
+        tour[a:b + 1] = tour[a:b + 1][::-1]
+    return tour
+
+
+def tour_length(dist, tour):
+    """경로의 구간별 거리 배열을 반환합니다."""
+    tour = np.asarray(tour)
+    return dist[tour[:-1], tour[1:]]
+
+
+def plan_route(dist, stops, start, time_budget=DEFAULT_TIME_BUDGET):
+    """
+    거리 행렬 dist의 지점 번호 stops를 start에서 출발해 도는 방문 순서를 반환합니다.
+    반환값은 (방문 순서의 지점 번호 배열, 구간별 거리 배열)이며 첫 지점은 start입니다.
+    """
+    stops = [start] + [s for s in dict.fromkeys(stops) if s != start]
+    sub = dist[np.ix_(stops, stops)]
+    order = two_opt(sub, nearest_neighbour_tour(sub, 0), time_budget)
+    route = np.asarray(stops, dtype=np.int64)[order]
+    return route, tour_length(dist, route)
@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from stock_data import OHLC_COLS, prepare_price_frame
+
+# 실시간 모드에서 화면에 유지하는 최대 봉 수 (1분봉 기준 정규장 하루)
+DEFAULT_LIVE_CAPACITY = 390
+
+
+class BarBuffer:
+    """
+    최근 capacity개의 봉만 보관하는 고정 크기 링 버퍼입니다.
+    봉이 계속 들어와도 메모리와 차트 데이터 크기가 일정하게 유지됩니다.
+    """
+
+    def __init__(self, capacity=DEFAULT_LIVE_CAPACITY):
+        self.capacity = capacity
+        self._times = np.empty(capacity, dtype='datetime64[ns]')
+        self._values = np.empty((capacity, len(OHLC_COLS)), dtype='float64')
+        self._start = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def last_time(self):
+        """가장 최근 봉의 시각 (비어 있으면 None)."""
+        if self._size == 0:
+            return None
+        return pd.Timestamp(self._times[(self._start + self._size - 1) % self.capacity])
+
+    def extend(self, bars):
+        """
+        OHLC DataFrame에서 마지막 봉보다 새로운 봉만 추가하고, 추가된 개수를 반환합니다.
+        마지막 봉과 같은 시각의 봉은 진행 중인 봉으로 보고 값을 갱신합니다.
+        """
+        if bars is None or bars.empty:
+            return 0
+        last = self.last_time
+        if last is not None:
+            if last in bars.index:
+                self._values[(self._start + self._size - 1) % self.capacity] = bars.loc[last, OHLC_COLS].to_numpy(dtype='float64')
+            bars = bars[bars.index > last]
+        # 용량보다 많이 들어오면 최근 것만 남김
+        bars = bars.iloc[-self.capacity:]
+        times = pd.DatetimeIndex(bars.index).tz_localize(None).to_numpy(dtype='datetime64[ns]')
+        values = bars[OHLC_COLS].to_numpy(dtype='float64')
+        for t, row in zip(times, values):
+            pos = (self._start + self._size) % self.capacity
+            self._times[pos] = t
+            self._values[pos] = row
+            if self._size < self.capacity:
+                self._size += 1
+            else:
+                self._start = (self._start + 1) % self.capacity
+        return len(times)
+
+    def arrays(self):
+        """시간 순서로 정렬된 (시각 배열, OHLC 2차원 배열)을 반환합니다."""
+        order = (self._start + np.arange(self._size)) % self.capacity
+        return self._times[order], self._values[order]
+
+
+class SyntheticTickSource:
+    """
+    테스트와 데모용 합성 분봉 생성기입니다. 같은 seed면 항상 같은 가격 경로를 만듭니다.
+    네트워크 없이 실시간 모드를 확인할 수 있도록 호출 시각까지의 봉을 interval 간격으로 생성합니다.
+    """
+
+    def __init__(self, ticker, interval=timedelta(minutes=1), seed=0, start_price=100.0):
+        self.ticker = ticker
+        self.interval = interval
+        self.seed = seed
+        self.start_price = start_price
+        self._origin = pd.Timestamp(datetime.now()).floor('D')
+        # seed마다 고정된 추세(봉당 로그 수익률)
+        self._drift = np.random.default_rng(seed).normal(0, 0.0002)
+
+    def _bar_at(self, i):
+        """i번째 봉의 OHLC를 계산합니다 (i만으로 결정되므로 순서와 관계없이 재현 가능)."""
+        rng = np.random.default_rng((self.seed, i))
+        close = self.start_price * np.exp(self._drift * i + 0.002 * np.sin(i / 30) + rng.normal(0, 0.001))
+        open_ = close * (1 + rng.normal(0, 0.0005))
+        high = max(open_, close) * (1 + abs(rng.normal(0, 0.0005)))
+        low = min(open_, close) * (1 - abs(rng.normal(0, 0.0005)))
+        return open_, high, low, close
+
+    def fetch_new_bars(self, since=None, now=None):
+        """since 이후부터 now까지의 봉을 OHLC DataFrame으로 반환합니다."""
+        now = pd.Timestamp(now or datetime.now())
+        last_index = int((now - self._origin) / self.interval)
+        first_index = 0 if since is None else int((pd.Timestamp(since) - self._origin) / self.interval)
+        first_index = max(first_index, last_index - DEFAULT_LIVE_CAPACITY + 1, 0)
+        indices = range(first_index, last_index + 1)
+        index = pd.DatetimeIndex([self._origin + i * self.interval for i in indices])
+        return pd.DataFrame([self._bar_at(i) for i in indices], index=index, columns=OHLC_COLS)
+
+
+class YahooIntradaySource:
+    """Yahoo Finance에서 당일 분봉을 가져오는 실시간 데이터 소스입니다."""
+
+    def __init__(self, ticker, interval="1m"):
+        self.ticker = ticker
+        self.interval = interval
+
+    def fetch_new_bars(self, since=None, now=None):
+        """당일 분봉 중 since 이후의 봉만 반환합니다. 실패하면 빈 DataFrame을 반환합니다."""
+        # yfinance는 import가 무거우므로 실제로 요청할 때 불러옴
+        import yfinance as yf
+        try:
+            data = yf.download(self.ticker, period="1d", interval=self.interval, progress=False)
+        except Exception:
+            return pd.DataFrame(columns=OHLC_COLS)
+        if isinstance(data.columns, pd.MultiIndex):
+            # 단일 티커 응답의 (항목, 티커) 컬럼에서 티커 레벨 제거
+            data = data.droplevel(1, axis=1)
+        frame = prepare_price_frame(data)
+        if frame is None or not all(col in frame.columns for col in OHLC_COLS):
+            return pd.DataFrame(columns=OHLC_COLS)
+        frame.index = pd.DatetimeIndex(frame.index).tz_localize(None)
+        if since is not None:
+            frame = frame[frame.index >= pd.Timestamp(since)]
+        return frame[OHLC_COLS]
@@ -1,133 +1,89 @@
+import copy
+import os
+
 import streamlit as st
-import folium
-from streamlit_folium import st_folium
-
-# 도시별 관광지 데이터 (이미지, 근처 명소 정보 포함)
-# 모든 관광지 이미지 링크를 안정적인 웹 이미지 링크로 교체했습니다.
-cities = {
-    "파리": {
-        "에펠탑": {
-            "location": [48.8584, 2.2945],
-            "description": """
-**✨ 파리의 상징, 에펠탑 (Tour Eiffel)**
-
-환영합니다! 프랑스 파리 하면 가장 먼저 떠오르는, 빛나는 철골 구조물, 바로 에펠탑입니다. 밤이 되면 반짝이는 조명은 파리의 밤하늘을 더욱 로맨틱하게 만들어준답니다.
-
-**놓치지 마세요!**
-* **전망대:** 에펠탑에 올라 파리 시내를 한눈에 담아보세요. 특히 해 질 녘 노을과 야경은 정말 감동적이에요!
-* **잔디밭 피크닉:** 에펠탑 아래 샹 드 마르스 공원에서 여유롭게 피크닉을 즐기며 에펠탑의 웅장함을 감상해보세요.
-* **팁:** 미리 온라인으로 티켓을 예매하면 긴 줄을 피할 수 있어요!
-""",
-            "image_url": "https://upload.wikimedia.org/wikipedia/commons/thumb/8/85/Tour_Eiffel_Wikimedia_Commons_%28cropped%29.jpg/250px-Tour_Eiffel_Wikimedia_Commons_%28cropped%29.jpg",  # 위키미디어 공용 이미지
-            "nearby": [
-                {"name": "샹 드 마르스 공원", "distance": "도보 5분"},
-                {"name": "사이요 궁", "distance": "도보 10분"},
-                {"name": "개선문", "distance": "차량 10분"}
-            ]
-        },
-        "루브르 박물관": {
-            "location": [48.8606, 2.3376],
-            "description": """
-**🎨 세계 최대의 예술의 보고, 루브르 박물관 (Musée du Louvre)**
-
-예술을 사랑하는 분이라면 절대 놓칠 수 없는 곳, 루브르 박물관입니다. 유리 피라미드를 통해 입장하면, 고대 문명부터 근세까지 수많은 걸작들이 여러분을 기다리고 있어요.
-
-**꼭 봐야 할 작품!**
-* **모나리자 (Mona Lisa):** 레오나르도 다빈치의 신비로운 미소를 직접 만나보세요.
-* **밀로의 비너스 (Venus de Milo):** 완벽한 비율을 자랑하는 고대 그리스 조각상입니다.
-* **사모트라케의 니케 (Winged Victory of Samothrace):** 박물관 중앙 계단에 우뚝 솟아 있는 승리의 여신상입니다.
-
-**팁:** 박물관이 워낙 넓으니, 미리 보고 싶은 작품을 정해 동선을 짜는 것이 좋아요!
-""",
-            "image_url": "https://upload.wikimedia.org/wikipedia/commons/thumb/6/66/The_Louvre_Museum_in_Paris.jpg/1200px-The_Louvre_Museum_in_Paris.jpg",  # 위키미디어 공용 이미지
-            "nearby": [
-                {"name": "튈르리 정원", "distance": "도보 2분"},
-                {"name": "오르세 미술관", "distance": "도보 15분"},
-                {"name": "팔레 루아얄", "distance": "도보 5분"}
-            ]
-        },
-        "베르사유 궁전": {
-            "location": [48.8049, 2.1204],
-            "description": """
-**👑 프랑스 왕실의 화려함, 베르사유 궁전 (Château de Versailles)**
-
-파리 근교에 위치한 베르사유 궁전은 프랑스 절대 왕정의 상징이자, 화려함의 극치를 보여주는 곳입니다. 궁전 내부는 물론, 광대한 정원도 압도적인 아름다움을 자랑합니다.
-
-**하이라이트!**
-* **거울의 방 (Galerie des Glaces):** 화려한 샹들리에와 거울로 장식된 이 방은 눈부신 아름다움에 감탄을 자아내게 할 거예요.
-* **정원 (Jardins de Versailles):** 섬세하게 가꿔진 넓은 정원을 산책하거나, 보트를 타는 등 다양한 방법으로 즐길 수 있습니다. 분수쇼도 놓치지 마세요!
-* **트리아농 궁전 (Grand Trianon & Petit Trianon):** 마리 앙투아네트가 즐겨 찾던 작은 궁전들도 방문해보세요.
-""",
-            "image_url": "https://upload.wikimedia.org/wikipedia/commons/thumb/4/4e/Versailles_Chateau.jpg/1200px-Versailles_Chateau.jpg",  # 위키미디어 공용 이미지
-            "nearby": [
-                {"name": "트리아농 궁전", "distance": "도보 15분"},
-                {"name": "마리 앙투아네트의 영지", "distance": "도보 20분"},
-                {"name": "베르사유 정원 오랑주리", "distance": "도보 10분"}
-            ]
-        }
-    },
-    "노르망디": {
-        "몽생미셸": {
-            "location": [48.6361, -1.5115],
-            "description": """
-**🏰 신비로운 수도원 섬, 몽생미셸 (Mont-Saint-Michel)**
-
-마치 동화 속에 들어온 듯한 착각을 불러일으키는 몽생미셸은 노르망디 해안에 위치한 수도원 섬입니다. 유네스코 세계유산으로 지정된 이곳은 밀물과 썰물의 차이가 만들어내는 장관으로 유명해요.
-
-**특별한 경험!**
-* **수도원 탐방:** 바다 위에 홀로 솟아 있는 수도원 내부를 탐방하며 중세 건축의 아름다움을 느껴보세요.
-* **밀물과 썰물:** 방문 시기에 따라 몽생미셸이 섬이 되거나 육지와 연결되는 모습을 볼 수 있습니다. 썰물 때는 갯벌을 걷는 체험도 가능해요!
-* **야경:** 밤이 되면 조명이 켜져 더욱 신비롭고 아름다운 모습을 감상할 수 있습니다.
-""",
-            "image_url": "https://upload.wikimedia.org/wikipedia/commons/thumb/b/b7/Mont_St_Michel_3.jpg/1200px-Mont_St_Michel_3.jpg",  # 위키미디어 공용 이미지
-            "nearby": [
-                {"name": "몽생미셸 만", "distance": "인근"},
-                {"name": "아브랑슈", "distance": "차량 20분"},
-                {"name": "캉칼 (굴 생산지)", "distance": "차량 40분"}
-            ]
-        }
-    },
-    "남프랑스 (코트다쥐르)": {
-        "니스": {
-            "location": [43.7000, 7.2661],
-            "description": """
-**☀️ 햇살 가득한 해변 도시, 니스 (Nice)**
-
-지중해의 푸른 바다와 따뜻한 햇살이 반기는 니스에 오신 것을 환영합니다! '천사의 만'이라 불리는 아름다운 해변과 활기찬 구시가지가 매력적인 도시입니다.
-
-**니스에서 즐길 거리!**
-* **프롬나드 데 장글레 (Promenade des Anglais):** 니스의 상징인 해변 산책로를 따라 걸으며 지중해의 아름다움을 만끽해보세요. 자전거를 타거나 조깅을 하기에도 좋습니다.
-* **구시가지 (Vieux Nice):** 좁은 골목길을 따라 아기자기한 상점과 레스토랑, 카페들이 즐비합니다. 신선한 해산물 요리도 꼭 맛보세요!
-* **마세나 광장 (Place Masséna): 물론, 독특한 조형물과 아름다운 건축물들이 어우러져 있습니다.**
-""",
-            "image_url": "https://upload.wikimedia.org/wikipedia/commons/thumb/5/5a/Nice_France_Promenade_des_Anglais.jpg/1200px-Nice_France_Promenade_des_Anglais.jpg",  # 위키미디어 공용 이미지
-            "nearby": [
-                {"name": "빌 프랑슈 쉬르 메르", "distance": "차량 15분"},
-                {"name": "에즈 빌리지", "distance": "차량 20분"},
-                {"name": "마티스 미술관", "distance": "차량 10분"}
-            ]
-        },
-        "칸": {
-            "location": [43.5516, 7.0177],
-            "description": """
-**🎬 영화제의 도시, 칸 (Cannes)**
-
-매년 5월, 세계적인 영화배우와 감독들이 모여드는 영화제의 도시, 칸입니다. 영화제가 아니더라도 고급스러운 분위기와 아름다운 해변을 즐길 수 있는 매력적인 곳이에요.
-
-**칸에서 꼭 해봐야 할 것!**
-* **레드 카펫 밟기 (Palais des Festivals et des Congrès):** 칸 국제영화제가 열리는 영화궁 앞에서 스타들처럼 레드 카펫을 밟아보는 특별한 경험을 해보세요!
-* **크루아제트 거리 (La Croisette):** 고급 부티크와 호텔들이 늘어선 해변 산책로입니다. 지중해의 풍경을 감상하며 여유로운 시간을 보내보세요.
-* **레렝 군도 (Îles de Lérins):** 페리를 타고 가까운 레렝 군도로 가서 자연 속에서 평화로운 시간을 보내거나, '철가면'의 전설이 깃든 생트 마르그리트 섬을 방문해보세요.
-""",
-            "image_url": "https://upload.wikimedia.org/wikipedia/commons/thumb/9/9c/Cannes_Film_Festival_2010.jpg/1200px-Cannes_Film_Festival_2010.jpg",  # 위키미디어 공용 이미지
-            "nearby": [
-                {"name": "레렝 군도", "distance": "페리 20분"},
-                {"name": "그라스 (향수의 도시)", "distance": "차량 30분"},
-                {"name": "앙티브", "distance": "차량 20분"}
-            ]
-        }
-    }
-}
+import itinerary
+import search_index
+from attractions import DEFAULT_ATTRACTIONS_PATH, DEFAULT_NEARBY_RADIUS_KM, AttractionStore, ViewportLoader, distance_label
+from image_cache import ImageCache
+from page_profiler import PageProfiler, lazy_import
+
+# 실행 시간 계측 (PAGE_PROFILE=1 또는 ?profile=1 일 때만 기록)
+profiler = PageProfiler("main")
+
+# 관광지 데이터는 attractions.jsonl에 한 줄에 하나씩 저장되어 있으며, 선택한 도시의 관광지만 읽어 옵니다.
+# 이미지 링크는 안정적인 웹 이미지 링크(위키미디어 공용)를 사용합니다.
+@st.cache_resource(show_spinner=False)
+def get_attraction_store(path, modified_at):
+    """관광지 파일의 색인을 만들어 모든 세션이 공유합니다. 파일이 바뀌면(modified_at) 색인을 새로 만듭니다."""
+    return AttractionStore(path)
+
+attractions_modified_at = os.path.getmtime(DEFAULT_ATTRACTIONS_PATH)
+store = get_attraction_store(DEFAULT_ATTRACTIONS_PATH, attractions_modified_at)
+
+@st.cache_resource(show_spinner=False)
+def get_search_index(path, modified_at):
+    """관광지 검색 색인. 저장해 둔 색인 파일을 읽고, 관광지 파일이 바뀌었을 때만 새로 만듭니다."""
+    return search_index.load_or_build(store)
+
+@st.cache_resource(max_entries=128, show_spinner=False)
+def get_spot_map(city, spot, radius_km, modified_at):
+    """
+    (도시, 관광지, 검색 반경)별로 만든 folium 지도를 재사용합니다.
+    사이드바 문구만 바뀌는 재실행에서는 근처 명소 검색과 마커 생성을 다시 하지 않습니다.
+    관광지 파일이 바뀌면(modified_at) 새로 만듭니다.
+    """
+    attraction_map = lazy_import("attraction_map")
+    record = store.get(city, spot)
+    nearby_spots = store.nearby(city, spot, radius_km=radius_km)
+    return attraction_map.build_spot_map(spot, record['location'], nearby_spots)
+
+@st.cache_resource(show_spinner=False)
+def get_image_cache():
+    """관광지 이미지 썸네일 캐시 (디스크에 저장되어 모든 세션과 재시작 후에도 공유됨)."""
+    return ImageCache()
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def get_city_points(city, modified_at):
+    """도시의 모든 지점(번호 배열, [위도, 경도, 이름, 종류] 목록)을 도시별로 한 번 읽어 모든 세션이 공유합니다."""
+    indices = store.city_point_indices(city)
+    return indices, store.point_rows(indices)
+
+def plan_itinerary(city, start, stops):
+    """
+    도시 지점 목록의 start번째에서 출발해 stops번째 지점들을 도는 방문 순서의
+    ([위도, 경도, 이름, 종류] 목록, 구간별 거리)를 반환합니다. 이름이 같은 지점도 따로 구분됩니다.
+    거리 행렬은 도시 전체가 아니라 출발지와 고른 곳들 사이만 계산합니다.
+    """
+    indices, _ = get_city_points(city, attractions_modified_at)
+    stops = [start] + list(stops)
+    dist = itinerary.distance_matrix(store.geo_index.lat[indices[stops]], store.geo_index.lon[indices[stops]])
+    route, legs = itinerary.plan_route(dist, range(len(stops)), 0)
+    return store.point_rows(indices[[stops[i] for i in route]]), legs.tolist()
+
+def get_viewport_loader():
+    """세션별 지도 범위 로더를 반환합니다 (관광지 파일이 바뀌어 저장소가 새로 만들어지면 로더도 새로 만듦)."""
+    loader = st.session_state.get("viewport_loader")
+    if loader is None or loader.store is not store:
+        loader = st.session_state["viewport_loader"] = ViewportLoader(store)
+    return loader
+
+def map_viewport(map_state, m):
+    """
+    st_folium이 돌려준 지도 상태에서 (남, 서, 북, 동), 줌을 꺼냅니다.
+    아직 지도를 움직인 적이 없으면 지도에 그린 마커 범위와 처음 줌을 사용합니다.
+    """
+    bounds = (map_state or {}).get("bounds") or {}
+    south_west, north_east = bounds.get("_southWest") or {}, bounds.get("_northEast") or {}
+    if None not in (south_west.get("lat"), south_west.get("lng"), north_east.get("lat"), north_east.get("lng")):
+        box = (south_west["lat"], south_west["lng"], north_east["lat"], north_east["lng"])
+    else:
+        (south, west), (north, east) = m.get_bounds()
+        box = (south, west, north, east)
+    zoom = (map_state or {}).get("zoom") or m.options.get("zoom", 12)
+    return box, zoom
+
+profiler.mark("관광지 데이터")
 
 # Streamlit 앱 구성
 st.set_page_config(page_title="🇫🇷 프랑스 주요 관광지 가이드", layout="wide", initial_sidebar_state="expanded")
@@ -141,30 +97,76 @@ st.markdown("""
 프랑스 여행 계획을 더욱 풍성하게 만들어보세요!
 """)
 
-# 사이드바에서 도시 선택
+def go_to_search_result():
+    """검색 결과를 고르면 도시와 관광지 선택 상자를 그 관광지로 바꿉니다."""
+    result = st.session_state.get("search_result")
+    if result is not None:
+        st.session_state["selected_city"], st.session_state["selected_spot"] = result
+
+# 사이드바에서 이름이나 설명으로 관광지 검색 (조사가 붙거나 글자가 조금 틀려도 찾음)
 st.sidebar.header("🗺️ 여행지를 선택하세요!")
-city_names = list(cities.keys())
+search_query = st.sidebar.text_input("🔍 관광지 검색", placeholder="예: 에펠, 해변, 피라미드")
+if search_query.strip():
+    search_results = get_search_index(DEFAULT_ATTRACTIONS_PATH, attractions_modified_at).search(search_query)
+    if search_results:
+        st.sidebar.radio(
+            "검색 결과",
+            [(city, spot) for city, spot, _ in search_results],
+            index=None,
+            format_func=lambda result: f"{result[1]} ({result[0]})",
+            key="search_result",
+            on_change=go_to_search_result,
+        )
+    else:
+        st.sidebar.caption("검색 결과가 없습니다.")
+
+# 사이드바에서 도시 선택
+city_names = store.cities()
 selected_city = st.sidebar.selectbox(
     "어떤 도시로 떠나고 싶으신가요?",
     city_names,
-    index=0  # 기본값으로 첫 번째 도시 선택
+    index=0,  # 기본값으로 첫 번째 도시 선택
+    key="selected_city",
 )
 
 # 선택한 도시의 관광지 목록
-spots_in_city = list(cities.get(selected_city, {}).keys())
+spots_in_city = store.spot_names(selected_city)
+if st.session_state.get("selected_spot") not in spots_in_city:
+    # 도시를 바꾸면 이전 도시의 관광지 선택을 지우고 첫 번째 관광지를 보여 줌
+    st.session_state.pop("selected_spot", None)
 selected_spot = st.sidebar.selectbox(
     f"{selected_city}의 어떤 관광지를 보고 싶으신가요?",
     spots_in_city,
-    index=0  # 기본값으로 첫 번째 관광지 선택
+    index=0,  # 기본값으로 첫 번째 관광지 선택
+    key="selected_spot",
 )
 
+# 근처 명소는 선택한 관광지 좌표에서 이 반경 안의 지점을 가까운 순서로 찾습니다.
+nearby_radius_km = st.sidebar.slider("근처 명소 검색 반경 (km)", 1, 50, int(DEFAULT_NEARBY_RADIUS_KM))
+show_viewport_points = st.sidebar.checkbox("지도 범위의 모든 지점 표시", value=True, help="지도에 보이는 범위의 관광지와 명소를 함께 표시합니다. 확대할수록 더 많은 지점이 보입니다.")
+
+# 여러 곳을 고르면 선택한 관광지에서 출발하는 짧은 방문 순서를 계산해 지도에 경로로 그립니다.
+st.sidebar.subheader("🧭 여행 경로 만들기")
+city_point_rows = get_city_points(selected_city, attractions_modified_at)[1]
+# 지점은 도시 지점 목록의 순서로 고릅니다 (관광지와 이름이 같은 명소도 따로 고를 수 있음)
+route_start = next((i for i, (_, _, name, kind) in enumerate(city_point_rows)
+                    if kind == 'spot' and name == selected_spot), None)
+route_stops = st.sidebar.multiselect(
+    f"{selected_spot}에서 출발해 함께 방문할 곳",
+    [i for i in range(len(city_point_rows)) if i != route_start],
+    format_func=lambda i: city_point_rows[i][2],
+    help="선택한 관광지에서 출발해 고른 곳들을 모두 도는 짧은 순서를 찾아 지도에 초록색 경로로 표시합니다.",
+) if route_start is not None else []
+
+profiler.mark("사이드바")
+
 # 선택된 관광지가 있는지 확인하고 정보 표시
-if selected_spot and selected_city in cities and selected_spot in cities.get(selected_city, {}):
-    spot_info = cities.get(selected_city, {}).get(selected_spot)
+spot_info = store.get(selected_city, selected_spot) if selected_spot else None
+if spot_info is not None:
     lat, lon = spot_info["location"]
     description = spot_info["description"]
     image_url = spot_info.get("image_url")
-    nearby_spots = spot_info.get("nearby", [])
+    nearby_spots = store.nearby(selected_city, selected_spot, radius_km=nearby_radius_km)
 
     # 메인 콘텐츠 영역: 정보 (왼쪽) / 지도, 근처 명소 목록 (오른쪽)
     col1, col2 = st.columns([1, 1])
@@ -173,53 +175,64 @@ if selected_spot and selected_city in cities and selected_spot in cities.get(sel
         st.subheader(f"✨ 여러분이 선택한 곳은 바로... **{selected_spot}** 입니다!")
         st.markdown(description)
 
-        # 관련 이미지 표시
+        # 관련 이미지 표시. 처음 한 번만 원격 이미지를 받아 썸네일로 저장하고, 이후에는 로컬 파일을 보여 줍니다.
+        # 서버에서 받지 못한 이미지는 원래 링크를 그대로 넘겨 브라우저가 직접 받아 보도록 합니다.
         if image_url:
-            st.image(image_url, caption=selected_spot, use_container_width=True)
+            with st.spinner("이미지를 불러오는 중..."):
+                thumbnail_path = get_image_cache().get(image_url)
+            st.image(thumbnail_path or image_url, caption=selected_spot, use_container_width=True)
         else:
             st.warning("이미지를 불러오는 데 실패했습니다. 이미지 링크가 유효하지 않을 수 있습니다.")
+    profiler.mark("설명/이미지")
 
     with col2:
         st.subheader(f"🗺️ **{selected_spot}** 와 근처 명소")
-        # Folium 지도 생성
-        m = folium.Map(location=[lat, lon], zoom_start=12)
-
-        # 메인 관광지 마커 추가 (빨간색)
-        folium.Marker(
-            location=[lat, lon],
-            tooltip=f"**{selected_spot}**",
-            popup=f"**{selected_spot}**",
-            icon=folium.Icon(color='red', icon='info-sign')
-        ).add_to(m)
-
-        # 근처 명소 마커 추가 (파란색, 번호 아이콘)
-        for i, spot_data in enumerate(nearby_spots):
-            # 대략적인 위치 조정을 통해 마커가 겹치지 않도록 함
-            nearby_lat = lat + (i + 1) * 0.005 * (1 if i % 2 == 0 else -1)
-            nearby_lon = lon + (i + 1) * 0.005 * (1 if (i // 2) % 2 == 0 else -1)
-
-            folium.Marker(
-                location=[nearby_lat, nearby_lon],
-                tooltip=f"{i+1}. {spot_data['name']}",
-                popup=f"**{i+1}. {spot_data['name']}** (거리: {spot_data['distance']})",
-                icon=folium.DivIcon(
-                    html=f"""
-                    <div style="font-size: 12px; color: blue; background-color: white; 
-                                border: 1px solid blue; border-radius: 50%; width: 24px; height: 24px; 
-                                display: flex; align-items: center; justify-content: center;">
-                        <b>{i+1}</b>
-                    </div>"""
-                )
-            ).add_to(m)
+        # 지도 라이브러리는 지도를 그릴 때 불러옵니다 (설명과 이미지가 먼저 표시됨)
+        st_folium = lazy_import("streamlit_folium").st_folium
+        profiler.mark("지도 라이브러리 import")
+
+        m = get_spot_map(selected_city, selected_spot, nearby_radius_km, attractions_modified_at)
+
+        # 지도 범위의 지점 레이어. 직전 실행에서 지도가 돌려준 범위/줌을 기준으로, 새로 보이는 타일의 지점만 읽습니다.
+        map_key = f"spot_map_{selected_city}_{selected_spot}"
+        viewport_layer = None
+        if show_viewport_points:
+            (south, west, north, east), map_zoom = map_viewport(st.session_state.get(map_key), m)
+            viewport_rows, n_tiles, n_new_tiles = get_viewport_loader().load(south, west, north, east, map_zoom)
+            viewport_layer = lazy_import("attraction_map").viewport_layer(viewport_rows)
+        route_layer = None
+        if route_stops:
+            route_rows, route_legs = plan_itinerary(selected_city, route_start, route_stops)
+            route_layer = lazy_import("attraction_map").route_layer(route_rows, route_legs)
+        profiler.mark("지도 레이어")
 
         # Streamlit에 Folium 지도 렌더링
-        st_folium(m, width=700, height=600)
-
-        # 근처 명소 목록 표시 (지도와 같은 column에 배치, 번호 및 거리 포함)
+        # 지도 범위와 경로 레이어는 feature_group_to_add로 넘겨, 지도를 옮겨도 지도 자체는 다시 그리지 않고 레이어만 바꿉니다.
+        # st_folium은 렌더링하면서 지도 객체를 바꾸므로, 여러 세션이 공유하는 캐시 지도 대신 복사본을 넘깁니다.
+        # 범위/줌이 바뀔 때만 다시 실행되도록 돌려받는 값을 제한합니다.
+        layers = [layer for layer in (viewport_layer, route_layer) if layer is not None]
+        st_folium(copy.deepcopy(m), width=700, height=600, key=map_key,
+                  feature_group_to_add=layers or None, returned_objects=["bounds", "zoom"])
+        if show_viewport_points:
+            st.caption(f"지도 범위의 지점 {len(viewport_rows)}개 · 타일 {n_tiles}개 (새로 읽은 타일 {n_new_tiles}개) · 줌 {map_zoom}")
+        profiler.mark("지도")
+
+        # 방문 순서 표시 (구간별 직선거리와 이동 시간 어림값)
+        if route_layer is not None:
+            st.subheader("🧭 추천 방문 순서")
+            for i, (_, _, name, _) in enumerate(route_rows):
+                leg = f" ← {distance_label(route_legs[i - 1])}" if i else " (출발)"
+                st.markdown(f"**{i+1}. {name}**{leg}")
+            st.caption(f"총 이동 거리 약 {sum(route_legs):.1f} km (직선거리 기준)")
+
+        # 근처 명소 목록 표시 (지도와 같은 column에 배치, 번호 및 직선거리 포함)
         if nearby_spots:
             st.subheader("📍 놓치면 아쉬운 근처 명소 목록")
             for i, spot_data in enumerate(nearby_spots):
-                st.markdown(f"**{i+1}. {spot_data['name']}** (거리: {spot_data['distance']})")
+                st.markdown(f"**{i+1}. {spot_data['name']}** ({distance_label(spot_data['distance_km'])})")
+            st.caption("거리는 직선거리이며, 이동 시간은 도보/차량 평균 속도로 어림한 값입니다.")
+        else:
+            st.info(f"반경 {nearby_radius_km} km 안에 등록된 근처 명소가 없습니다. 검색 반경을 넓혀 보세요.")
 
         st.markdown(f"**😊 {selected_spot}와 주변 명소에서 즐거운 시간을 보내세요!**")
 
@@ -229,3 +242,5 @@ else:
 st.sidebar.markdown("---")
 st.sidebar.info("이 가이드는 여러분의 즐거운 프랑스 여행을 돕기 위해 만들어졌습니다. 궁금한 점이 있다면 언제든지 문의해주세요!")
 st.sidebar.markdown("© 2025 프랑스 여행 가이드")
+
+profiler.report()
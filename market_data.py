@@ -0,0 +1,208 @@
+"""
+주가 데이터 공급자(provider) 모음입니다.
+
+모든 공급자는 yf.download와 같은 형태로 호출할 수 있는 download()를 제공하므로
+stock_data.download_stock_data / PriceStore.sync의 downloader 자리에 그대로 넘길 수 있습니다.
+재시도, 시간 제한, 동시 요청 수 제한은 공급자 종류와 관계없이 FetchPolicy로 똑같이 적용됩니다.
+
+사용할 공급자는 환경 변수로 고릅니다.
+    MARKET_DATA_PROVIDER=yfinance|local|synthetic (기본값 yfinance)
+    MARKET_DATA_DIR=<local 공급자가 읽을 디렉터리>
+"""
+import abc
+import os
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class FetchPolicy:
+    """요청 1회의 재시도 횟수, 재시도 간 대기(지수 증가), 시간 제한(초), 동시 요청 수 제한."""
+    retries: int = 2
+    backoff: float = 0.5
+    timeout: float = 30.0
+    max_concurrency: int = 4
+
+
+class MarketDataProvider(abc.ABC):
+    """
+    공급자 기본 클래스입니다. 하위 클래스는 _fetch()만 구현하면 되고,
+    재시도/시간 제한/동시 요청 제한은 download()가 처리합니다.
+    동시 요청 슬롯은 _fetch가 실제로 끝날 때 반납하므로, 시간 제한을 넘겨 멈춰 있는 요청도 끝날 때까지 한 자리를 차지합니다.
+    """
+    name = "base"
+
+    def __init__(self, policy=None):
+        self.policy = policy or FetchPolicy()
+        self._slots = threading.BoundedSemaphore(self.policy.max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self.policy.max_concurrency,
+                                            thread_name_prefix=f"{self.name}-fetch")
+        self.calls = 0
+
+    @abc.abstractmethod
+    def _fetch(self, tickers, start, end):
+        """
+        tickers의 일봉을 (티커, 항목) 2단 컬럼 DataFrame으로 반환합니다.
+        항목은 Open, High, Low, Close (있으면 Adj Close, Volume)입니다.
+        """
+
+    def download(self, tickers, start=None, end=None, group_by='ticker', timeout=None, **kwargs):
+        """
+        yf.download와 같은 방식으로 호출할 수 있는 진입점입니다.
+        실패하거나 시간 제한을 넘기면 policy에 따라 재시도하고, 끝내 실패하면 마지막 예외를 다시 던집니다.
+        timeout(초)을 주면 슬롯 대기, 재시도, 재시도 간 대기를 모두 포함한 이 호출 전체의 시간 제한이 되고,
+        남은 시간이 없으면 더 재시도하지 않고 TimeoutError를 던집니다.
+        """
+        if isinstance(tickers, str):
+            tickers = [tickers]
+        tickers = list(tickers)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def remaining():
+            return float('inf') if deadline is None else deadline - time.monotonic()
+
+        last_error = None
+        for attempt in range(self.policy.retries + 1):
+            if attempt:
+                delay = self.policy.backoff * 2 ** (attempt - 1)
+                if delay >= remaining():
+                    break
+                time.sleep(delay)
+            attempt_timeout = min(self.policy.timeout, remaining())
+            if attempt_timeout <= 0:
+                break
+            attempt_deadline = time.monotonic() + attempt_timeout
+            # 동시에 실행 중인 요청 수가 max_concurrency를 넘지 않도록 제한
+            if not self._slots.acquire(timeout=attempt_timeout):
+                last_error = TimeoutError(f"{self.name}: 동시 요청 {self.policy.max_concurrency}개가 모두 "
+                                          f"{attempt_timeout:.1f}초 동안 끝나지 않았습니다 ({', '.join(tickers)})")
+                continue
+            self.calls += 1
+            try:
+                future = self._executor.submit(self._fetch, tickers, start, end)
+            except BaseException:
+                self._slots.release()
+                raise
+            # 시간 제한으로 포기해도 작업 스레드는 계속 실행되므로, 슬롯은 작업이 끝날 때 반납
+            future.add_done_callback(lambda _: self._slots.release())
+            try:
+                data = future.result(timeout=max(0.0, attempt_deadline - time.monotonic()))
+            except FutureTimeoutError:
+                future.cancel()
+                last_error = TimeoutError(f"{self.name}: {attempt_timeout:.1f}초 안에 응답이 없습니다 ({', '.join(tickers)})")
+                continue
+            except Exception as e:
+                last_error = e
+                continue
+
+            if group_by != 'ticker' and len(tickers) == 1 and isinstance(data.columns, pd.MultiIndex):
+                data = data[tickers[0]]
+            return data
+        raise last_error or TimeoutError(f"{self.name}: {timeout:g}초 안에 받지 못했습니다 ({', '.join(tickers)})")
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Yahoo Finance(yfinance)에서 데이터를 받는 기본 공급자입니다."""
+    name = "Yahoo Finance"
+
+    def _fetch(self, tickers, start, end):
+        import yfinance as yf
+        return yf.download(tickers, start=start, end=end, group_by='ticker', progress=False,
+                           threads=True, timeout=self.policy.timeout)
+
+
+class LocalFileProvider(MarketDataProvider):
+    """
+    디렉터리에 있는 티커별 파일(<티커>.parquet 또는 <티커>.csv)에서 데이터를 읽는 공급자입니다.
+    파일의 첫 컬럼은 날짜, 나머지는 Open/High/Low/Close 등 yfinance와 같은 이름이어야 합니다.
+    사내 데이터 원본을 파일로 내려받아 쓰거나, 네트워크 없이 테스트할 때 사용합니다.
+    """
+    name = "로컬 파일"
+
+    def __init__(self, directory, policy=None):
+        super().__init__(policy)
+        self.directory = directory
+
+    def _read(self, ticker):
+        for ext, reader in (('.parquet', pd.read_parquet), ('.csv', lambda p: pd.read_csv(p, index_col=0, parse_dates=True))):
+            path = os.path.join(self.directory, f"{ticker}{ext}")
+            if os.path.exists(path):
+                frame = reader(path)
+                frame.index = pd.DatetimeIndex(frame.index)
+                return frame.sort_index()
+        return None
+
+    def _fetch(self, tickers, start, end):
+        frames = {}
+        for ticker in tickers:
+            frame = self._read(ticker)
+            if frame is None:
+                continue
+            if start is not None:
+                frame = frame[frame.index >= pd.Timestamp(start)]
+            if end is not None:
+                frame = frame[frame.index < pd.Timestamp(end)]
+            frames[ticker] = frame
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1)
+
+
+# 합성 가격 경로의 시작일 (이 날짜 이후만 생성 가능)
+SYNTHETIC_ORIGIN = pd.Timestamp("1990-01-01")
+
+
+class SyntheticProvider(MarketDataProvider):
+    """
+    네트워크 없이 결정적인 합성 일봉을 만드는 공급자입니다 (CI, 벤치마크용).
+    같은 티커는 항상 같은 가격 경로를 갖고, latency를 주면 요청마다 그만큼 기다려 네트워크 지연을 흉내 냅니다.
+    """
+    name = "합성 데이터"
+
+    def __init__(self, latency=0.0, policy=None):
+        super().__init__(policy)
+        self.latency = latency
+
+    @staticmethod
+    def make_frame(ticker, index):
+        """티커 이름으로 시드를 정해 index 날짜들의 OHLCV DataFrame을 만듭니다."""
+        seed = zlib.crc32(ticker.encode('utf-8'))
+        # 같은 날짜는 요청 구간과 상관없이 같은 값이 되도록 기준일부터의 일수로 경로를 만듦
+        offsets = np.asarray((index - SYNTHETIC_ORIGIN).days, dtype=np.int64)
+        if len(offsets) == 0:
+            return pd.DataFrame(columns=['Open', 'High', 'Low', 'Close', 'Volume'], index=index)
+        n_days = offsets.max() + 1
+        close = 50 * np.exp(np.cumsum(np.random.default_rng((seed, 0)).normal(0.0003, 0.015, n_days)))[offsets]
+        noise = np.random.default_rng((seed, 1)).random((n_days, 3))[offsets]
+        return pd.DataFrame({
+            'Open': close * (1 + (noise[:, 0] - 0.5) * 0.01),
+            'High': close * (1 + noise[:, 1] * 0.01),
+            'Low': close * (1 - noise[:, 2] * 0.01),
+            'Close': close,
+            'Volume': (1e6 * (1 + noise[:, 0])).astype(np.int64),
+        }, index=index)
+
+    def _fetch(self, tickers, start, end):
+        if self.latency:
+            time.sleep(self.latency)
+        index = pd.bdate_range(max(pd.Timestamp(start), SYNTHETIC_ORIGIN), end, inclusive='left', name='Date')
+        return pd.concat({ticker: self.make_frame(ticker, index) for ticker in tickers}, axis=1)
+
+
+@lru_cache(maxsize=None)
+def default_provider():
+    """환경 변수 MARKET_DATA_PROVIDER(와 MARKET_DATA_DIR)로 정한 공급자를 만들어 재사용합니다."""
+    kind = os.environ.get("MARKET_DATA_PROVIDER", "yfinance").lower()
+    if kind == "local":
+        return LocalFileProvider(os.environ.get("MARKET_DATA_DIR", "market_data_files"))
+    if kind == "synthetic":
+        return SyntheticProvider()
+    return YFinanceProvider()
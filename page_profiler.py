@@ -0,0 +1,88 @@
+"""
+페이지 실행 시간 계측 도구입니다.
+
+무거운 라이브러리는 lazy_import()로 실제로 쓰는 코드 경로에서만 불러오고,
+프로세스에서 처음 불러올 때 걸린 시간을 기록합니다. 이미 불러온 모듈은 바로 반환합니다.
+PageProfiler는 스크립트 실행을 구간별로 나눠 시간을 재고, 결과를 사이드바와 로그에 남깁니다.
+
+계측은 PAGE_PROFILE=1 환경 변수나 주소 뒤의 ?profile=1 쿼리로 켭니다.
+"""
+import importlib
+import logging
+import os
+import sys
+import threading
+import time
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+# 모듈 이름 -> 프로세스에서 처음 import할 때 걸린 시간(초). 안에서 함께 불러온 모듈의 시간도 포함됩니다.
+IMPORT_TIMES = {}
+# 페이지 이름 -> 이 프로세스에서 실행된 횟수 (첫 실행이 콜드 스타트)
+_RUN_COUNTS = {}
+_lock = threading.Lock()
+
+
+def lazy_import(name):
+    """name 모듈을 import해 반환합니다. 처음 불러오는 경우에만 걸린 시간을 IMPORT_TIMES에 기록합니다."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    with _lock:
+        IMPORT_TIMES.setdefault(name, time.perf_counter() - started)
+    return module
+
+
+def profiling_enabled():
+    """PAGE_PROFILE 환경 변수나 ?profile=1 쿼리로 계측이 켜져 있는지 확인합니다."""
+    if os.environ.get("PAGE_PROFILE", "").lower() in ("1", "true", "yes"):
+        return True
+    return st.query_params.get("profile") == "1"
+
+
+class PageProfiler:
+    """
+    스크립트 실행 시간을 구간별로 기록합니다.
+    mark(이름)은 직전 mark(또는 시작)부터 지금까지를 그 이름의 구간으로 기록하고,
+    report()는 전체 시간과 구간별 시간, 지금까지의 import 시간을 사이드바와 로그에 남깁니다.
+    계측이 꺼져 있으면 아무것도 하지 않습니다.
+    """
+
+    def __init__(self, page, enabled=None):
+        self.page = page
+        self.enabled = profiling_enabled() if enabled is None else enabled
+        self.sections = []
+        self._started = self._last = time.perf_counter()
+        with _lock:
+            _RUN_COUNTS[page] = _RUN_COUNTS.get(page, 0) + 1
+            self.run_number = _RUN_COUNTS[page]
+
+    def mark(self, name):
+        """직전 구간이 끝난 시점부터 지금까지를 name 구간으로 기록합니다."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.sections.append((name, now - self._last))
+        self._last = now
+
+    def report(self):
+        """계측 결과를 로그와 사이드바에 표시합니다."""
+        if not self.enabled:
+            return
+        total = time.perf_counter() - self._started
+        kind = "콜드 스타트" if self.run_number == 1 else f"재실행 #{self.run_number}"
+        sections = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.sections)
+        logger.info("%s %s: 총 %.0fms (%s)", self.page, kind, total * 1000, sections)
+
+        with st.sidebar.expander("⏱️ 실행 시간 계측", expanded=True):
+            st.caption(f"{kind} · 스크립트 실행 {total * 1000:,.0f} ms")
+            st.table({"구간": [name for name, _ in self.sections],
+                      "시간 (ms)": [round(seconds * 1000, 1) for _, seconds in self.sections]})
+            if IMPORT_TIMES:
+                st.caption("처음 import에 걸린 시간 (프로세스 전체)")
+                st.table({"모듈": list(IMPORT_TIMES),
+                          "시간 (ms)": [round(seconds * 1000, 1) for seconds in IMPORT_TIMES.values()]})
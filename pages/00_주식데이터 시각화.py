@@ -1,69 +1,141 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
-import yfinance as yf
+from page_profiler import PageProfiler, lazy_import
+
+# 실행 시간 계측 (PAGE_PROFILE=1 또는 ?profile=1 일 때만 기록)
+profiler = PageProfiler("주식데이터 시각화")
+
 import pandas as pd
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from frame_cache import SharedFrameCache
+from fetch_pipeline import (DEFAULT_FETCH_BUDGET, DEFAULT_MAX_WORKERS, DEFAULT_TICKER_TIMEOUT, STATUS_LABELS,
+                            CircuitBreaker, FetchMetrics, fetch_all)
+from indicators import INDICATORS, IndicatorEngine
+from market_data import default_provider
+from price_store import PriceStore
+from stock_data import (DEFAULT_TICKER_CSV, build_price_matrix, load_ticker_universe, normalize_to_base,
+                        trading_window)
+
+# pandas는 데이터를 읽는 모듈(price_store, stock_data, indicators)이 바로 쓰므로 처음부터 불러옵니다.
+# 차트 모듈(stock_charts, plotly)은 차트를 처음 그릴 때, 상관관계 분석(analytics)과 실시간 모드(live_feed),
+# 내보내기(exports) 모듈은 해당 기능을 켤 때 lazy_import로 불러옵니다.
+profiler.mark("import")
 
 # Streamlit 페이지 설정
 st.set_page_config(layout="wide")
 
 st.title("글로벌 시총 Top 10 기업 주가 변화")
 
-# 글로벌 시총 Top 10 기업 목록 (티커: 이름)
-# 이 목록은 시간이 지남에 따라 변경될 수 있으므로, 필요 시 업데이트하세요.
-TOP_10_COMPANIES = {
-    "AAPL": "Apple",
-    "MSFT": "Microsoft",
-    "GOOGL": "Alphabet (Google) A",
-    "AMZN": "Amazon",
-    "NVDA": "NVIDIA",
-    "META": "Meta Platforms",
-    "TSLA": "Tesla",
-    "BRK-A": "Berkshire Hathaway A",
-    "JPM": "JPMorgan Chase",
-    "LLY": "Eli Lilly and Company",
-}
-
-@st.cache_data # 데이터 캐싱 (성능 향상)
-def get_stock_data(ticker_symbol, start_date, end_date):
+# 기업 목록 파일 (ticker,name,default 컬럼). default가 1인 기업은 처음부터 선택된 상태로 표시됩니다.
+TICKER_UNIVERSE_CSV = DEFAULT_TICKER_CSV
+
+@st.cache_data
+def get_ticker_universe(path):
+    """기업 목록 CSV를 읽어 ({티커: 이름} 전체 목록, {티커: 이름} 기본 선택 목록)을 반환합니다."""
+    return load_ticker_universe(path)
+
+# 전체 기업 목록과 글로벌 시총 Top 10 기업 목록 (티커: 이름)
+# 이 목록은 시간이 지남에 따라 변경될 수 있으므로, 필요 시 tickers.csv를 업데이트하세요.
+ALL_COMPANIES, TOP_10_COMPANIES = get_ticker_universe(TICKER_UNIVERSE_CSV)
+
+@st.cache_resource
+def get_price_store():
+    """로컬 가격 저장소(SQLite)를 엽니다. 위치는 PRICE_STORE_DIR 환경 변수로 바꿀 수 있습니다."""
+    return PriceStore()
+
+@st.cache_resource
+def get_indicator_engine():
+    """(티커, 지표, 파라미터)별 계산 결과를 모든 세션이 공유하는 지표 엔진을 반환합니다."""
+    return IndicatorEngine()
+
+@st.cache_resource
+def get_fetch_executor():
+    """티커별 데이터 요청을 실행하는 공용 스레드 풀. 모든 세션이 함께 쓰므로 서버 전체의 동시 요청 수 상한이 됩니다."""
+    return ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="ticker-fetch")
+
+@st.cache_resource
+def get_circuit_breaker():
+    """데이터 공급자가 연달아 실패하면 잠시 요청을 막는 차단기 (모든 세션 공유)."""
+    return CircuitBreaker()
+
+@st.cache_resource
+def get_fetch_metrics():
+    """티커별 요청 시간과 오류 기록 (모든 세션 공유)."""
+    return FetchMetrics()
+
+@st.cache_resource
+def get_frame_cache():
     """
-    지정된 티커의 주식 데이터를 가져옵니다.
+    티커별 가격 데이터를 모든 세션이 한 벌만 두고 함께 쓰는 캐시 (읽기 전용, 최대 256 MB, 하루 유지).
+    같은 티커를 여러 세션이 동시에 처음 요청해도 다운로드는 한 번만 합니다. 적중/미스 수는 .stats(CacheStats)에 셉니다.
+    """
+    return SharedFrameCache()
+
+def stock_data_loader(cache, store, breaker):
+    """
+    작업 스레드에서 티커 하나의 주식 데이터를 DataFrame으로 반환하는 함수를 만듭니다 (저장소에도 없으면 None).
+    로컬 저장소에 없는 최근 데이터만 받아 추가한 뒤 저장소에서 읽으며, 결과는 (티커, 기간, cache_bucket)별로 공유 캐시에 둡니다.
     'Adj Close'가 없으면 'Close'를 사용하고, 캔들스틱 차트용 OHLC 데이터도 포함합니다.
+    요청이 실패하면 예외를 그대로 던지므로(캐시에 남지 않음) 호출한 쪽에서 저장된 데이터로 대신합니다.
+    공급자 요청은 재시도를 포함해 DEFAULT_FETCH_BUDGET초 안에 끝나도록 제한해, 티커 시간 제한보다 먼저 풀 자리를 비웁니다.
+    cache_bucket은 장중에는 주기적으로 바뀌어 최신 데이터를 다시 가져옵니다.
+    Streamlit 캐시 함수는 작업 스레드에서 부르지 않도록, 필요한 공용 객체는 스크립트 스레드에서 받아 넘깁니다.
     """
-    try:
-        # yfinance로 주식 데이터 다운로드 (진행 메시지 비활성화)
-        data = yf.download(ticker_symbol, start=start_date, end=end_date, progress=False)
+    def load(ticker):
+        breaker.call(store.sync, [ticker], start_date, end_date, raise_errors=True, timeout=DEFAULT_FETCH_BUDGET)
+        return store.load(ticker, start_date, end_date)
+
+    def get_stock_data(ticker):
+        return cache.get_or_load((ticker, start_date, end_date, cache_bucket), load, ticker)
+    return get_stock_data
+
+def show_payload_caption(fig, build_full_figure):
+    """차트 JSON 전송 크기를 표시합니다. 다운샘플링 중이면 원본 크기와 함께 보여줍니다."""
+    charts = lazy_import("stock_charts")
+    sent_kb = charts.figure_payload_bytes(fig) / 1024
+    if downsample_enabled:
+        full_kb = charts.figure_payload_bytes(build_full_figure()) / 1024
+        st.caption(f"차트 전송 크기: {sent_kb:,.1f} KB (다운샘플링 전 {full_kb:,.1f} KB)")
+    else:
+        st.caption(f"차트 전송 크기: {sent_kb:,.1f} KB")
 
-        # 데이터가 비어있으면 None 반환
-        if data.empty:
-            return None
-        
-        # 'Adj Close' 컬럼이 있으면 우선 사용, 없으면 'Close' 컬럼 사용
-        if 'Adj Close' in data.columns and not data['Adj Close'].empty:
-            data['Price'] = data['Adj Close']
-        elif 'Close' in data.columns and not data['Close'].empty:
-            data['Price'] = data['Close']
-        else:
-            # 주가 데이터(Price)를 만들 수 없으면 None 반환
-            return None
-
-        # 캔들스틱 차트에 필요한 OHLC (Open, High, Low, Close) 컬럼이 모두 있는지 확인
-        ohlc_cols = ['Open', 'High', 'Low', 'Close']
-        if all(col in data.columns and not data[col].empty for col in ohlc_cols):
-            # OHLC와 Price 컬럼을 모두 포함하는 DataFrame 반환
-            return data[ohlc_cols + ['Price']]
+def render_live_chart(ticker, company_name):
+    """
+    실시간 분봉 차트 영역입니다. st.fragment로 감싸 갱신 주기마다 이 부분만 다시 실행됩니다.
+    새 봉만 링 버퍼에 추가하고, 세션에 저장해 둔 Figure의 데이터 배열만 교체합니다.
+    """
+    charts = lazy_import("stock_charts")
+    state_key = f"live_{ticker}_{live_source_name}"
+    if state_key not in st.session_state:
+        live_feed = lazy_import("live_feed")
+        if live_source_name == "Yahoo Finance":
+            source = live_feed.YahooIntradaySource(ticker)
         else:
-            # OHLC 데이터가 불완전하면 Price 컬럼만 포함하는 DataFrame 반환
-            return data[['Price']]
-        
-    except Exception as e:
-        # 데이터 가져오기 중 예외 발생 시 None 반환
-        # st.error(f"티커 '{ticker_symbol}'의 데이터를 가져오는 중 오류 발생: {e}") # 개발 시 주석 해제하여 디버깅
-        return None
+            source = live_feed.SyntheticTickSource(ticker)
+        st.session_state[state_key] = {
+            'source': source,
+            'buffer': live_feed.BarBuffer(),
+            'figure': charts.live_candlestick_figure(company_name),
+        }
+    live = st.session_state[state_key]
+
+    started = time.perf_counter()
+    buffer = live['buffer']
+    added = buffer.extend(live['source'].fetch_new_bars(since=buffer.last_time))
+    times, values = buffer.arrays()
+    charts.update_live_figure(live['figure'], times, values)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if len(buffer):
+        st.plotly_chart(live['figure'], use_container_width=True, key=f"{state_key}_chart")
+        st.caption(f"최근 봉: {buffer.last_time:%H:%M} · 표시 중인 봉 {len(buffer)}개 (새 봉 {added}개) · "
+                   f"갱신 처리 {elapsed_ms:.0f} ms · {live_refresh_seconds}초마다 갱신")
+    else:
+        st.info("아직 받은 장중 데이터가 없습니다. 장이 열려 있는지 확인해주세요.")
 
-# 최근 3년 데이터 기간 설정
-end_date = datetime.now()
-start_date = end_date - timedelta(days=3 * 365) # 대략 3년 전
+# 최근 3년 데이터 기간 설정 (거래일 단위로 고정되어 재실행해도 캐시 키가 바뀌지 않음)
+start_date, end_date, cache_bucket = trading_window()
 
 st.write(f"데이터 기간: **{start_date.strftime('%Y-%m-%d')}** ~ **{end_date.strftime('%Y-%m-%d')}**")
 
@@ -75,9 +147,37 @@ for ticker, name in TOP_10_COMPANIES.items():
     if st.sidebar.checkbox(f"{name} ({ticker})", value=True, key=ticker):
         selected_companies_names.append(name)
 
+# Top 10 외의 기업은 검색 가능한 다중 선택으로 추가 (목록이 수백 개여도 사이드바가 길어지지 않음)
+other_companies = {ticker: name for ticker, name in ALL_COMPANIES.items() if ticker not in TOP_10_COMPANIES}
+if other_companies:
+    extra_tickers = st.sidebar.multiselect(
+        "다른 기업 추가",
+        options=list(other_companies),
+        format_func=lambda ticker: f"{other_companies[ticker]} ({ticker})",
+        key="extra_tickers"
+    )
+    selected_companies_names.extend(other_companies[ticker] for ticker in extra_tickers)
+
 # 선택된 기업의 티커-이름 매핑 딕셔너리 생성
-selected_tickers = {ticker: name for ticker, name in TOP_10_COMPANIES.items() if name in selected_companies_names}
+selected_tickers = {ticker: name for ticker, name in ALL_COMPANIES.items() if name in selected_companies_names}
+
+# --- 사이드바: 차트 다운샘플링 설정 ---
+st.sidebar.header("차트 표시 설정")
+downsample_enabled = st.sidebar.checkbox("긴 데이터 다운샘플링", value=True, help="선 그래프는 LTTB로 점 수를 줄이고, 캔들스틱은 주봉/월봉으로 다시 집계합니다.")
+chart_width_px = st.sidebar.number_input("차트 너비 (픽셀)", min_value=200, max_value=4000, value=1200, step=100)
+points_per_pixel = st.sidebar.slider("픽셀당 점 수", 0.5, 4.0, 2.0, step=0.5)
+show_payload_size = st.sidebar.checkbox("차트 전송 크기 표시", value=False)
+
+# 선 그래프 한 줄에 보낼 최대 점 수 (None이면 원본 그대로). 캔들스틱 최대 캔들 수는 차트를 그릴 때 정합니다.
+max_line_points = int(chart_width_px * points_per_pixel) if downsample_enabled else None
+
+# --- 사이드바: 실시간 (장중) 모드 ---
+st.sidebar.header("실시간 (장중) 모드")
+live_mode = st.sidebar.checkbox("장중 분봉 실시간 갱신", value=False, help="상세 보기 기업의 당일 분봉을 주기적으로 가져와 차트에 이어 붙입니다.")
+live_source_name = st.sidebar.radio("실시간 데이터 소스", ("Yahoo Finance", "합성 데이터 (테스트용)"), disabled=not live_mode)
+live_refresh_seconds = st.sidebar.number_input("갱신 주기 (초)", min_value=5, max_value=300, value=30, step=5, disabled=not live_mode)
 # --- 사이드바 끝 ---
+profiler.mark("사이드바")
 
 # 데이터 로딩 상태 표시
 st.subheader("주식 데이터 가져오기 진행 중...")
@@ -87,52 +187,102 @@ message_placeholder = st.empty() # 메시지를 위한 플레이스홀더
 
 # 모든 기업의 데이터를 저장할 딕셔너리와 DataFrame 초기화
 all_stock_data_raw = {} # 개별 기업의 상세 데이터 (OHLC, Price)
-all_price_data = pd.DataFrame() # 라인 그래프용 정규화 가격 데이터
+all_price_data = pd.DataFrame() # 라인 그래프용 가격 행렬 (날짜 x 기업)
 
 # 선택된 기업이 있을 경우에만 데이터 로드 시도
 if selected_tickers:
-    for i, (ticker, name) in enumerate(selected_tickers.items()):
-        message_placeholder.text(f"데이터 가져오는 중: {name} ({ticker})...")
-        
-        data_df = get_stock_data(ticker, start_date, end_date)
-        
+    # 티커마다 공용 스레드 풀에서 동시에 요청하고, 끝나는 순서대로 받아 정규화 차트를 중간중간 미리 그립니다.
+    # 시간 제한을 넘기거나 실패한 티커는 로컬 저장소에 있던 이전 데이터로 대신합니다.
+    partial_chart_placeholder = st.empty()
+    price_store = get_price_store()
+    failed_fetches = []
+    last_partial_render = time.perf_counter()
+    message_placeholder.text(f"데이터 가져오는 중: {len(selected_tickers)}개 기업...")
+    results = fetch_all(
+        selected_tickers,
+        stock_data_loader(get_frame_cache(), price_store, get_circuit_breaker()),
+        get_fetch_executor(),
+        fallback=lambda ticker: price_store.load(ticker, start_date, end_date),
+        timeout=DEFAULT_TICKER_TIMEOUT,
+        metrics=get_fetch_metrics(),
+        breaker=get_circuit_breaker(),
+    )
+    for loaded_count, (ticker, data_df, fetch) in enumerate(results, 1):
+        name = selected_tickers[ticker]
         if data_df is not None and not data_df.empty:
             all_stock_data_raw[name] = data_df
-            # Price 컬럼이 있는지 확인하고 all_price_data에 추가
-            if 'Price' in data_df.columns:
-                all_price_data[name] = data_df['Price']
-        
+        if not fetch.ok:
+            failed_fetches.append((name, fetch))
+
         # 진행 바 업데이트
-        progress_bar.progress((i + 1) / len(selected_tickers))
+        progress_bar.progress(loaded_count / len(selected_tickers))
+        message_placeholder.text(f"{name} 완료 ({fetch.latency * 1000:,.0f} ms, {STATUS_LABELS[fetch.status]}) · "
+                                 f"{loaded_count}/{len(selected_tickers)}")
+        # 아직 남은 티커가 있으면 지금까지 받은 기업으로 정규화 차트를 미리 그림 (너무 자주 다시 그리지 않도록 0.5초 간격)
+        if loaded_count < len(selected_tickers) and all_stock_data_raw and time.perf_counter() - last_partial_render >= 0.5:
+            partial = normalize_to_base(build_price_matrix(all_stock_data_raw))
+            if not partial.empty:
+                charts = lazy_import("stock_charts")
+                partial_chart_placeholder.plotly_chart(charts.normalized_price_figure(partial, max_points=max_line_points),
+                                                       use_container_width=True, key=f"partial_chart_{loaded_count}")
+            last_partial_render = time.perf_counter()
 
     # 모든 데이터 로드 후 플레이스홀더 비우기
     message_placeholder.empty()
     progress_bar_placeholder.empty()
+    partial_chart_placeholder.empty()
+    profiler.mark("데이터 로딩")
+
+    if failed_fetches:
+        st.warning("일부 기업의 최신 데이터를 받지 못했습니다: " + ", ".join(
+            f"{name} ({STATUS_LABELS[fetch.status]}{', 저장된 데이터 표시' if fetch.rows else ''})"
+            for name, fetch in failed_fetches))
+
+    # 받은 순서가 아니라 선택한 순서로 정리 (기업별 선 색이 재실행마다 바뀌지 않도록)
+    all_stock_data_raw = {name: all_stock_data_raw[name] for name in selected_tickers.values() if name in all_stock_data_raw}
+
+    # Price 컬럼을 한 번에 모아 가격 행렬 생성
+    all_price_data = build_price_matrix(all_stock_data_raw)
 
     # --- 메인 그래프: 정규화된 주가 변화 ---
     if not all_price_data.empty:
-        # 모든 값이 NaN인 컬럼(데이터 로드 실패 기업) 제거 후 정규화
-        normalized_data = all_price_data.dropna(axis=1, how='all')
+        # 초기 가격을 100으로 정규화하여 변화율 비교
+        # 각 기업의 첫 유효값을 기준으로 하며, 모든 값이 NaN인 기업(데이터 로드 실패)은 제외됩니다.
+        normalized_data = normalize_to_base(all_price_data)
         if not normalized_data.empty:
-            # 초기 가격을 100으로 정규화하여 변화율 비교
-            # 첫 번째 행으로 나누어 정규화. (loc[0] 대신 iloc[0] 사용)
-            normalized_data = normalized_data / normalized_data.iloc[0] * 100
-
             st.subheader("기간별 주가 변화 (초기 가격 100으로 정규화)")
+            charts = lazy_import("stock_charts")
 
-            fig = go.Figure()
-            for col in normalized_data.columns:
-                fig.add_trace(go.Scatter(x=normalized_data.index, y=normalized_data[col], mode='lines', name=col))
-
-            fig.update_layout(
-                title="선택된 글로벌 시총 Top 기업 주가 변화",
-                xaxis_title="날짜",
-                yaxis_title="정규화된 주가 (시작점 100)",
-                hovermode="x unified",
-                legend_title="기업",
-                height=600
-            )
+            fig = charts.normalized_price_figure(normalized_data, max_points=max_line_points)
             st.plotly_chart(fig, use_container_width=True)
+            if show_payload_size:
+                show_payload_caption(fig, lambda: charts.normalized_price_figure(normalized_data))
+
+            # --- 수익률 상관관계 분석 ---
+            if normalized_data.shape[1] >= 2 and st.checkbox("수익률 상관관계 분석 보기", value=False):
+                analytics = lazy_import("analytics")
+                # 가격 행렬 전체를 float32 로그 수익률로 바꿔 한 번에 계산 (기업 수가 많아도 메모리 제한)
+                returns = analytics.log_returns(all_price_data[normalized_data.columns])
+                tab_corr, tab_cov, tab_beta = st.tabs(["상관계수", "공분산", "롤링 베타"])
+                with tab_corr:
+                    st.plotly_chart(charts.matrix_heatmap_figure(analytics.correlation_matrix(returns), "일간 수익률 상관계수"), use_container_width=True)
+                with tab_cov:
+                    # 연율화(252 거래일)한 공분산
+                    st.plotly_chart(charts.matrix_heatmap_figure(analytics.covariance_matrix(returns) * 252, "일간 수익률 공분산 (연율화)"), use_container_width=True)
+                with tab_beta:
+                    col_benchmark, col_window = st.columns(2)
+                    with col_benchmark:
+                        benchmark_name = st.selectbox("기준 지수", ["선택 기업 동일가중 평균"] + list(returns.columns))
+                    with col_window:
+                        beta_window = st.slider("롤링 기간 (거래일)", 20, 252, 60, step=5)
+                    if benchmark_name == "선택 기업 동일가중 평균":
+                        market = analytics.equal_weight_market(returns)
+                    else:
+                        market = returns[benchmark_name]
+                    betas = analytics.rolling_beta(returns, market, window=beta_window)
+                    if benchmark_name in betas.columns:
+                        betas = betas.drop(columns=benchmark_name)
+                    st.plotly_chart(charts.line_matrix_figure(betas, f"{benchmark_name} 대비 {beta_window}일 롤링 베타", "베타", max_points=max_line_points, height=500), use_container_width=True)
         else:
             st.warning("정규화할 유효한 주식 데이터가 없습니다. 선택된 기업의 데이터를 확인해주세요.")
 
@@ -145,6 +295,29 @@ else:
     progress_bar_placeholder.empty()
     st.info("표시할 기업을 선택해주세요. 왼쪽 사이드바에서 기업을 선택할 수 있습니다.")
 
+profiler.mark("정규화 차트")
+
+# 데이터 소스와 캐시 적중률 표시 (서버 프로세스 전체 기준)
+cache_stats = get_frame_cache().stats
+st.sidebar.caption(
+    f"데이터 소스: {default_provider().name} · 데이터 캐시: 요청 {cache_stats.requests}회 · 적중 {cache_stats.hits}회 · "
+    f"미스 {cache_stats.misses}회 (적중률 {cache_stats.hit_rate:.0%}) · 공유 데이터 {len(get_frame_cache())}개, "
+    f"{get_frame_cache().nbytes / 1024 / 1024:,.1f} MB (동시 요청 합침 {get_frame_cache().shared_waits}회)"
+)
+# 티커별 요청 시간과 오류 (서버 프로세스 전체 기준, 최근 기록)
+fetch_summary = get_fetch_metrics().summary()
+if fetch_summary:
+    with st.sidebar.expander("📡 티커별 요청 기록"):
+        st.caption(f"요청 차단기: {get_circuit_breaker().state}")
+        st.dataframe({
+            "티커": list(fetch_summary),
+            "요청": [row['requests'] for row in fetch_summary.values()],
+            "오류": [row['errors'] for row in fetch_summary.values()],
+            "p50 (ms)": [round(row['p50_ms']) for row in fetch_summary.values()],
+            "p95 (ms)": [round(row['p95_ms']) for row in fetch_summary.values()],
+            "마지막 상태": [STATUS_LABELS[row['last_status']] for row in fetch_summary.values()],
+        }, hide_index=True, use_container_width=True)
+
 st.markdown("---") # 시각적 구분선
 
 ## 개별 기업 주가 상세 보기 (차트 형식 선택)
@@ -168,68 +341,113 @@ if available_for_details:
 
     if selected_company_for_details:
         # 선택된 기업의 티커 심볼 찾기
-        ticker_symbol_for_details = [k for k, v in TOP_10_COMPANIES.items() if v == selected_company_for_details][0]
+        ticker_symbol_for_details = [k for k, v in ALL_COMPANIES.items() if v == selected_company_for_details][0]
         
         st.write(f"**{selected_company_for_details} ({ticker_symbol_for_details})**")
         
         # 캐시된 데이터(all_stock_data_raw)에서 상세 데이터 가져오기
         detail_data = all_stock_data_raw.get(selected_company_for_details)
 
-        if detail_data is not None and not detail_data.empty:
-            if chart_type == '종가 라인 차트':
-                if 'Price' in detail_data.columns:
-                    fig_line = go.Figure(data=[go.Scatter(x=detail_data.index, y=detail_data['Price'], mode='lines', name='종가')])
-                    fig_line.update_layout(
-                        title=f"{selected_company_for_details} 종가 라인 차트",
-                        xaxis_title="날짜",
-                        yaxis_title="주가",
-                        height=500
-                    )
-                    st.plotly_chart(fig_line, use_container_width=True)
+        # 보조 지표 선택 및 계산 (지표 엔진이 티커/지표/파라미터별로 캐시하고 새 봉만 이어서 계산)
+        selected_indicators = st.multiselect(
+            "보조 지표를 선택하세요:",
+            options=list(INDICATORS),
+            default=[],
+            help="이동 평균(SMA/EMA)과 볼린저 밴드는 가격 차트 위에, 나머지는 아래에 별도 차트로 표시됩니다."
+        )
+        overlay_frames, panel_frames = [], {}
+        if detail_data is not None and 'Price' in detail_data.columns:
+            engine = get_indicator_engine()
+            for indicator_name in selected_indicators:
+                indicator_frame = engine.compute(ticker_symbol_for_details, indicator_name, detail_data['Price'])
+                if INDICATORS[indicator_name][2]:
+                    overlay_frames.append(indicator_frame)
                 else:
-                    st.warning(f"{selected_company_for_details} 의 종가(Price) 데이터를 찾을 수 없어 라인 차트를 그릴 수 없습니다.")
+                    panel_frames[indicator_name] = indicator_frame
 
-            elif chart_type == '종가 영역 차트':
+        if detail_data is not None and not detail_data.empty:
+            charts = lazy_import("stock_charts")
+            if chart_type in ('종가 라인 차트', '종가 영역 차트'):
+                is_area = chart_type == '종가 영역 차트'
                 if 'Price' in detail_data.columns:
-                    fig_area = go.Figure(data=[go.Scatter(x=detail_data.index, y=detail_data['Price'], mode='lines', fill='tozeroy', name='종가')])
-                    fig_area.update_layout(
-                        title=f"{selected_company_for_details} 종가 영역 차트",
-                        xaxis_title="날짜",
-                        yaxis_title="주가",
-                        height=500
-                    )
-                    st.plotly_chart(fig_area, use_container_width=True)
+                    fig_detail = charts.price_line_figure(selected_company_for_details, detail_data, fill=is_area, max_points=max_line_points)
+                    charts.add_indicator_overlays(fig_detail, overlay_frames, max_points=max_line_points)
+                    st.plotly_chart(fig_detail, use_container_width=True)
+                    if show_payload_size:
+                        show_payload_caption(fig_detail, lambda: charts.price_line_figure(selected_company_for_details, detail_data, fill=is_area))
                 else:
-                    st.warning(f"{selected_company_for_details} 의 종가(Price) 데이터를 찾을 수 없어 영역 차트를 그릴 수 없습니다.")
+                    st.warning(f"{selected_company_for_details} 의 종가(Price) 데이터를 찾을 수 없어 {'영역' if is_area else '라인'} 차트를 그릴 수 없습니다.")
 
             elif chart_type == '캔들스틱 차트 (OHLC 데이터 필요)':
                 required_ohlc_cols = ['Open', 'High', 'Low', 'Close']
                 # 캔들스틱 차트를 그리는 데 필요한 모든 컬럼이 존재하고 비어있지 않은지 다시 확인
                 if all(col in detail_data.columns and not detail_data[col].empty for col in required_ohlc_cols):
-                    fig_candlestick = go.Figure(data=[go.Candlestick(
-                        x=detail_data.index,
-                        open=detail_data['Open'],
-                        high=detail_data['High'],
-                        low=detail_data['Low'],
-                        close=detail_data['Close']
-                    )])
-
-                    fig_candlestick.update_layout(
-                        title=f"{selected_company_for_details} 캔들스틱 차트",
-                        xaxis_title="날짜",
-                        yaxis_title="주가",
-                        xaxis_rangeslider_visible=False, # 범위 슬라이더 제거
-                        height=500
-                    )
-                    st.plotly_chart(fig_candlestick, use_container_width=True)
+                    # 캔들 하나가 PIXELS_PER_CANDLE 픽셀 폭은 되도록 최대 캔들 수를 정함 (None이면 원본 그대로)
+                    max_candles = int(chart_width_px // charts.PIXELS_PER_CANDLE) if downsample_enabled else None
+                    fig_detail = charts.candlestick_figure(selected_company_for_details, detail_data, max_bars=max_candles)
+                    charts.add_indicator_overlays(fig_detail, overlay_frames, max_points=max_line_points)
+                    st.plotly_chart(fig_detail, use_container_width=True)
+                    if show_payload_size:
+                        show_payload_caption(fig_detail, lambda: charts.candlestick_figure(selected_company_for_details, detail_data))
                 else:
                     st.warning(f"{selected_company_for_details} 의 캔들스틱 차트를 그리는 데 필요한 데이터(Open, High, Low, Close)가 불완전합니다. 다른 차트 형식을 선택하거나, 이 기업의 OHLC 데이터가 Yahoo Finance에 없을 수 있습니다.")
 
+            # 가격과 단위가 다른 지표는 아래에 별도 차트로 표시
+            for indicator_name, indicator_frame in panel_frames.items():
+                st.plotly_chart(charts.indicator_panel_figure(selected_company_for_details, indicator_name, indicator_frame, max_points=max_line_points), use_container_width=True)
+
         else:
             st.warning(f"{selected_company_for_details} 의 상세 차트 데이터를 가져올 수 없습니다. 다시 시도하거나 다른 기업을 선택하세요.")
 
+    profiler.mark("상세 차트")
+
+    # --- 실시간 (장중) 차트 ---
+    if live_mode and selected_company_for_details:
+        st.subheader("장중 실시간 차트")
+        st.fragment(run_every=live_refresh_seconds)(render_live_chart)(ticker_symbol_for_details, selected_company_for_details)
+
 else:
     st.info("선택된 기업 중 주식 데이터를 성공적으로 가져온 기업이 없습니다. 상세 차트를 표시할 수 없습니다.")
 
+# --- 데이터/차트 내보내기 ---
+# 파일은 버튼을 누를 때 저장소에서 기간별로 나눠 읽어 만듭니다 (재실행마다 만들지 않음).
+if available_for_details:
+    with st.expander("📥 데이터/차트 내보내기"):
+        exports = lazy_import("exports")
+        export_tickers = [ticker for ticker, name in selected_tickers.items() if name in all_stock_data_raw]
+        export_store = get_price_store()
+        col_data, col_charts = st.columns(2)
+        with col_data:
+            export_format = st.radio("데이터 형식", exports.DATA_FORMATS, horizontal=True, key="export_format",
+                                     format_func=lambda fmt: {'parquet': "Parquet", 'arrow': "Arrow (Feather)"}[fmt])
+            st.download_button(
+                "정규화 가격 행렬 (날짜 x 기업)",
+                data=lambda: exports.export_file(exports.iter_price_matrix(
+                    export_store, export_tickers, start_date, end_date, names=selected_tickers, normalized=True), export_format),
+                file_name=f"normalized_prices_{end_date}.{export_format}", on_click="ignore")
+            st.download_button(
+                "가격 행렬 (날짜 x 기업)",
+                data=lambda: exports.export_file(exports.iter_price_matrix(
+                    export_store, export_tickers, start_date, end_date, names=selected_tickers), export_format),
+                file_name=f"prices_{end_date}.{export_format}", on_click="ignore")
+            st.download_button(
+                "기업별 일봉 (OHLC)",
+                data=lambda: exports.export_file(exports.iter_ohlc_frames(
+                    export_store, export_tickers, start_date, end_date), export_format),
+                file_name=f"ohlc_{end_date}.{export_format}", on_click="ignore")
+        with col_charts:
+            image_format = st.radio("이미지 형식", exports.IMAGE_FORMATS, horizontal=True, key="export_image_format",
+                                    format_func=str.upper)
+            export_chart_type = 'candlestick' if chart_type.startswith('캔들스틱') else 'line'
+            st.download_button(
+                f"기업별 상세 차트 {len(export_tickers)}개 (ZIP)",
+                data=lambda: exports.chart_images_zip(exports.iter_detail_figures(
+                    export_store, export_tickers, start_date, end_date, selected_tickers, export_chart_type), image_format),
+                file_name=f"charts_{end_date}.zip", mime="application/zip", on_click="ignore",
+                disabled=not exports.static_export_available(),
+                help=None if exports.static_export_available() else "이미지로 내보내려면 서버에 kaleido 패키지가 필요합니다.")
+
 st.markdown("---") # 시각적 구분선
-st.info("데이터는 Yahoo Finance에서 가져오며, 지연될 수 있습니다. 시가총액 상위 기업 목록은 시간에 따라 변경될 수 있으므로, 최신 정보를 반영하려면 `TOP_10_COMPANIES` 딕셔너리를 업데이트해야 합니다.")
+st.info(f"데이터는 {default_provider().name}에서 가져오며, 지연될 수 있습니다. 시가총액 상위 기업 목록은 시간에 따라 변경될 수 있으므로, 최신 정보를 반영하려면 `tickers.csv` 파일을 업데이트해야 합니다.")
+
+profiler.report()
@@ -1,114 +1,129 @@
 import streamlit as st
-import numpy as np
-import plotly.graph_objects as go
 import random
+import uuid
+from datetime import datetime
+from page_profiler import PageProfiler, lazy_import
+from quiz_store import QuizSession, QuizStore, grade_answer
+
+# 실행 시간 계측 (PAGE_PROFILE=1 또는 ?profile=1 일 때만 기록)
+profiler = PageProfiler("이차함수")
 
 # 페이지 레이아웃 설정
 st.set_page_config(layout="wide", page_title="이차함수 탐구 앱")
 
 # --- 세션 상태 초기화 및 공통 함수 ---
 
-# 세션 상태 'quiz_data' 초기화. 앱이 처음 로드될 때만 실행됩니다.
-if 'quiz_data' not in st.session_state:
-    st.session_state.quiz_data = {}
-
-# quiz_data 내의 모든 필요한 키들을 개별적으로 확인하고 초기화합니다.
-# 이렇게 하면 특정 키가 누락되었을 때도 안전하게 기본값을 설정할 수 있습니다.
-if 'a' not in st.session_state.quiz_data:
-    st.session_state.quiz_data['a'] = 0
-if 'b' not in st.session_state.quiz_data:
-    st.session_state.quiz_data['b'] = 0
-if 'c' not in st.session_state.quiz_data:
-    st.session_state.quiz_data['c'] = 0
-if 'correct_a_sign' not in st.session_state.quiz_data:
-    st.session_state.quiz_data['correct_a_sign'] = ''
-if 'correct_b_sign' not in st.session_state.quiz_data:
-    st.session_state.quiz_data['correct_b_sign'] = ''
-if 'correct_c_sign' not in st.session_state.quiz_data:
-    st.session_state.quiz_data['correct_c_sign'] = ''
-if 'question_number' not in st.session_state.quiz_data:
-    st.session_state.quiz_data['question_number'] = 0 # 초기값 0
-if 'correct_count' not in st.session_state.quiz_data:
-    st.session_state.quiz_data['correct_count'] = 0
-if 'show_answer' not in st.session_state.quiz_data:
-    st.session_state.quiz_data['show_answer'] = False
-
-# 앱이 처음 시작될 때만 첫 문제를 설정합니다.
-if st.session_state.quiz_data['question_number'] == 0:
-    a_initial, b_initial, c_initial = random_coefficients_for_quiz()
-    st.session_state.quiz_data['a'] = a_initial
-    st.session_state.quiz_data['b'] = b_initial
-    st.session_state.quiz_data['c'] = c_initial
-    st.session_state.quiz_data['correct_a_sign'] = get_sign(a_initial)
-    st.session_state.quiz_data['correct_b_sign'] = get_sign(b_initial)
-    st.session_state.quiz_data['correct_c_sign'] = get_sign(c_initial)
-    st.session_state.quiz_data['question_number'] = 1 # 첫 문제 시작 시 1로 설정
-
-
-def random_coefficients_for_quiz():
-    """퀴즈를 위한 랜덤 이차함수 계수 a, b, c를 생성합니다."""
-    a = random.choice([-3, -2, -1, 1, 2, 3]) # 0 제외
-    b = random.choice([-5, -4, -3, -2, -1, 0, 1, 2, 3, 4, 5])
-    c = random.choice([-7, -6, -5, -4, -3, -2, -1, 0, 1, 2, 3, 4, 5, 6, 7])
-    return a, b, c
-
-def get_sign(value):
-    """숫자의 부호를 문자열로 반환합니다 ('양수', '음수', '0')."""
-    if value > 0:
-        return "양수"
-    elif value < 0:
-        return "음수"
-    else:
-        return "0"
-
-def plot_quadratic_function(a, b, c, title="이차함수 그래프", y_range=[-20, 20], show_vertex=True):
-    """주어진 계수로 이차함수 그래프를 Plotly로 그립니다."""
-    x = np.linspace(-10, 10, 400)
-    y = a * x**2 + b * x + c
-
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=x, y=y, mode='lines', name=f'y = {a}x² + {b}x + {c}'))
-
-    fig.update_layout(
-        title=title,
-        xaxis_title="x",
-        yaxis_title="y",
-        xaxis_range=[-10, 10],
-        yaxis_range=y_range,
-        hovermode="x unified",
-        height=400,
-        showlegend=False
-    )
-
-    fig.add_shape(type="line", x0=-10, y0=0, x1=10, y1=0, line=dict(color="black", width=0.5)) # x축
-    fig.add_shape(type="line", x0=0, y0=y_range[0], x1=0, y1=y_range[1], line=dict(color="black", width=0.5)) # y축
-
-    if show_vertex and a != 0:
-        axis_of_symmetry = -b / (2 * a)
-        vertex_y = a * axis_of_symmetry**2 + b * axis_of_symmetry + c
-        fig.add_trace(go.Scatter(x=[axis_of_symmetry], y=[vertex_y], mode='markers',
-                                 marker=dict(size=8, color='red'),
-                                 name='꼭짓점',
-                                 hoverinfo='text',
-                                 text=f'꼭짓점: ({axis_of_symmetry:.2f}, {vertex_y:.2f})'))
-
+@st.cache_resource(show_spinner=False)
+def get_quiz_store():
+    """모든 세션이 공유하는 퀴즈 기록 저장소 (기록을 모아 두었다가 한 번에 씀)."""
+    return QuizStore()
+
+def get_quiz_session():
+    """
+    이 세션의 퀴즈 진행 상황(QuizSession)을 반환합니다.
+    처음 접속하면 주소의 ?quiz=<세션 번호>로 저장된 진행 상황을 찾고, 없으면 새 세션을 만들어 주소에 번호를 붙입니다.
+    """
+    if 'quiz' not in st.session_state:
+        session_id = st.query_params.get("quiz")
+        quiz = get_quiz_store().load_session(session_id) if session_id else None
+        if quiz is None:
+            quiz = QuizSession(session_id=uuid.uuid4().hex)
+            st.query_params["quiz"] = quiz.session_id
+        st.session_state.quiz = quiz
+    return st.session_state.quiz
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def get_question_bank(difficulty, seed):
+    """
+    (난이도, 시드)별 문제 은행. 계수, 정답, 곡선 좌표를 한 번에 만들어 모든 세션이 공유합니다.
+    같은 시드를 입력한 학생들은 같은 은행을 쓰므로 문제도, 그래프 계산도 다시 하지 않습니다.
+    """
+    return lazy_import("quiz_bank").generate_bank(difficulty=difficulty, seed=seed)
+
+def load_question(quiz, bank, position):
+    """문제 은행의 position번째 문제를 현재 문제로 설정합니다 (은행 끝에 닿으면 처음부터 다시)."""
+    quiz.bank_position = position % len(bank['a'])
+    quiz.show_answer = False
+
+@st.cache_data(ttl=5, show_spinner=False)
+def class_statistics():
+    """
+    학급 전체의 (난이도, 계수, 부호별 정답률, 전체 합계, 최근 학생별 요약). 학생이 많아도 통계 쿼리는 5초에 한 번만 실행합니다.
+    """
+    store = get_quiz_store()
+    store.flush()
+    return store.accuracy_by_sign(), store.totals(), store.student_summary()
+
+def session_figure(name, make_figure):
+    """
+    세션별로 한 번 만든 Figure를 재사용합니다. 레이아웃과 축은 그대로 두고 trace 데이터만 바꿔 그리므로,
+    다른 세션과 공유하지 않도록 session_state에 보관합니다.
+    """
+    figures = st.session_state.setdefault("quadratic_figures", {})
+    if name not in figures:
+        figures[name] = make_figure()
+    return figures[name]
+
+def plot_quadratic_function(a, b, c, title="이차함수 그래프", y_range=[-20, 20], show_vertex=True, x=None, y=None):
+    """
+    주어진 계수로 이차함수 그래프를 Plotly로 그립니다.
+    x, y에 미리 계산한 곡선 좌표(문제 은행)를 넘기면 다시 계산하지 않습니다.
+    """
+    # plotly는 그래프를 그릴 때 불러옵니다.
+    quadratic_charts = lazy_import("quadratic_charts")
+    if x is None or y is None:
+        x, y = quadratic_charts.curve(a, b, c)
+    fig = session_figure(("quiz", title, tuple(y_range)),
+                         lambda: quadratic_charts.quiz_figure(title=title, y_range=y_range))
+    quadratic_charts.update_quiz_figure(fig, a, b, c, x, y, show_vertex=show_vertex)
     st.plotly_chart(fig, use_container_width=True)
 
 
+profiler.mark("세션 초기화")
+
 # --- 사이드바 메뉴 ---
 st.sidebar.title("메뉴")
-page_selection = st.sidebar.radio("페이지 선택", ["이차함수 퀴즈", "포물선 닮음 탐구"])
+page_selection = st.sidebar.radio("페이지 선택", ["이차함수 퀴즈", "포물선 닮음 탐구", "학급 통계"])
 
 # --- 페이지 로직 ---
 if page_selection == "이차함수 퀴즈":
-    st.header(f"문제 #{st.session_state.quiz_data['question_number']}")
-    
-    # 현재 문제의 계수로 그래프 그리기
+    quiz_bank = lazy_import("quiz_bank")
+    store = get_quiz_store()
+    quiz = get_quiz_session()
+    difficulties = list(quiz_bank.DIFFICULTY_TIERS)
+    difficulty = st.sidebar.selectbox("난이도", difficulties,
+                                      index=difficulties.index(quiz.difficulty or quiz_bank.DEFAULT_DIFFICULTY))
+    quiz_seed = st.sidebar.number_input(
+        "문제 세트 번호", min_value=1, value=quiz.seed, step=1, placeholder="무작위",
+        help="같은 번호를 입력한 사람은 모두 같은 문제를 같은 순서로 풉니다. 비워 두면 무작위 순서로 나옵니다.")
+    student = st.sidebar.text_input("이름 (선택)", value=quiz.student, max_chars=30,
+                                    help="입력하면 학급 통계에 이 이름으로 기록됩니다.")
+    if student != quiz.student:
+        quiz.student = student
+        store.save_session(quiz)
+
+    # 난이도나 문제 세트가 바뀌면(처음 접속 포함) 그 은행의 첫 문제부터 시작합니다.
+    # 문제 세트 번호가 없으면 공용 은행을 무작위 위치부터 풀어, 세션마다 은행을 새로 만들지 않습니다.
+    bank = get_question_bank(difficulty, quiz_seed if quiz_seed is not None else quiz_bank.DEFAULT_BANK_SEED)
+    if (quiz.difficulty, quiz.seed) != (difficulty, quiz_seed):
+        start = 0 if quiz_seed is not None else random.randrange(len(bank['a']))
+        load_question(quiz, bank, start)
+        quiz.difficulty, quiz.seed = difficulty, quiz_seed
+        quiz.question_number = max(quiz.question_number, 1)
+        store.save_session(quiz)
+    question = quiz_bank.question(bank, quiz.bank_position)
+
+    st.header(f"문제 #{quiz.question_number}")
+
+    # 현재 문제의 계수로 그래프 그리기 (곡선 좌표는 문제 은행에서 미리 계산한 값)
     plot_quadratic_function(
-        st.session_state.quiz_data['a'],
-        st.session_state.quiz_data['b'],
-        st.session_state.quiz_data['c'],
-        title="이차함수 그래프 (퀴즈)"
+        question['a'],
+        question['b'],
+        question['c'],
+        title="이차함수 그래프 (퀴즈)",
+        x=bank['x'],
+        y=bank['y'][quiz.bank_position],
     )
 
     st.subheader("각 계수의 부호는 무엇일까요?")
@@ -131,43 +146,80 @@ if page_selection == "이차함수 퀴즈":
 
     # --- 버튼 클릭 이벤트 처리 ---
     if submit_button:
-        st.session_state.quiz_data['show_answer'] = True
-
-        is_a_correct = (user_a_sign == st.session_state.quiz_data['correct_a_sign'])
-        is_b_correct = (user_b_sign == st.session_state.quiz_data['correct_b_sign'])
-        is_c_correct = (user_c_sign == st.session_state.quiz_data['correct_c_sign'])
+        answers = {'a': user_a_sign, 'b': user_b_sign, 'c': user_c_sign}
+        # 한 문제의 답은 처음 제출한 것만 기록합니다 (같은 문제를 여러 번 확인해도 정답 수가 늘지 않음).
+        if not quiz.show_answer:
+            quiz.show_answer = True
+            correct = store.record_answer(quiz, question, answers)
+            if all(correct.values()):
+                quiz.correct_count += 1
+            store.save_session(quiz)
+        else:
+            correct = grade_answer(question, answers)
 
         st.subheader("결과:")
-        if is_a_correct and is_b_correct and is_c_correct:
+        if all(correct.values()):
             st.success("🎉 정답입니다! 모든 부호를 맞췄어요!")
-            st.session_state.quiz_data['correct_count'] += 1
         else:
             st.error("😢 아쉽지만 틀렸습니다. 다시 시도해보세요.")
-            st.write(f"현재까지 맞춘 문제: **{st.session_state.quiz_data['correct_count']}개** / **{st.session_state.quiz_data['question_number'] -1}개**")
+            st.write(f"현재까지 맞춘 문제: **{quiz.correct_count}개** / **{quiz.question_number}개**")
 
-        if st.session_state.quiz_data['show_answer']:
-            st.info(f"**정답:**\n"
-                    f"- 계수 a: **{st.session_state.quiz_data['correct_a_sign']}** ({'O' if is_a_correct else 'X'}) \n"
-                    f"- 계수 b: **{st.session_state.quiz_data['correct_b_sign']}** ({'O' if is_b_correct else 'X'})\n"
-                    f"- 계수 c: **{st.session_state.quiz_data['correct_c_sign']}** ({'O' if is_c_correct else 'X'})")
+        st.info(f"**정답:**\n"
+                f"- 계수 a: **{question['correct_a_sign']}** ({'O' if correct['a'] else 'X'}) \n"
+                f"- 계수 b: **{question['correct_b_sign']}** ({'O' if correct['b'] else 'X'})\n"
+                f"- 계수 c: **{question['correct_c_sign']}** ({'O' if correct['c'] else 'X'})")
 
     elif new_question_button:
-        # 새로운 문제 생성
-        a_new, b_new, c_new = random_coefficients_for_quiz()
-        st.session_state.quiz_data['a'] = a_new
-        st.session_state.quiz_data['b'] = b_new
-        st.session_state.quiz_data['c'] = c_new
-        st.session_state.quiz_data['correct_a_sign'] = get_sign(a_new)
-        st.session_state.quiz_data['correct_b_sign'] = get_sign(b_new)
-        st.session_state.quiz_data['correct_c_sign'] = get_sign(c_new)
-        st.session_state.quiz_data['show_answer'] = False
-        st.session_state.quiz_data['question_number'] += 1 # 문제 번호 증가
+        # 문제 은행의 다음 문제로 이동
+        load_question(quiz, bank, quiz.bank_position + 1)
+        quiz.question_number += 1 # 문제 번호 증가
+        store.save_session(quiz)
         st.rerun() # 앱 다시 실행
 
     st.sidebar.markdown("---")
     st.sidebar.subheader("퀴즈 진행 상황")
-    st.sidebar.write(f"총 문제 수: **{st.session_state.quiz_data['question_number']}**")
-    st.sidebar.write(f"맞춘 문제 수: **{st.session_state.quiz_data['correct_count']}**")
+    st.sidebar.write(f"총 문제 수: **{quiz.question_number}**")
+    st.sidebar.write(f"맞춘 문제 수: **{quiz.correct_count}**")
+    profiler.mark("퀴즈")
+
+elif page_selection == "학급 통계":
+    st.header("학급 통계")
+    st.write("퀴즈에 제출한 답을 모아 난이도와 정답 부호별 정답률을 보여 줍니다 (몇 초마다 갱신).")
+    by_sign, (total_answers, total_students, total_all_ok), students = class_statistics()
+    if not by_sign:
+        st.info("아직 제출된 답이 없습니다.")
+    else:
+        difficulties = list(lazy_import("quiz_bank").DIFFICULTY_TIERS)
+        sign_order = ["양수", "음수", "0"]
+        by_sign = sorted(by_sign, key=lambda row: (difficulties.index(row[0]) if row[0] in difficulties else len(difficulties),
+                                                   row[1], sign_order.index(row[2])))
+        col_total, col_students, col_accuracy = st.columns(3)
+        col_total.metric("제출한 답", f"{total_answers:,}")
+        col_students.metric("학생 수", f"{total_students:,}")
+        col_accuracy.metric("모두 맞힌 비율", f"{total_all_ok / total_answers:.0%}")
+
+        st.subheader("계수 부호별 정답률")
+        st.dataframe({
+            "난이도": [row[0] for row in by_sign],
+            "계수": [row[1] for row in by_sign],
+            "정답 부호": [row[2] for row in by_sign],
+            "답한 수": [row[3] for row in by_sign],
+            "정답률": [100 * row[4] / row[3] for row in by_sign],
+        }, hide_index=True, use_container_width=True,
+           column_config={"정답률": st.column_config.ProgressColumn(format="%.0f%%", min_value=0, max_value=100)})
+
+        st.subheader("학생별 기록")
+        if total_students > len(students):
+            st.caption(f"최근에 제출한 학생 {len(students):,}명만 보여 줍니다 (전체 {total_students:,}명).")
+        st.dataframe({
+            "학생": [row[0] for row in students],
+            "답한 수": [row[1] for row in students],
+            "모두 맞힌 수": [row[2] for row in students],
+            "정답률": [100 * row[2] / row[1] for row in students],
+            "마지막 제출": [datetime.fromtimestamp(row[3]).strftime("%m-%d %H:%M") for row in students],
+        }, hide_index=True, use_container_width=True,
+           column_config={"정답률": st.column_config.ProgressColumn(format="%.0f%%", min_value=0, max_value=100)})
+    profiler.mark("학급 통계")
 
 elif page_selection == "포물선 닮음 탐구":
     st.header("포물선 닮음 시각화 도구")
@@ -195,43 +247,52 @@ elif page_selection == "포물선 닮음 탐구":
 
     # --- 그래프 범위 및 이동 설정 ---
     st.subheader("그래프 보기 설정")
-    zoom = st.slider("확대/축소", 0.1, 5.0, 1.0, step=0.1, key="sim_zoom")
-    x_offset = st.slider("x축 이동", -10.0, 10.0, 0.0, step=0.1, key="sim_x_offset")
-    y_offset = st.slider("y축 이동", -20.0, 20.0, 0.0, step=0.1, key="sim_y_offset")
+    viewport_mode = st.toggle(
+        "슬라이더로 보기 범위 조절", value=True, key="sim_viewport",
+        help="끄면 전체 범위(x: -10~10, y: -20~20)를 고정해 보여 주고, 그래프를 직접 끌거나 스크롤해 확대/이동합니다.")
+    zoom = st.slider("확대/축소", 0.1, 5.0, 1.0, step=0.1, key="sim_zoom", disabled=not viewport_mode)
+    x_offset = st.slider("x축 이동", -10.0, 10.0, 0.0, step=0.1, key="sim_x_offset", disabled=not viewport_mode)
+    y_offset = st.slider("y축 이동", -20.0, 20.0, 0.0, step=0.1, key="sim_y_offset", disabled=not viewport_mode)
 
     # --- 그래프 생성 ---
-    x_range_base = 10 / zoom
-    y_range_base = 20 / zoom
-
-    x_vals = np.linspace(-x_range_base + x_offset, x_range_base + x_offset, 400)
-    y1_vals = a1_sim * x_vals**2 + b1_sim * x_vals + c1_sim
-    y2_vals = a2_sim * x_vals**2 + b2_sim * x_vals + c2_sim
-
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=x_vals, y=y1_vals, mode='lines', name=f'포물선 1: y = {a1_sim}x² + {b1_sim}x + {c1_sim}'))
-    fig.add_trace(go.Scatter(x=x_vals, y=y2_vals, mode='lines', name=f'포물선 2: y = {a2_sim}x² + {b2_sim}x + {c2_sim}'))
-
-    # 그래프 레이아웃 설정 (확대/축소 및 이동 적용)
-    fig.update_layout(
-        title="두 포물선 비교",
-        xaxis_title="x",
-        yaxis_title="y",
-        xaxis_range=[-10, 10], # 고정된 전체 보기 범위
-        yaxis_range=[-20, 20], # 고정된 전체 보기 범위
-        hovermode="x unified",
-        height=600,
-        showlegend=True
-    )
-    # 실제 보이는 뷰포트 범위는 x_offset, y_offset, zoom에 따라 조정됩니다.
-    # plotly_chart에 직접 zoom과 offset을 적용하기보다는, x_vals, y_vals를 해당 범위로 생성하는 방식이 더 자연스럽습니다.
-    # 하지만 사용자의 시각적 조정 편의성을 위해 range를 슬라이더로 직접 조절하는 방식은 좀 더 직관적일 수 있습니다.
+    # 곡선 좌표는 (계수, 범위)별로 메모하고, Figure는 세션마다 한 번 만든 뒤 trace 데이터와 보기 범위만 바꿉니다.
+    quadratic_charts = lazy_import("quadratic_charts")
+    if viewport_mode:
+        # 보기 범위는 (x_offset, y_offset)을 가운데로 하고 zoom배 확대한 영역입니다.
+        # 곡선은 이 범위 안에서만, 화면에서 많이 휘는 꼭짓점 근처에 점을 몰아 정해진 점 수로 그립니다.
+        x_range_base = 10 / zoom
+        y_range_base = 20 / zoom
+        x_range = (x_offset - x_range_base, x_offset + x_range_base)
+        y_range = (y_offset - y_range_base, y_offset + y_range_base)
+        curves = [quadratic_charts.adaptive_curve(a, b, c, x_range, y_range, aspect=quadratic_charts.SIMILARITY_ASPECT)
+                  for a, b, c in ((a1_sim, b1_sim, c1_sim), (a2_sim, b2_sim, c2_sim))]
+    else:
+        # 전체 범위를 고정해 보여 주고, Plotly 기본 확대/이동으로 탐색할 수 있도록 보이는 범위보다 넓게 그립니다.
+        x_range, y_range = (-10, 10), (-20, 20)
+        curves = [quadratic_charts.curve(a, b, c, *quadratic_charts.FREE_VIEW_X_RANGE, quadratic_charts.FREE_VIEW_POINTS)
+                  for a, b, c in ((a1_sim, b1_sim, c1_sim), (a2_sim, b2_sim, c2_sim))]
 
-    # 여기서는 고정된 전체 범위를 보여주고, 사용자가 스크롤/줌으로 탐색하도록 Plotly 기본 기능을 활용합니다.
-    # 만약 슬라이더로 엄격하게 범위 제어를 원한다면, x_vals 생성 로직을 변경해야 합니다.
-    # 현재 코드는 사용자가 슬라이더를 움직여도 그래프가 전체 범위에서 그려진 후, Plotly 내부의 줌/패닝 기능처럼 작동하게 합니다.
+    fig = session_figure("similarity", quadratic_charts.similarity_figure)
+    quadratic_charts.update_similarity_figure(fig, [
+        (f'포물선 1: y = {a1_sim}x² + {b1_sim}x + {c1_sim}', *curves[0]),
+        (f'포물선 2: y = {a2_sim}x² + {b2_sim}x + {c2_sim}', *curves[1]),
+    ], x_range=x_range, y_range=y_range)
 
     st.plotly_chart(fig, use_container_width=True)
 
+    # 지금 보이는 그래프를 파일로 저장 (버튼을 누를 때 만듦)
+    exports = lazy_import("exports")
+    col_html, col_png, col_svg = st.columns(3)
+    col_html.download_button("그래프 저장 (HTML)", data=lambda: exports.figure_bytes(fig, 'html'),
+                             file_name="parabolas.html", mime="text/html", on_click="ignore")
+    for column, image_format in ((col_png, 'png'), (col_svg, 'svg')):
+        column.download_button(f"그래프 저장 ({image_format.upper()})",
+                               data=lambda image_format=image_format: exports.figure_bytes(fig, image_format),
+                               file_name=f"parabolas.{image_format}", on_click="ignore",
+                               disabled=not exports.static_export_available(),
+                               help=None if exports.static_export_available() else "이미지로 저장하려면 서버에 kaleido 패키지가 필요합니다.")
+    profiler.mark("닮음 탐구 그래프")
+
     st.markdown("""
     ---
     ### 포물선 닮음 원리 설명
@@ -244,3 +305,5 @@ elif page_selection == "포물선 닮음 탐구":
 
     이러한 성질은 포물선의 **정의** (한 정점과 한 정직선으로부터 같은 거리에 있는 점들의 자취)에서 비롯되며, 이는 모든 포물선이 하나의 기하학적 형태로 분류될 수 있음을 보여줍니다.
     """)
+
+profiler.report()
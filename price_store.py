@@ -0,0 +1,240 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from stock_data import DEFAULT_BATCH_SIZE, OHLC_COLS, chunked, download_stock_data
+
+# 가격 저장소 위치 (환경 변수 PRICE_STORE_DIR로 변경 가능)
+DEFAULT_STORE_DIR = os.environ.get("PRICE_STORE_DIR", ".price_store")
+
+# 다시 받은 봉의 종가가 저장된 값과 이 비율 넘게 다르면 과거 가격이 수정된 것으로 봄
+CLOSE_RTOL = 1e-4
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prices (
+    ticker TEXT NOT NULL,
+    date   TEXT NOT NULL,
+    open   REAL,
+    high   REAL,
+    low    REAL,
+    close  REAL,
+    price  REAL NOT NULL,
+    PRIMARY KEY (ticker, date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    ticker     TEXT PRIMARY KEY,
+    start_date TEXT NOT NULL,
+    end_date   TEXT NOT NULL
+);
+"""
+
+
+def _as_date(value):
+    """date, datetime, Timestamp, 문자열을 모두 date로 바꿉니다."""
+    return pd.Timestamp(value).date()
+
+
+class PriceStore:
+    """
+    티커별 일봉 데이터를 SQLite 파일에 쌓아 두는 로컬 저장소입니다.
+    sync()는 저장된 마지막 날짜 이후의 데이터만 받아 추가하고, load()는 저장소에서만 읽습니다.
+    """
+
+    def __init__(self, directory=DEFAULT_STORE_DIR, filename="prices.sqlite3"):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, filename)
+        self._write_lock = threading.Lock()
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def coverage(self, tickers):
+        """티커별로 저장소가 채우고 있는 (시작일, 종료일)을 반환합니다. 없는 티커는 빠집니다."""
+        tickers = list(tickers)
+        if not tickers:
+            return {}
+        placeholders = ",".join("?" * len(tickers))
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT ticker, start_date, end_date FROM coverage WHERE ticker IN ({placeholders})",
+                tickers,
+            ).fetchall()
+        return {ticker: (date.fromisoformat(s), date.fromisoformat(e)) for ticker, s, e in rows}
+
+    def append(self, ticker, frame, start_date, end_date, replace=False):
+        """
+        받아온 DataFrame을 저장하고 커버 범위를 넓힙니다.
+        같은 날짜의 행은 새 값으로 덮어씁니다 (장중에 받은 마지막 봉을 갱신하기 위함).
+        replace가 참이면 같은 트랜잭션 안에서 그 티커의 기존 데이터와 커버 범위를 먼저 지웁니다.
+        """
+        rows = []
+        if frame is not None and not frame.empty:
+            # OHLC가 없는 DataFrame은 해당 컬럼을 NULL로 저장
+            values = frame.reindex(columns=OHLC_COLS + ['Price']).dropna(subset=['Price']).astype(float)
+            values = values.astype(object).where(values.notna(), None)
+            dates = pd.DatetimeIndex(values.index).strftime('%Y-%m-%d')
+            rows = [(ticker, day, *row) for day, row in zip(dates, values.itertuples(index=False, name=None))]
+
+        with self._write_lock, closing(self._connect()) as conn, conn:
+            if replace:
+                conn.execute("DELETE FROM prices WHERE ticker = ?", (ticker,))
+                conn.execute("DELETE FROM coverage WHERE ticker = ?", (ticker,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO prices (ticker, date, open, high, low, close, price) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute(
+                "INSERT INTO coverage (ticker, start_date, end_date) VALUES (?, ?, ?) "
+                "ON CONFLICT(ticker) DO UPDATE SET "
+                "start_date = MIN(start_date, excluded.start_date), "
+                "end_date = MAX(end_date, excluded.end_date)",
+                (ticker, start_date.isoformat(), end_date.isoformat()),
+            )
+
+    def sync(self, tickers, start_date, end_date, downloader=None, raise_errors=False, timeout=None):
+        """
+        [start_date, end_date) 구간 중 저장소에 없는 부분만 받아와 추가합니다.
+        이미 받은 티커는 마지막 저장일부터 다시 받아(마지막 봉 갱신) 그 이후만 채웁니다.
+        다시 받은 마지막 저장일의 종가가 저장된 값과 다르면 (분할/배당으로 과거 가격이 수정 주가로 바뀐 경우)
+        그 티커의 저장 데이터를 지우고 전체 기간을 다시 받습니다.
+        다운로드가 실패한 티커는 기존 저장 데이터를 그대로 둡니다. raise_errors가 참이면 실패한 요청의 예외를 던집니다.
+        timeout(초)을 주면 이 호출의 모든 다운로드가 남은 시간 안에 끝나도록 각 요청에 남은 시간을 넘깁니다.
+        """
+        start_date, end_date = _as_date(start_date), _as_date(end_date)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def remaining():
+            return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+        tickers = list(tickers)
+        covered = self.coverage(tickers)
+        last_dates = self._last_dates(tickers)
+
+        # 같은 시작일이 필요한 티커끼리 묶어서 한 번에 요청합니다.
+        fetch_groups = {}
+        # 저장된 봉과 겹치게 이어 받는 티커 (겹치는 봉으로 수정 주가 여부를 확인)
+        incremental = set()
+        for ticker in tickers:
+            if ticker in covered and covered[ticker][0] <= start_date:
+                fetch_from = max(start_date, covered[ticker][1] - timedelta(days=1))
+                if ticker in last_dates:
+                    # 휴장일을 건너 항상 저장된 봉 하나와 겹치도록 마지막 저장일부터 받음
+                    fetch_from = max(start_date, min(fetch_from, last_dates[ticker]))
+                    incremental.add(ticker)
+            else:
+                fetch_from = start_date
+            if fetch_from < end_date:
+                fetch_groups.setdefault(fetch_from, []).append(ticker)
+
+        # 겹치는 봉의 종가가 달라진 티커: 처음부터 다시 받을 시작일
+        refetch = {}
+        for fetch_from, group in fetch_groups.items():
+            for batch in chunked(group, DEFAULT_BATCH_SIZE):
+                fetched = download_stock_data(batch, fetch_from, end_date, downloader=downloader,
+                                              raise_errors=raise_errors, timeout=remaining())
+                for ticker, frame in fetched.items():
+                    if frame is None:
+                        continue
+                    if ticker in incremental and not self._overlap_matches(ticker, frame):
+                        refetch[ticker] = covered[ticker][0]
+                        continue
+                    self.append(ticker, frame, fetch_from, end_date)
+
+        # 전체 기간을 다시 받은 뒤에만 기존 데이터를 바꿈 (다시 받기가 실패하면 기존 데이터를 그대로 둠)
+        for ticker, fetch_from in refetch.items():
+            fetched = download_stock_data([ticker], fetch_from, end_date, downloader=downloader,
+                                          raise_errors=raise_errors, timeout=remaining())
+            if fetched.get(ticker) is not None:
+                self.append(ticker, fetched[ticker], fetch_from, end_date, replace=True)
+
+    def _last_dates(self, tickers):
+        """티커별 마지막 저장일을 반환합니다. 저장된 행이 없는 티커는 빠집니다."""
+        if not tickers:
+            return {}
+        placeholders = ",".join("?" * len(tickers))
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT ticker, MAX(date) FROM prices WHERE ticker IN ({placeholders}) GROUP BY ticker",
+                tickers,
+            ).fetchall()
+        return {ticker: date.fromisoformat(last) for ticker, last in rows}
+
+    def _overlap_matches(self, ticker, frame):
+        """
+        새로 받은 frame과 저장된 데이터가 겹치는 날짜의 종가(없으면 Price)가 CLOSE_RTOL 안에서 같은지 확인합니다.
+        겹치는 날짜가 없으면 비교할 수 없으므로 같은 것으로 봅니다.
+        """
+        column = 'Close' if 'Close' in frame.columns else 'Price'
+        fetched = frame[column].dropna()
+        if fetched.empty:
+            return True
+        days = pd.DatetimeIndex(fetched.index).strftime('%Y-%m-%d')
+        placeholders = ",".join("?" * len(days))
+        with closing(self._connect()) as conn:
+            stored = dict(conn.execute(
+                f"SELECT date, COALESCE({column.lower()}, price) FROM prices "
+                f"WHERE ticker = ? AND date IN ({placeholders})",
+                (ticker, *days),
+            ).fetchall())
+        pairs = [(stored[day], value) for day, value in zip(days, fetched.to_numpy()) if stored.get(day) is not None]
+        if not pairs:
+            return True
+        old, new = np.array(pairs, dtype='float64').T
+        return bool(np.allclose(new, old, rtol=CLOSE_RTOL, atol=0.0))
+
+    def load(self, ticker, start_date, end_date):
+        """
+        저장소에서 [start_date, end_date) 구간의 데이터를 get_stock_data와 같은 형태로 읽습니다.
+        저장된 데이터가 없으면 None을 반환합니다.
+        """
+        with closing(self._connect()) as conn:
+            frame = pd.read_sql_query(
+                "SELECT date, open, high, low, close, price FROM prices "
+                "WHERE ticker = ? AND date >= ? AND date < ? ORDER BY date",
+                conn,
+                params=(ticker, _as_date(start_date).isoformat(), _as_date(end_date).isoformat()),
+                parse_dates=['date'],
+                index_col='date',
+            )
+        if frame.empty:
+            return None
+        frame.index.name = 'Date'
+        frame.columns = OHLC_COLS + ['Price']
+        # OHLC 중 비어 있는 컬럼이 있으면 Price만 반환
+        if frame[OHLC_COLS].isna().all().any():
+            return frame[['Price']]
+        return frame
+
+    def load_price_matrix(self, tickers, start_date, end_date):
+        """
+        [start_date, end_date) 구간의 가격(Price)을 한 번의 쿼리로 읽어 날짜 x 티커 행렬로 반환합니다.
+        컬럼은 tickers 순서이고, 값이 없는 날짜는 NaN입니다.
+        """
+        tickers = list(tickers)
+        placeholders = ",".join("?" * len(tickers))
+        with closing(self._connect()) as conn:
+            frame = pd.read_sql_query(
+                f"SELECT date, ticker, price FROM prices "
+                f"WHERE ticker IN ({placeholders}) AND date >= ? AND date < ?",
+                conn,
+                params=(*tickers, _as_date(start_date).isoformat(), _as_date(end_date).isoformat()),
+                parse_dates=['date'],
+            )
+        matrix = frame.pivot(index='date', columns='ticker', values='price').sort_index()
+        matrix = matrix.reindex(columns=tickers).astype('float64')
+        matrix.index.name = 'Date'
+        matrix.columns.name = None
+        return matrix
+
+    def load_many(self, tickers, start_date, end_date):
+        """여러 티커를 {티커: DataFrame 또는 None} 형태로 읽습니다."""
+        return {ticker: self.load(ticker, start_date, end_date) for ticker in tickers}
@@ -0,0 +1,162 @@
+"""
+이차함수 페이지의 그래프 도구입니다.
+
+그래프의 레이아웃과 축은 세션마다 한 번만 만들고(quiz_figure, similarity_figure),
+이후 실행에서는 update_*_figure로 trace의 x/y 배열과 이름만 바꿉니다.
+곡선 좌표는 (a, b, c, x 범위, 점 수)별로 메모해 두어, 슬라이더를 앞뒤로 움직여 같은 값으로 돌아오면 다시 계산하지 않습니다.
+
+adaptive_curve()는 보이는 범위(뷰포트)를 기준으로 정해진 점 수를 나눠 씁니다. 화면 좌표에서 많이 휘는 꼭짓점
+근처에는 점을 촘촘히, 거의 직선인 양옆에는 드물게 두고, 화면 밖으로 나간 구간에는 점을 쓰지 않습니다.
+"""
+from functools import lru_cache
+
+import numpy as np
+import plotly.graph_objects as go
+
+# 기본 x 범위와 곡선 점 수
+DEFAULT_X_RANGE = (-10.0, 10.0)
+DEFAULT_CURVE_POINTS = 400
+
+# 메모해 둘 최대 곡선 수 (곡선 하나에 약 6 KB)
+CURVE_CACHE_SIZE = 4096
+
+# 뷰포트 기준 적응형 샘플링의 점 수와, 점 배치를 정할 때 쓰는 촘촘한 격자의 점 수
+# (120개면 700x600 픽셀 화면에서 곡선과 선분의 차이가 어느 확대 배율에서나 0.1 픽셀 미만)
+ADAPTIVE_CURVE_POINTS = 120
+_ADAPTIVE_GRID_POINTS = 2048
+# 곡률이 0인(직선처럼 보이는) 구간에도 남겨 둘 최소 점 밀도 (전체 길이 대비)
+_MIN_DENSITY = 0.15
+
+# 포물선 닮음 탐구 그래프의 가로/세로 비율 어림값 (넓은 레이아웃, 높이 600 픽셀)
+SIMILARITY_ASPECT = 1.8
+# 보기 범위를 고정하고 Plotly로 직접 확대/이동할 때 미리 그려 둘 x 범위와 점 수
+FREE_VIEW_X_RANGE = (-30.0, 30.0)
+FREE_VIEW_POINTS = 1200
+
+
+@lru_cache(maxsize=CURVE_CACHE_SIZE)
+def curve(a, b, c, x_min=DEFAULT_X_RANGE[0], x_max=DEFAULT_X_RANGE[1], points=DEFAULT_CURVE_POINTS):
+    """y = ax² + bx + c의 (x, y) 좌표 배열을 반환합니다. 여러 호출이 공유하므로 읽기 전용입니다."""
+    x = np.linspace(x_min, x_max, points)
+    y = (a * x + b) * x + c
+    x.flags.writeable = False
+    y.flags.writeable = False
+    return x, y
+
+
+@lru_cache(maxsize=CURVE_CACHE_SIZE)
+def adaptive_curve(a, b, c, x_range, y_range, points=ADAPTIVE_CURVE_POINTS, aspect=1.0):
+    """
+    x_range, y_range 뷰포트에 그릴 y = ax² + bx + c의 (x, y) 좌표를 points개로 반환합니다 (읽기 전용).
+
+    화면 좌표(가로 0~aspect, 세로 0~1)에서 곡선 길이당 sqrt(곡률)에 비례하도록 점을 배치합니다.
+    선분으로 이은 곡선의 오차는 점 간격의 제곱과 곡률의 곱에 비례하므로, 이렇게 나누면 어디서나 오차가 비슷해집니다.
+    화면 밖 구간에는 점을 배치하지 않되, 화면 경계를 지나는 점은 남겨 선이 경계까지 이어지게 합니다.
+    """
+    x_min, x_max = x_range
+    y_min, y_max = y_range
+    x = np.linspace(x_min, x_max, _ADAPTIVE_GRID_POINTS)
+    y = (a * x + b) * x + c
+    # 화면 좌표에서의 기울기와 곡률
+    sx, sy = aspect / (x_max - x_min), 1.0 / (y_max - y_min)
+    slope = sy / sx * (2 * a * x + b)
+    ds = np.sqrt(1 + slope * slope)
+    curvature = abs(sy / (sx * sx) * 2 * a) / ds**3
+    density = (np.sqrt(curvature) + _MIN_DENSITY) * ds
+
+    # 화면 안의 점과 그 바로 옆 점(경계를 지나는 선분)만 남김
+    visible = (y >= y_min) & (y <= y_max)
+    visible[1:] |= visible[:-1]
+    visible[:-1] |= visible[1:]
+    if not visible.any():
+        return curve(a, b, c, x_min, x_max, 2)
+    # 양 끝의 보이지 않는 구간은 잘라 내고, 가운데의 보이지 않는 구간은 밀도를 0으로 둠
+    first, last = np.flatnonzero(visible)[[0, -1]]
+    x, visible = x[first:last + 1], visible[first:last + 1]
+    density = np.where(visible, density[first:last + 1], 0.0)
+
+    # 밀도의 누적합을 같은 간격으로 나눈 위치에 점을 둠 (밀도가 높은 곳일수록 촘촘)
+    cumulative = np.concatenate([[0.0], np.cumsum((density[1:] + density[:-1]) / 2)])
+    targets = np.linspace(0, cumulative[-1], points)
+    sample_x = np.interp(targets, cumulative, x)
+    # 보이지 않는 구간을 건너뛸 때 같은 x가 여러 번 나올 수 있으므로 중복 제거
+    sample_x = np.unique(sample_x)
+    sample_y = (a * sample_x + b) * sample_x + c
+    sample_x.flags.writeable = False
+    sample_y.flags.writeable = False
+    return sample_x, sample_y
+
+
+def quadratic_label(a, b, c):
+    """'y = 2x² + -3x + 1' 형태의 식 문자열입니다."""
+    return f"y = {a}x² + {b}x + {c}"
+
+
+def _add_axes(fig, x_range, y_range):
+    """x축, y축 선을 그립니다."""
+    fig.add_shape(type="line", x0=x_range[0], y0=0, x1=x_range[1], y1=0, line=dict(color="black", width=0.5)) # x축
+    fig.add_shape(type="line", x0=0, y0=y_range[0], x1=0, y1=y_range[1], line=dict(color="black", width=0.5)) # y축
+
+
+def quiz_figure(title="이차함수 그래프", y_range=(-20, 20), x_range=DEFAULT_X_RANGE):
+    """
+    퀴즈용 빈 Figure를 만듭니다 (곡선 trace, 꼭짓점 trace, 축, 레이아웃).
+    데이터는 update_quiz_figure로 채웁니다.
+    """
+    fig = go.Figure([
+        go.Scatter(x=[], y=[], mode='lines'),
+        go.Scatter(x=[], y=[], mode='markers', marker=dict(size=8, color='red'), name='꼭짓점', hoverinfo='text'),
+    ])
+    fig.update_layout(
+        title=title,
+        xaxis_title="x",
+        yaxis_title="y",
+        xaxis_range=list(x_range),
+        yaxis_range=list(y_range),
+        hovermode="x unified",
+        height=400,
+        showlegend=False
+    )
+    _add_axes(fig, x_range, y_range)
+    return fig
+
+
+def update_quiz_figure(fig, a, b, c, x, y, show_vertex=True):
+    """퀴즈 Figure의 곡선과 꼭짓점만 바꿉니다."""
+    with fig.batch_update():
+        fig.data[0].update(x=x, y=y, name=quadratic_label(a, b, c))
+        if show_vertex and a != 0:
+            axis_of_symmetry = -b / (2 * a)
+            vertex_y = a * axis_of_symmetry**2 + b * axis_of_symmetry + c
+            fig.data[1].update(x=[axis_of_symmetry], y=[vertex_y], visible=True,
+                               text=f'꼭짓점: ({axis_of_symmetry:.2f}, {vertex_y:.2f})')
+        else:
+            fig.data[1].update(x=[], y=[], visible=False)
+    return fig
+
+
+def similarity_figure(n_curves=2, title="두 포물선 비교"):
+    """포물선 닮음 탐구용 빈 Figure를 만듭니다 (곡선 trace n_curves개와 레이아웃). 데이터는 update_similarity_figure로 채웁니다."""
+    fig = go.Figure([go.Scatter(x=[], y=[], mode='lines') for _ in range(n_curves)])
+    fig.update_layout(
+        title=title,
+        xaxis_title="x",
+        yaxis_title="y",
+        hovermode="x unified",
+        height=600,
+        showlegend=True
+    )
+    return fig
+
+
+def update_similarity_figure(fig, curves, x_range=(-10, 10), y_range=(-20, 20)):
+    """
+    curves의 (이름, x, y)로 각 곡선 trace의 데이터를 바꾸고, 보기 범위를 x_range, y_range로 맞춥니다.
+    보기 범위가 바뀌면 사용자가 그래프에서 직접 확대/이동한 상태를 버리고 새 범위를 보여 줍니다.
+    """
+    with fig.batch_update():
+        for trace, (name, x, y) in zip(fig.data, curves):
+            trace.update(x=x, y=y, name=name)
+        fig.update_layout(xaxis_range=list(x_range), yaxis_range=list(y_range),
+                          uirevision=f"{x_range}{y_range}")
+    return fig
@@ -0,0 +1,93 @@
+"""
+이차함수 퀴즈 문제 은행입니다.
+
+문제를 하나씩 만들지 않고 N개를 NumPy로 한 번에 만듭니다. 계수 a, b, c와 각 계수의 부호(정답),
+꼭짓점, 판별식, 실근을 모두 배열로 계산하고, 그래프에 쓰는 곡선 좌표도 공통 x 좌표에 대해 (N x 점 수) 행렬로
+미리 계산해 둡니다. 같은 (난이도, 시드)로 만들면 항상 같은 문제가 같은 순서로 나오므로,
+수업에서 시드를 공유하면 모든 학생이 같은 문제를 풀 수 있습니다.
+"""
+import numpy as np
+
+# 난이도별 계수 후보. 쉬움은 축과 y절편이 원점에서 멀어 부호가 잘 보이고,
+# 어려움은 a가 소수이고 b, c가 0에 가까워 그래프를 자세히 봐야 합니다.
+DIFFICULTY_TIERS = {
+    "쉬움": {
+        'a': [-2, -1, 1, 2],
+        'b': [-6, -5, -4, 4, 5, 6],
+        'c': [-7, -6, -5, -4, -3, 3, 4, 5, 6, 7],
+    },
+    "보통": {
+        'a': [-3, -2, -1, 1, 2, 3],
+        'b': list(range(-5, 6)),
+        'c': list(range(-7, 8)),
+    },
+    "어려움": {
+        'a': [-3, -2.5, -2, -1.5, -1, -0.5, 0.5, 1, 1.5, 2, 2.5, 3],
+        'b': [-2, -1, 0, 1, 2],
+        'c': [-2, -1, 0, 1, 2],
+    },
+}
+DEFAULT_DIFFICULTY = "보통"
+
+# 문제 은행 기본 크기와 시드
+DEFAULT_BANK_SIZE = 1000
+DEFAULT_BANK_SEED = 2025
+
+# 퀴즈 그래프의 x 범위와 점 수 (모든 문제가 같은 x 좌표를 씀)
+X_RANGE = (-10.0, 10.0)
+CURVE_POINTS = 400
+
+SIGN_LABELS = {1: "양수", -1: "음수", 0: "0"}
+
+
+def sign_label(value):
+    """숫자의 부호를 문자열로 반환합니다 ('양수', '음수', '0')."""
+    return SIGN_LABELS[int(np.sign(value))]
+
+
+def generate_bank(n=DEFAULT_BANK_SIZE, difficulty=DEFAULT_DIFFICULTY, seed=DEFAULT_BANK_SEED):
+    """
+    n개 문제를 한 번에 만들어 배열 dict로 반환합니다.
+    키: a, b, c, a_sign, b_sign, c_sign(-1/0/1), vertex_x, vertex_y, discriminant,
+    root1, root2(실근이 없으면 NaN, root1 <= root2), x(공통 x 좌표), y(문제별 곡선, n x CURVE_POINTS).
+    반환한 배열은 여러 세션이 공유하므로 읽기 전용으로 표시합니다.
+    """
+    tier = DIFFICULTY_TIERS[difficulty]
+    rng = np.random.default_rng(seed)
+    a = rng.choice(np.asarray(tier['a'], dtype='float64'), n)
+    b = rng.choice(np.asarray(tier['b'], dtype='float64'), n)
+    c = rng.choice(np.asarray(tier['c'], dtype='float64'), n)
+
+    vertex_x = -b / (2 * a)
+    vertex_y = c - b * b / (4 * a)
+    discriminant = b * b - 4 * a * c
+    with np.errstate(invalid='ignore'):
+        sqrt_d = np.sqrt(discriminant)
+    roots = np.sort(np.stack([(-b - sqrt_d) / (2 * a), (-b + sqrt_d) / (2 * a)]), axis=0)
+
+    x = np.linspace(*X_RANGE, CURVE_POINTS)
+    y = (a[:, None] * x + b[:, None]) * x + c[:, None]
+
+    bank = {
+        'a': a, 'b': b, 'c': c,
+        'a_sign': np.sign(a).astype(np.int8), 'b_sign': np.sign(b).astype(np.int8), 'c_sign': np.sign(c).astype(np.int8),
+        'vertex_x': vertex_x, 'vertex_y': vertex_y, 'discriminant': discriminant,
+        'root1': roots[0], 'root2': roots[1],
+        'x': x, 'y': y,
+    }
+    for values in bank.values():
+        values.flags.writeable = False
+    return bank
+
+
+def question(bank, i):
+    """문제 은행의 i번째 문제를 {'a', 'b', 'c', 'correct_a_sign', 'correct_b_sign', 'correct_c_sign'} dict로 반환합니다."""
+    a, b, c = (bank[k][i].item() for k in ('a', 'b', 'c'))
+    # 정수 계수는 그래프 제목에 2.0처럼 나오지 않도록 int로 바꿈
+    a, b, c = (int(v) if float(v).is_integer() else v for v in (a, b, c))
+    return {
+        'a': a, 'b': b, 'c': c,
+        'correct_a_sign': SIGN_LABELS[int(bank['a_sign'][i])],
+        'correct_b_sign': SIGN_LABELS[int(bank['b_sign'][i])],
+        'correct_c_sign': SIGN_LABELS[int(bank['c_sign'][i])],
+    }
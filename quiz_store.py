@@ -0,0 +1,235 @@
+"""
+이차함수 퀴즈의 세션 기록 저장소입니다.
+
+세션마다 QuizSession(진행 상황) 한 개를 두고, 제출한 답은 한 줄씩 answers 테이블에 쌓습니다.
+새로고침해도 주소의 ?quiz=<세션 번호>로 진행 상황을 되살릴 수 있고, 학급 전체의 정답률을 난이도/계수 부호별로 모아 볼 수 있습니다.
+
+학생이 많을 때 답을 낼 때마다 SQLite에 쓰면 쓰기 잠금을 두고 경쟁하므로, 기록은 메모리에 모아 두었다가
+batch_size개가 쌓이거나 첫 기록을 쌓은 뒤 flush_interval초가 지나면 한 트랜잭션으로 씁니다.
+시간이 지나 쓰는 것은 백그라운드 타이머가 하므로 요청이 끊긴 서버에서도 기록이 오래 남아 있지 않습니다 (프로세스 종료 때도 씀).
+통계 쿼리는 (난이도, 부호, 정답 여부) 순서의 커버링 색인만 읽습니다.
+"""
+import atexit
+import dataclasses
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from dataclasses import dataclass
+
+# 퀴즈 기록 저장소 위치 (환경 변수 QUIZ_STORE_DIR로 변경 가능)
+DEFAULT_QUIZ_STORE_DIR = os.environ.get("QUIZ_STORE_DIR", ".quiz_store")
+
+# 한 번에 쓰는 기록 수와 최대 대기 시간(초)
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_FLUSH_INTERVAL = 2.0
+
+COEFFICIENTS = ('a', 'b', 'c')
+
+_SCHEMA = """
+PRAGMA journal_mode = WAL;
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id      TEXT PRIMARY KEY,
+    student         TEXT NOT NULL,
+    difficulty      TEXT,
+    seed            INTEGER,
+    bank_position   INTEGER NOT NULL,
+    question_number INTEGER NOT NULL,
+    correct_count   INTEGER NOT NULL,
+    show_answer     INTEGER NOT NULL,
+    updated_at      REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS answers (
+    id          INTEGER PRIMARY KEY,
+    session_id  TEXT NOT NULL,
+    student     TEXT NOT NULL,
+    difficulty  TEXT NOT NULL,
+    answered_at REAL NOT NULL,
+    a_sign      INTEGER NOT NULL,
+    b_sign      INTEGER NOT NULL,
+    c_sign      INTEGER NOT NULL,
+    a_ok        INTEGER NOT NULL,
+    b_ok        INTEGER NOT NULL,
+    c_ok        INTEGER NOT NULL,
+    all_ok      INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS answers_a ON answers (difficulty, a_sign, a_ok);
+CREATE INDEX IF NOT EXISTS answers_b ON answers (difficulty, b_sign, b_ok);
+CREATE INDEX IF NOT EXISTS answers_c ON answers (difficulty, c_sign, c_ok);
+CREATE INDEX IF NOT EXISTS answers_student ON answers (student, all_ok, answered_at);
+"""
+
+_SESSION_COLUMNS = ('session_id', 'student', 'difficulty', 'seed', 'bank_position', 'question_number', 'correct_count',
+                    'show_answer')
+
+_SIGN_VALUES = {"양수": 1, "음수": -1, "0": 0}
+
+
+def grade_answer(question, answers):
+    """
+    계수별 정답 여부 {'a': bool, 'b': bool, 'c': bool}를 반환합니다.
+    question은 quiz_bank.question()의 dict, answers는 {'a': '양수', ...} 형태의 학생 답입니다.
+    """
+    return {k: answers.get(k) == question[f'correct_{k}_sign'] for k in COEFFICIENTS}
+
+
+@dataclass(slots=True)
+class QuizSession:
+    """
+    세션 하나의 퀴즈 진행 상황입니다. 현재 문제는 (difficulty, seed) 문제 은행의 bank_position번째 문제이므로
+    계수나 정답은 따로 저장하지 않습니다. question_number가 0이면 아직 문제를 받지 않은 새 세션입니다.
+    """
+    session_id: str
+    student: str = ""
+    difficulty: str | None = None
+    seed: int | None = None
+    bank_position: int = 0
+    question_number: int = 0
+    correct_count: int = 0
+    # 현재 문제의 답을 이미 제출했는지 (새로고침 뒤에 같은 문제를 다시 기록하지 않도록 함께 저장)
+    show_answer: bool = False
+
+    @property
+    def student_label(self):
+        """통계에 쓰는 학생 이름 (이름을 입력하지 않았으면 세션 번호 앞자리)."""
+        return self.student.strip() or f"익명 {self.session_id[:6]}"
+
+
+class QuizStore:
+    """
+    퀴즈 세션과 제출한 답을 SQLite 파일에 모아 두는 저장소입니다.
+    save_session()/record_answer()는 메모리에 쌓기만 하고, 모인 기록은 flush()가 한 번에 씁니다.
+    batch_size개가 쌓이면 바로, 그 전에는 첫 기록을 쌓은 뒤 flush_interval초에 타이머 스레드가 flush()합니다.
+    """
+
+    def __init__(self, directory=DEFAULT_QUIZ_STORE_DIR, filename="quiz.sqlite3",
+                 batch_size=DEFAULT_BATCH_SIZE, flush_interval=DEFAULT_FLUSH_INTERVAL):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, filename)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._write_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._pending_sessions = {}
+        self._pending_answers = []
+        self._last_flush = time.monotonic()
+        self._timer = None
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+        atexit.register(self.flush)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def load_session(self, session_id):
+        """저장된 세션을 QuizSession으로 반환합니다 (없으면 None). 아직 쓰지 않은 최신 상태가 있으면 그것을 씁니다."""
+        with self._pending_lock:
+            pending = self._pending_sessions.get(session_id)
+        if pending is not None:
+            return dataclasses.replace(pending)
+        with closing(self._connect()) as conn:
+            row = conn.execute(f"SELECT {', '.join(_SESSION_COLUMNS)} FROM sessions WHERE session_id = ?",
+                               (session_id,)).fetchone()
+        if row is None:
+            return None
+        quiz = QuizSession(*row)
+        quiz.show_answer = bool(quiz.show_answer)
+        return quiz
+
+    def save_session(self, quiz):
+        """세션의 현재 진행 상황을 쓰기 대기열에 넣습니다 (같은 세션은 마지막 상태만 씀)."""
+        with self._pending_lock:
+            self._pending_sessions[quiz.session_id] = dataclasses.replace(quiz)
+        self._maybe_flush()
+
+    def record_answer(self, quiz, question, answers):
+        """
+        제출한 답 하나를 쓰기 대기열에 넣고, grade_answer()의 계수별 정답 여부를 반환합니다.
+        """
+        signs = {k: _SIGN_VALUES[question[f'correct_{k}_sign']] for k in COEFFICIENTS}
+        correct = grade_answer(question, answers)
+        row = (quiz.session_id, quiz.student_label, quiz.difficulty, time.time(),
+               *(signs[k] for k in COEFFICIENTS), *(int(correct[k]) for k in COEFFICIENTS), int(all(correct.values())))
+        with self._pending_lock:
+            self._pending_answers.append(row)
+        self._maybe_flush()
+        return correct
+
+    def _maybe_flush(self):
+        with self._pending_lock:
+            due = (len(self._pending_answers) + len(self._pending_sessions) >= self.batch_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+            if not due and self._timer is None:
+                # 더 기록이 오지 않아도 flush_interval초 뒤에는 쓰도록 타이머를 켬
+                self._timer = threading.Timer(self.flush_interval, self._flush_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        if due:
+            self.flush()
+
+    def _flush_on_timer(self):
+        with self._pending_lock:
+            self._timer = None
+        self.flush()
+
+    def flush(self):
+        """
+        대기 중인 세션 상태와 답을 한 트랜잭션으로 씁니다.
+        쓰기에 실패하면 꺼낸 기록을 대기열에 되돌려 두고 예외를 다시 던지므로, 다음 flush()에서 다시 씁니다.
+        """
+        with self._pending_lock:
+            sessions, self._pending_sessions = self._pending_sessions, {}
+            answers, self._pending_answers = self._pending_answers, []
+            self._last_flush = time.monotonic()
+        if not sessions and not answers:
+            return
+        now = time.time()
+        try:
+            with self._write_lock, closing(self._connect()) as conn, conn:
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO sessions ({', '.join(_SESSION_COLUMNS)}, updated_at) "
+                    f"VALUES ({', '.join('?' * (len(_SESSION_COLUMNS) + 1))})",
+                    [tuple(getattr(quiz, column) for column in _SESSION_COLUMNS) + (now,)
+                     for quiz in sessions.values()],
+                )
+                conn.executemany(
+                    "INSERT INTO answers (session_id, student, difficulty, answered_at, a_sign, b_sign, c_sign, "
+                    "a_ok, b_ok, c_ok, all_ok) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    answers,
+                )
+        except Exception:
+            # 그 사이 새로 쌓인 세션 상태가 더 최신이므로 그것을 남기고, 답은 제출 순서대로 앞에 되돌림
+            with self._pending_lock:
+                self._pending_sessions = {**sessions, **self._pending_sessions}
+                self._pending_answers = answers + self._pending_answers
+            raise
+
+    def accuracy_by_sign(self):
+        """
+        난이도, 계수, 정답 부호별 (난이도, 계수, 부호, 답한 수, 맞힌 수) 목록을 반환합니다.
+        계수마다 (난이도, 부호, 정답 여부) 색인만 읽어 집계합니다.
+        """
+        queries = " UNION ALL ".join(
+            f"SELECT difficulty, '{k}', {k}_sign, COUNT(*), SUM({k}_ok) FROM answers GROUP BY difficulty, {k}_sign"
+            for k in COEFFICIENTS)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(queries).fetchall()
+        labels = {value: label for label, value in _SIGN_VALUES.items()}
+        return [(difficulty, k, labels[sign], n, correct) for difficulty, k, sign, n, correct in rows]
+
+    def totals(self):
+        """학급 전체의 (제출한 답 수, 학생 수, 모두 맞힌 답 수)를 반환합니다."""
+        with closing(self._connect()) as conn:
+            answers, students, all_ok = conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT student), COALESCE(SUM(all_ok), 0) FROM answers").fetchone()
+        return answers, students, all_ok
+
+    def student_summary(self, limit=200):
+        """학생별 (학생, 답한 수, 모두 맞힌 수, 마지막 제출 시각) 목록을 최근 제출 순서로 최대 limit개 반환합니다."""
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT student, COUNT(*), SUM(all_ok), MAX(answered_at) FROM answers "
+                "GROUP BY student ORDER BY MAX(answered_at) DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
@@ -0,0 +1,188 @@
+"""
+관광지 이름과 설명을 검색하는 역색인입니다.
+
+한국어는 띄어쓰기 단위 안에 조사가 붙고 합성어가 많으므로 단어를 글자 2-gram으로 나눠 색인합니다
+("에펠탑에" -> 에펠, 펠탑, 탑에). 관광지 이름의 한글 단어는 자모로 풀어 쓴 2-gram도 함께 색인해, 모음 하나가
+틀린 글자("셍"과 "생", "부"와 "브")도 일부 겹치도록 합니다 (긴 설명까지 풀어 쓰면 색인만 커지고 엉뚱한 결과가 늘어남). 검색어도 같은 방식으로 나눠 겹치는 토큰이 많은 관광지를 BM25 점수로 정렬하므로,
+조사가 붙거나 한두 글자가 틀린 검색어("에펠탐", "몽셍미쉘", "eifel")도 찾을 수 있습니다. 이름은 설명보다 높은 가중치를 줍니다.
+
+색인은 (토큰 목록, 토큰별 관광지 번호/점수 배열)로 만들어 .npz 파일에 저장하고,
+관광지 파일이 바뀌지 않았으면 다시 만들지 않고 파일에서 읽습니다.
+"""
+import os
+import re
+import unicodedata
+
+import numpy as np
+
+# 검색 색인 파일 위치 (환경 변수 SEARCH_INDEX_FILE로 변경 가능)
+DEFAULT_SEARCH_INDEX_PATH = os.environ.get("SEARCH_INDEX_FILE", ".search_index.npz")
+
+# 이름에 나온 2-gram을 설명에 나온 것보다 몇 배로 셀지
+NAME_WEIGHT = 3.0
+# BM25 매개변수
+BM25_K1 = 1.2
+BM25_B = 0.75
+# 검색어 토큰 중 이 비율 이상이 겹쳐야 결과에 포함합니다 (오타가 있어도 일부가 맞으면 찾도록 낮게 잡음).
+MIN_MATCH_RATIO = 0.3
+# 1위 점수의 이 비율보다 낮은 결과는 우연히 겹친 것으로 보고 버립니다.
+MIN_RELATIVE_SCORE = 0.3
+
+# 토큰 나누기나 점수 계산 방식을 바꾸면 올려서 예전에 저장한 색인을 다시 만들게 합니다.
+INDEX_VERSION = 1
+
+_WORD_RE = re.compile(r"\w+")
+_HANGUL_RE = re.compile(r"[가-힣]")
+# 라틴 문자의 악센트(결합 분음 기호)
+_ACCENT_RE = re.compile(r"[\u0300-\u036f]")
+# 자모 2-gram 토큰 앞에 붙여 글자 2-gram과 구분하는 표시
+_JAMO_PREFIX = "~"
+
+
+def normalize(text):
+    """소문자로 바꾸고 악센트를 없앱니다 (Musée -> musee). 한글은 분해되지 않도록 다시 합칩니다."""
+    text = _ACCENT_RE.sub('', unicodedata.normalize('NFKD', text.lower()))
+    return unicodedata.normalize('NFC', text)
+
+
+def tokenize(text, jamo=True):
+    """
+    텍스트를 단어별 글자 2-gram 목록으로 나눕니다 (한 글자 단어는 그대로).
+    jamo가 참이면 한글이 들어 있는 단어의 자모 2-gram("~" 표시)도 덧붙입니다.
+    """
+    tokens = []
+    for word in _WORD_RE.findall(normalize(text)):
+        if len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        if jamo and _HANGUL_RE.search(word):
+            decomposed = unicodedata.normalize('NFD', word)
+            tokens.extend(_JAMO_PREFIX + decomposed[i:i + 2] for i in range(len(decomposed) - 1))
+    return tokens
+
+
+class SearchIndex:
+    """
+    2-gram 역색인입니다. 2-gram마다 그 2-gram이 나오는 관광지 번호와 BM25 점수를 미리 계산해 두므로,
+    검색은 검색어 2-gram의 점수 배열을 관광지별로 더하기만 하면 됩니다.
+    """
+
+    def __init__(self, cities, names, vocab, indptr, doc_ids, weights):
+        self.cities = list(cities)
+        self.names = list(names)
+        self.vocab = np.asarray(vocab)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.doc_ids = np.asarray(doc_ids, dtype=np.int32)
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self._token_ids = {token: i for i, token in enumerate(self.vocab.tolist())}
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def build(cls, records):
+        """{'city', 'name', 'description'} 레코드들로 색인을 만듭니다."""
+        cities, names = [], []
+        token_ids = {}
+        # (토큰 번호, 관광지 번호, 가중치) 항목을 모아 두었다가 한 번에 합산
+        entry_tokens, entry_docs, entry_tfs = [], [], []
+        for doc_id, record in enumerate(records):
+            cities.append(record['city'])
+            names.append(record['name'])
+            for tokens, weight in ((tokenize(record['name']), NAME_WEIGHT),
+                                   (tokenize(record.get('description', ''), jamo=False), 1.0)):
+                entry_tokens.extend(token_ids.setdefault(token, len(token_ids)) for token in tokens)
+                entry_docs.extend([doc_id] * len(tokens))
+                entry_tfs.extend([weight] * len(tokens))
+
+        n_docs = len(names)
+        entry_tokens = np.asarray(entry_tokens, dtype=np.int64)
+        entry_docs = np.asarray(entry_docs, dtype=np.int64)
+        lengths = np.bincount(entry_docs, weights=np.asarray(entry_tfs), minlength=n_docs)
+        # 같은 (토큰, 관광지) 항목을 합쳐 토큰 순서로 정렬된 게시 목록을 만듦
+        pairs, inverse = np.unique(entry_tokens * max(n_docs, 1) + entry_docs, return_inverse=True)
+        tfs = np.bincount(inverse, weights=np.asarray(entry_tfs), minlength=len(pairs))
+        posting_tokens, doc_ids = np.divmod(pairs, max(n_docs, 1))
+
+        # 토큰을 문자열 순서로 다시 번호 매김 (저장 파일과 검색에서 쓰는 번호)
+        vocab = np.asarray(list(token_ids), dtype=str)
+        order = np.argsort(vocab, kind='stable')
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        posting_tokens = rank[posting_tokens]
+        sort = np.argsort(posting_tokens, kind='stable')
+        posting_tokens, doc_ids, tfs = posting_tokens[sort], doc_ids[sort], tfs[sort]
+
+        df = np.bincount(posting_tokens, minlength=len(vocab))
+        indptr = np.concatenate([[0], np.cumsum(df)])
+        idf = np.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+        avg_length = lengths.mean() if n_docs else 1.0
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[doc_ids] / avg_length)
+        weights = idf[posting_tokens] * tfs * (BM25_K1 + 1) / (tfs + norm)
+        return cls(cities, names, vocab[order], indptr, doc_ids, weights)
+
+    @classmethod
+    def from_store(cls, store):
+        """AttractionStore의 모든 관광지(kind가 spot)로 색인을 만듭니다."""
+        return cls.build(record for city in store.cities() for record in store.city_spots(city).values())
+
+    def save(self, path, source_key=""):
+        """색인을 .npz 파일로 저장합니다. source_key는 색인을 만든 관광지 파일을 구분하는 문자열입니다."""
+        temp_path = f"{path}.tmp.npz"
+        np.savez(temp_path, cities=np.asarray(self.cities, dtype=str), names=np.asarray(self.names, dtype=str),
+                 vocab=self.vocab, indptr=self.indptr, doc_ids=self.doc_ids, weights=self.weights,
+                 source_key=np.asarray(source_key))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path, source_key=""):
+        """저장한 색인을 읽습니다. 파일이 없거나 source_key가 다르면(관광지 파일이 바뀜) None을 반환합니다."""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            if str(data['source_key']) != source_key:
+                return None
+            return cls(data['cities'].tolist(), data['names'].tolist(), data['vocab'],
+                       data['indptr'], data['doc_ids'], data['weights'])
+
+    def search(self, query, limit=10):
+        """
+        검색어와 비슷한 관광지를 점수가 높은 순서로 최대 limit개 반환합니다.
+        각 항목은 (도시, 관광지, 점수)입니다.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        # 글자 2-gram과 (이름에만 있는) 자모 2-gram 중 어느 한쪽이라도 충분히 겹치면 후보로 봄
+        scores = np.zeros(len(self.names))
+        candidates = np.zeros(len(self.names), dtype=bool)
+        for group in ([t for t in tokens if not t.startswith(_JAMO_PREFIX)], [t for t in tokens if t.startswith(_JAMO_PREFIX)]):
+            ids = [self._token_ids[token] for token in group if token in self._token_ids]
+            if not ids:
+                continue
+            docs = np.concatenate([self.doc_ids[self.indptr[i]:self.indptr[i + 1]] for i in ids])
+            weights = np.concatenate([self.weights[self.indptr[i]:self.indptr[i + 1]] for i in ids])
+            scores += np.bincount(docs, weights=weights, minlength=len(self.names))
+            candidates |= np.bincount(docs, minlength=len(self.names)) >= max(1, MIN_MATCH_RATIO * len(group))
+        candidates = np.flatnonzero(candidates)
+        if len(candidates):
+            candidates = candidates[scores[candidates] >= MIN_RELATIVE_SCORE * scores[candidates].max()]
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(self.cities[i], self.names[i], float(scores[i])) for i in candidates.tolist()]
+
+
+def source_key(path):
+    """색인 형식 버전과 관광지 파일의 경로, 수정 시각, 크기로 만든 구분 문자열입니다."""
+    stat = os.stat(path)
+    return f"v{INDEX_VERSION}:{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def load_or_build(store, path=DEFAULT_SEARCH_INDEX_PATH):
+    """저장한 색인이 store의 관광지 파일과 맞으면 읽고, 아니면 새로 만들어 저장한 뒤 반환합니다."""
+    key = source_key(store.path)
+    index = SearchIndex.load(path, key)
+    if index is None:
+        index = SearchIndex.from_store(store)
+        index.save(path, key)
+    return index
@@ -0,0 +1,261 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from stock_data import OHLC_COLS
+
+# 이 개수를 넘는 선 그래프는 WebGL(Scattergl)로 그려 브라우저 렌더링 부담을 줄입니다.
+WEBGL_TRACE_THRESHOLD = 50
+
+# 캔들 하나를 알아볼 수 있으려면 최소 이 정도 픽셀 폭이 필요합니다.
+PIXELS_PER_CANDLE = 4
+
+# 캔들스틱 재집계 단계 (일 → 주 → 월)
+OHLC_RESAMPLE_RULES = (('D', None), ('W', 'W-FRI'), ('M', 'ME'))
+
+
+def lttb_indices(x, y, n_out):
+    """
+    LTTB(Largest-Triangle-Three-Buckets)로 선 그래프 모양을 유지하는 n_out개 점의 위치를 고릅니다.
+    첫 점과 마지막 점은 항상 포함되며, 점이 n_out개 이하이면 모든 위치를 반환합니다.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    # 첫 점과 마지막 점을 뺀 나머지를 n_out - 2개 구간으로 나눕니다.
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    prev = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # 다음 구간의 평균점 (마지막 구간이면 마지막 점)
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        # 이전 선택점, 후보점, 다음 구간 평균점이 이루는 삼각형 넓이가 가장 큰 후보를 선택
+        area = np.abs((x[prev] - avg_x) * (y[start:end] - y[prev])
+                      - (x[prev] - x[start:end]) * (avg_y - y[prev]))
+        prev = start + int(np.argmax(area))
+        selected[i + 1] = prev
+    return selected
+
+
+def minmax_indices(values, n_out):
+    """
+    2차원 배열(행: 시점, 열: 기업)의 각 열을 구간별 최솟값/최댓값 위치만 남겨 약 n_out개 행으로 줄입니다.
+    모든 열을 한 번에 벡터 연산으로 처리하며, 반환값은 열마다 정렬된 행 위치 배열(행 수 x 열 수)입니다.
+    """
+    n, n_cols = values.shape
+    bin_size = int(np.ceil(n / max(n_out // 2, 1)))
+    if n <= n_out or bin_size < 2:
+        return np.repeat(np.arange(n)[:, None], n_cols, axis=1)
+
+    n_bins = int(np.ceil(n / bin_size))
+    padded = np.full((n_bins * bin_size, n_cols), np.nan)
+    padded[:n] = values
+    bins = padded.reshape(n_bins, bin_size, n_cols)
+    # NaN은 최솟값/최댓값 후보에서 빠지도록 각각 +inf/-inf로 바꿔 계산
+    lows = np.argmin(np.where(np.isnan(bins), np.inf, bins), axis=1)
+    highs = np.argmax(np.where(np.isnan(bins), -np.inf, bins), axis=1)
+    # 구간 안에서 시간 순서가 유지되도록 두 위치를 정렬
+    pairs = np.sort(np.stack([lows, highs], axis=1), axis=1)
+    offsets = (np.arange(n_bins) * bin_size)[:, None, None]
+    indices = (pairs + offsets).reshape(n_bins * 2, n_cols)
+    return np.minimum(indices, n - 1)
+
+
+def downsample_series(series, n_out):
+    """날짜 인덱스 Series를 LTTB로 n_out개 이하의 점으로 줄입니다. NaN은 먼저 제거합니다."""
+    series = series.dropna()
+    if len(series) <= n_out:
+        return series
+    x = pd.DatetimeIndex(series.index).asi8
+    return series.iloc[lttb_indices(x, series.to_numpy(), n_out)]
+
+
+def resample_ohlc(data, max_bars):
+    """
+    캔들 수가 max_bars 이하가 될 때까지 일봉을 주봉, 월봉으로 다시 집계합니다.
+    반환값은 (DataFrame, 사용한 단위 'D'/'W'/'M')입니다.
+    """
+    for label, rule in OHLC_RESAMPLE_RULES:
+        if rule is None:
+            resampled = data
+        else:
+            agg = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last'}
+            if 'Price' in data.columns:
+                agg['Price'] = 'last'
+            resampled = data.resample(rule).agg(agg).dropna(subset=OHLC_COLS)
+        if len(resampled) <= max_bars:
+            return resampled, label
+    return resampled, label
+
+
+def figure_payload_bytes(fig):
+    """브라우저로 전송되는 Figure JSON의 크기(바이트)를 반환합니다."""
+    return len(fig.to_json().encode('utf-8'))
+
+
+def line_matrix_figure(matrix, title, yaxis_title, legend_title="기업", max_points=None, height=600):
+    """
+    행렬(날짜 x 기업)의 각 열을 선으로 그리는 다중 선 그래프를 만듭니다.
+    트레이스를 하나씩 add_trace하지 않고, NumPy 배열 열에서 한 번에 만들어 Figure에 넘깁니다.
+    max_points가 주어지면 모든 선을 한 번에 구간별 최솟값/최댓값 방식으로 줄입니다.
+    """
+    scatter = go.Scattergl if matrix.shape[1] > WEBGL_TRACE_THRESHOLD else go.Scatter
+    values = matrix.to_numpy(dtype='float64')
+    x = matrix.index
+    if max_points is None:
+        traces = [scatter(x=x, y=values[:, j], mode='lines', name=str(name))
+                  for j, name in enumerate(matrix.columns)]
+    else:
+        rows = minmax_indices(values, max_points)
+        traces = [scatter(x=x[rows[:, j]], y=values[rows[:, j], j], mode='lines', name=str(name))
+                  for j, name in enumerate(matrix.columns)]
+
+    return go.Figure(data=traces, layout=dict(
+        title=title,
+        xaxis_title="날짜",
+        yaxis_title=yaxis_title,
+        hovermode="x unified",
+        legend_title=legend_title,
+        height=height
+    ))
+
+
+def normalized_price_figure(normalized, title="선택된 글로벌 시총 Top 기업 주가 변화", max_points=None):
+    """정규화된 가격 행렬(날짜 x 기업)로 다중 선 그래프를 만듭니다."""
+    return line_matrix_figure(normalized, title, "정규화된 주가 (시작점 100)", max_points=max_points)
+
+
+def matrix_heatmap_figure(matrix, title, symmetric=True):
+    """
+    상관계수/공분산 같은 기업 x 기업 행렬을 히트맵으로 그립니다.
+    symmetric이면 0을 중심으로 양/음을 다른 색으로 표시합니다.
+    """
+    values = matrix.to_numpy()
+    labels = [str(name) for name in matrix.columns]
+    heatmap = go.Heatmap(z=values, x=labels, y=labels, colorscale='RdBu_r' if symmetric else 'Viridis',
+                         zmid=0 if symmetric else None, hoverongaps=False)
+    # 기업 수에 맞춰 높이를 늘리되 너무 커지지 않도록 제한
+    height = int(min(max(400, 18 * len(labels)), 1200))
+    return go.Figure(data=[heatmap], layout=dict(
+        title=title,
+        height=height,
+        yaxis=dict(autorange='reversed'),
+        xaxis=dict(showticklabels=len(labels) <= 60),
+        margin=dict(l=10, r=10, t=50, b=10)
+    ))
+
+
+def price_line_figure(company_name, data, fill=False, max_points=None):
+    """종가(Price) 라인 차트 또는 영역 차트(fill=True)를 만듭니다."""
+    series = data['Price']
+    if max_points is not None:
+        series = downsample_series(series, max_points)
+
+    trace = go.Scatter(x=series.index, y=series.to_numpy(), mode='lines', name='종가')
+    if fill:
+        trace.fill = 'tozeroy'
+    fig = go.Figure(data=[trace])
+    fig.update_layout(
+        title=f"{company_name} 종가 {'영역' if fill else '라인'} 차트",
+        xaxis_title="날짜",
+        yaxis_title="주가",
+        height=500
+    )
+    return fig
+
+
+def candlestick_figure(company_name, data, max_bars=None):
+    """
+    OHLC 캔들스틱 차트를 만듭니다.
+    max_bars가 주어지면 캔들 수가 그 이하가 되도록 주봉/월봉으로 다시 집계합니다.
+    """
+    period_label = ""
+    if max_bars is not None:
+        data, unit = resample_ohlc(data, max_bars)
+        period_label = {'D': "", 'W': " (주봉)", 'M': " (월봉)"}[unit]
+
+    fig = go.Figure(data=[go.Candlestick(
+        x=data.index,
+        open=data['Open'],
+        high=data['High'],
+        low=data['Low'],
+        close=data['Close']
+    )])
+    fig.update_layout(
+        title=f"{company_name} 캔들스틱 차트{period_label}",
+        xaxis_title="날짜",
+        yaxis_title="주가",
+        xaxis_rangeslider_visible=False, # 범위 슬라이더 제거
+        height=500
+    )
+    return fig
+
+
+def add_indicator_overlays(fig, indicator_frames, max_points=None):
+    """가격 차트 위에 겹쳐 그리는 지표(이동 평균, 볼린저 밴드 등)의 선을 추가합니다."""
+    for frame in indicator_frames:
+        for col in frame.columns:
+            series = frame[col]
+            if max_points is not None:
+                series = downsample_series(series, max_points)
+            fig.add_trace(go.Scatter(x=series.index, y=series.to_numpy(), mode='lines', name=col, line=dict(width=1)))
+    return fig
+
+
+def indicator_panel_figure(company_name, indicator_name, frame, max_points=None):
+    """RSI, MACD, 변동성, 낙폭처럼 가격과 단위가 다른 지표를 별도의 작은 차트로 그립니다."""
+    traces = []
+    for col in frame.columns:
+        series = frame[col]
+        if max_points is not None:
+            series = downsample_series(series, max_points)
+        if col == 'MACD Hist':
+            traces.append(go.Bar(x=series.index, y=series.to_numpy(), name=col, opacity=0.5))
+        else:
+            traces.append(go.Scatter(x=series.index, y=series.to_numpy(), mode='lines', name=col,
+                                     fill='tozeroy' if col == 'Drawdown' else None))
+
+    fig = go.Figure(data=traces)
+    if indicator_name == 'RSI':
+        # 과매수(70) / 과매도(30) 기준선
+        for level in (30, 70):
+            fig.add_hline(y=level, line=dict(color="gray", width=1, dash="dot"))
+    fig.update_layout(
+        title=f"{company_name} {indicator_name}",
+        xaxis_title="날짜",
+        hovermode="x unified",
+        height=250,
+        margin=dict(t=40, b=30)
+    )
+    return fig
+
+
+def live_candlestick_figure(company_name):
+    """
+    실시간 모드용 빈 캔들스틱 Figure를 만듭니다.
+    레이아웃은 한 번만 만들고, 이후에는 update_live_figure로 데이터 배열만 바꿉니다.
+    """
+    fig = go.Figure(data=[go.Candlestick(x=[], open=[], high=[], low=[], close=[], name=company_name)])
+    fig.update_layout(
+        title=f"{company_name} 장중 분봉 (실시간)",
+        xaxis_title="시각",
+        yaxis_title="주가",
+        xaxis_rangeslider_visible=False,
+        uirevision=company_name, # 갱신되어도 사용자가 확대/이동한 화면 유지
+        height=500
+    )
+    return fig
+
+
+def update_live_figure(fig, times, values):
+    """실시간 캔들스틱 Figure의 데이터 배열만 교체합니다. (values 열 순서: Open, High, Low, Close)"""
+    fig.data[0].update(x=times, open=values[:, 0], high=values[:, 1], low=values[:, 2], close=values[:, 3])
+    return fig
@@ -0,0 +1,217 @@
+import csv
+import os
+import threading
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+from market_data import default_provider
+
+# 캔들스틱 차트에 필요한 컬럼
+OHLC_COLS = ['Open', 'High', 'Low', 'Close']
+
+# 기본 기업 목록 파일 (ticker,name,default)
+DEFAULT_TICKER_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tickers.csv")
+
+# 한 번의 yf.download 호출로 가져올 최대 티커 수
+DEFAULT_BATCH_SIZE = 20
+
+# 미국 정규장 시간 (뉴욕 현지 시각)
+MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_OPEN = time(9, 30)
+MARKET_CLOSE = time(16, 0)
+# 장중에는 이 간격(분)마다 캐시 키가 바뀌어 새 데이터를 가져옵니다.
+INTRADAY_REFRESH_MINUTES = 15
+
+
+def load_ticker_universe(path=DEFAULT_TICKER_CSV):
+    """
+    ticker,name,default 컬럼을 가진 CSV에서 기업 목록을 읽습니다.
+    반환값은 ({티커: 이름} 전체 목록, {티커: 이름} 기본 선택 목록)이며, 파일의 순서를 유지합니다.
+    """
+    companies, defaults = {}, {}
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            ticker = row['ticker'].strip()
+            if not ticker:
+                continue
+            companies[ticker] = row['name'].strip()
+            if row.get('default', '').strip() in ('1', 'true', 'True', 'yes'):
+                defaults[ticker] = companies[ticker]
+    return companies, defaults
+
+
+def chunked(items, size):
+    """리스트를 size 개씩 잘라 차례로 반환합니다."""
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def prepare_price_frame(data):
+    """
+    원본 주가 DataFrame에서 'Price' 컬럼을 만들어 반환합니다.
+    'Adj Close'가 없으면 'Close'를 사용하고, OHLC가 모두 있으면 함께 포함합니다.
+    """
+    # 데이터가 비어있으면 None 반환
+    if data is None or data.empty:
+        return None
+
+    data = data.copy()
+
+    # 'Adj Close' 컬럼이 있으면 우선 사용, 없으면 'Close' 컬럼 사용
+    if 'Adj Close' in data.columns and not data['Adj Close'].empty:
+        data['Price'] = data['Adj Close']
+    elif 'Close' in data.columns and not data['Close'].empty:
+        data['Price'] = data['Close']
+    else:
+        # 주가 데이터(Price)를 만들 수 없으면 None 반환
+        return None
+
+    # 캔들스틱 차트에 필요한 OHLC (Open, High, Low, Close) 컬럼이 모두 있는지 확인
+    if all(col in data.columns and not data[col].empty for col in OHLC_COLS):
+        # OHLC와 Price 컬럼을 모두 포함하는 DataFrame 반환
+        return data[OHLC_COLS + ['Price']]
+    # OHLC 데이터가 불완전하면 Price 컬럼만 포함하는 DataFrame 반환
+    return data[['Price']]
+
+
+def split_grouped_download(data, tickers):
+    """
+    group_by='ticker'로 한 번에 받은 DataFrame을 티커별 DataFrame으로 나눕니다.
+    데이터가 없는 티커는 None으로 채워집니다.
+    """
+    result = {ticker: None for ticker in tickers}
+    if data is None or data.empty:
+        return result
+
+    if isinstance(data.columns, pd.MultiIndex):
+        available = set(data.columns.get_level_values(0))
+        for ticker in tickers:
+            if ticker in available:
+                # 다른 티커의 거래일 때문에 생긴 빈 행은 제거
+                frame = data[ticker].dropna(how='all')
+                result[ticker] = prepare_price_frame(frame)
+    elif len(tickers) == 1:
+        # 컬럼이 단일 레벨이면 티커 하나짜리 응답
+        result[tickers[0]] = prepare_price_frame(data)
+    return result
+
+
+def download_stock_data(tickers, start_date, end_date, downloader=None, raise_errors=False, timeout=None):
+    """
+    여러 티커의 주식 데이터를 한 번의 그룹 요청으로 가져와 티커별로 나눠 반환합니다.
+    downloader는 yf.download와 같은 시그니처의 함수이며, 생략하면 환경 변수로 정한 공급자
+    (market_data.default_provider)를 사용합니다. 테스트에서는 가짜 함수를 넘길 수 있습니다.
+    timeout(초)을 주면 downloader에 그대로 넘겨 재시도를 포함한 요청 전체의 시간을 제한합니다.
+    요청이 실패하면 모든 티커를 None으로 반환하고, raise_errors가 참이면 예외를 그대로 던집니다.
+    """
+    tickers = list(tickers)
+    if not tickers:
+        return {}
+    if downloader is None:
+        downloader = default_provider().download
+
+    options = {} if timeout is None else {'timeout': timeout}
+    try:
+        # 여러 티커를 한 번에 요청하고, 결과 컬럼을 (티커, 항목) 형태로 받습니다.
+        data = downloader(tickers, start=start_date, end=end_date,
+                          group_by='ticker', progress=False, threads=True, **options)
+    except Exception:
+        if raise_errors:
+            raise
+        # 요청 전체가 실패하면 모든 티커를 None으로 처리
+        return {ticker: None for ticker in tickers}
+
+    return split_grouped_download(data, tickers)
+
+
+def build_price_matrix(frames):
+    """
+    {이름: DataFrame}의 'Price' 컬럼을 한 번의 concat으로 모아 날짜 x 기업 가격 행렬을 만듭니다.
+    컬럼을 하나씩 추가하지 않으므로 인덱스 재정렬과 DataFrame 조각화가 생기지 않습니다.
+    """
+    prices = {name: df['Price'] for name, df in frames.items()
+              if df is not None and 'Price' in df.columns}
+    if not prices:
+        return pd.DataFrame()
+    return pd.concat(prices, axis=1).astype('float64')
+
+
+def normalize_to_base(prices, base=100.0):
+    """
+    각 컬럼을 첫 번째 유효값 기준으로 base(기본 100)로 정규화합니다.
+    상장일이 늦어 첫 행이 NaN인 기업도 자신의 첫 거래일을 기준으로 계산하며,
+    값이 전혀 없는 컬럼은 결과에서 제외합니다.
+    """
+    values = prices.to_numpy(dtype='float64')
+    if values.size == 0:
+        return pd.DataFrame(index=prices.index)
+    valid = ~np.isnan(values)
+    has_data = valid.any(axis=0)
+    first_rows = valid.argmax(axis=0)
+    first_values = values[first_rows, np.arange(values.shape[1])]
+    normalized = values[:, has_data] / first_values[has_data] * base
+    return pd.DataFrame(normalized, index=prices.index, columns=prices.columns[has_data])
+
+
+def is_market_open(now):
+    """now(뉴욕 시각)가 평일 정규장 시간 안에 있는지 확인합니다."""
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+def trading_window(now=None, days=3 * 365):
+    """
+    현재 시각을 캐시 키로 쓸 수 있는 (start_date, end_date, cache_bucket)으로 바꿉니다.
+    날짜는 하루 단위로 고정되고, cache_bucket은 장중에는 INTRADAY_REFRESH_MINUTES 마다,
+    장 마감 후에는 다음 개장 전까지 바뀌지 않아 같은 키로 캐시를 재사용할 수 있습니다.
+    """
+    if now is None:
+        now = datetime.now(MARKET_TZ)
+    else:
+        now = now.astimezone(MARKET_TZ)
+
+    # yfinance의 end는 해당 날짜를 포함하지 않으므로 오늘 데이터까지 받으려면 하루를 더합니다.
+    end_date = now.date() + timedelta(days=1)
+    start_date = end_date - timedelta(days=days)
+
+    if is_market_open(now):
+        slot = (now.hour * 60 + now.minute) // INTRADAY_REFRESH_MINUTES
+        cache_bucket = f"{now.date().isoformat()}#{slot}"
+    elif now.weekday() < 5 and now.time() >= MARKET_CLOSE:
+        # 장 마감 후: 오늘 종가가 확정되었으므로 오늘 날짜로 고정
+        cache_bucket = f"{now.date().isoformat()}#close"
+    else:
+        # 개장 전이나 주말: 마지막 거래일 종가 그대로
+        last_day = now.date() - timedelta(days=1)
+        while last_day.weekday() >= 5:
+            last_day -= timedelta(days=1)
+        cache_bucket = f"{last_day.isoformat()}#close"
+    return start_date, end_date, cache_bucket
+
+
+class CacheStats:
+    """캐시 요청 수와 미스(실제 다운로드) 수를 세는 카운터입니다. 여러 세션이 함께 사용합니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.misses = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    @property
+    def hits(self):
+        return self.requests - self.misses
+
+    @property
+    def hit_rate(self):
+        return self.hits / self.requests if self.requests else 0.0
@@ -0,0 +1,50 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fetch_pipeline import CircuitBreaker, fetch_all
+
+
+def test_timeouts_open_the_breaker():
+    release = threading.Event()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+    def hang(ticker):
+        release.wait()
+
+    with ThreadPoolExecutor(4) as executor:
+        results = list(fetch_all(["A", "B"], hang, executor, timeout=0.1, breaker=breaker))
+        release.set()
+    assert [fetch.status for _, _, fetch in results] == ['timeout', 'timeout']
+    assert breaker.state == 'open'
+
+
+def test_cancelled_queued_tasks_are_not_counted():
+    release = threading.Event()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+    def hang(ticker):
+        release.wait()
+
+    # 작업자 하나: A만 실행되고 B, C는 대기하다 취소되어 공급자에 닿지 않음
+    with ThreadPoolExecutor(1) as executor:
+        results = list(fetch_all(["A", "B", "C"], hang, executor, timeout=0.1, breaker=breaker))
+        release.set()
+    assert [fetch.status for _, _, fetch in results] == ['timeout'] * 3
+    assert (breaker.state, breaker._failures) == ('closed', 1)
+
+
+def test_abandoned_task_is_counted_once():
+    release = threading.Event()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+    def slow_failure():
+        release.wait()
+        raise ConnectionError("down")
+
+    with ThreadPoolExecutor(1) as executor:
+        results = list(fetch_all(["A"], lambda ticker: breaker.call(slow_failure), executor, timeout=0.1,
+                                 breaker=breaker))
+        # 시간 초과로 포기한 작업이 나중에 실패로 끝나도 다시 기록하지 않음
+        release.set()
+    assert [fetch.status for _, _, fetch in results] == ['timeout']
+    assert (breaker.state, breaker._failures) == ('closed', 1)
@@ -0,0 +1,18 @@
+import pandas as pd
+import pytest
+
+from frame_cache import SharedFrameCache
+
+
+def test_cached_frames_are_read_only_and_counted():
+    cache = SharedFrameCache()
+    load = lambda: pd.DataFrame({'Price': [1.0, 2.0]}, index=pd.date_range("2024-01-01", periods=2))
+    frame = cache.get_or_load("AAA", load)
+    assert cache.get_or_load("AAA", load) is frame
+    assert (cache.stats.requests, cache.stats.misses, cache.stats.hits) == (2, 1, 1)
+
+    with pytest.raises(ValueError):
+        frame.loc[frame.index[0], 'Price'] = 0.0
+    edited = frame.copy()
+    edited.loc[edited.index[0], 'Price'] = 0.0
+    assert frame['Price'].iloc[0] == 1.0
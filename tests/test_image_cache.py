@@ -0,0 +1,116 @@
+import gc
+import http.server
+import io
+import threading
+
+import pytest
+from PIL import Image
+
+from image_cache import ImageCache, format_health_report
+
+
+def make_jpeg(color):
+    out = io.BytesIO()
+    Image.new('RGB', (1200, 900), color).save(out, format='JPEG')
+    return out.getvalue()
+
+
+@pytest.fixture
+def server():
+    """/photo.jpg (ETag 지원), /missing.jpg (404)를 제공하는 로컬 HTTP 서버. 받은 요청을 기록합니다."""
+    images = {'/photo.jpg': (make_jpeg('red'), '"v1"')}
+    requests = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests.append((self.path, self.headers.get('If-None-Match')))
+            if self.path not in images:
+                self.send_error(404)
+                return
+            body, etag = images[self.path]
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/jpeg')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('ETag', etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    httpd.base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.images, httpd.requests = images, requests
+    yield httpd
+    httpd.shutdown()
+
+
+def test_second_get_is_served_from_cache(tmp_path, server):
+    cache = ImageCache(str(tmp_path))
+    url = server.base + '/photo.jpg'
+    path = cache.get(url)
+
+    assert path is not None and cache.get(url) == path
+    assert len(server.requests) == 1
+    with Image.open(path) as thumb:
+        assert max(thumb.size) <= 800
+    # 다 쓴 URL별 잠금은 남지 않음
+    gc.collect()
+    assert len(cache._url_locks) == 0
+
+
+def test_refetch_uses_etag(tmp_path, server):
+    cache = ImageCache(str(tmp_path))
+    url = server.base + '/photo.jpg'
+    path = cache.get(url)
+
+    record = cache.fetch(url)
+    assert server.requests[-1] == ('/photo.jpg', '"v1"')
+    assert (record['status'], record['http_status'], record['thumb_path']) == ('ok', 304, path)
+
+    # 내용이 바뀌면 새 ETag와 새 썸네일을 받음
+    server.images['/photo.jpg'] = (make_jpeg('blue'), '"v2"')
+    record = cache.fetch(url)
+    assert (record['http_status'], record['etag']) == (200, '"v2"')
+    assert record['thumb_path'] != path
+    assert cache.get(url) == record['thumb_path']
+
+
+def test_failed_download_is_not_retried_until_retry_after(tmp_path, server):
+    cache = ImageCache(str(tmp_path), retry_after=3600)
+    url = server.base + '/missing.jpg'
+
+    assert cache.get(url) is None
+    assert cache.get(url) is None
+    assert len(server.requests) == 1
+    record = cache.status(url)
+    assert (record['status'], record['http_status']) == ('error', 404)
+
+    cache.retry_after = 0
+    assert cache.get(url) is None
+    assert len(server.requests) == 2
+
+
+def test_failed_refetch_keeps_existing_thumbnail(tmp_path, server):
+    cache = ImageCache(str(tmp_path), retry_after=3600)
+    url = server.base + '/photo.jpg'
+    path = cache.get(url)
+
+    # 서버에서 이미지가 사라져 다시 받기(report)가 실패해도 예전 썸네일을 계속 씀
+    del server.images['/photo.jpg']
+    record = cache.prewarm([url], force=True)[0]
+    assert (record['status'], record['thumb_path'], record['http_status']) == ('ok', path, 404)
+    assert record['error'] == "HTTP 404 Not Found"
+    assert cache.get(url) == path
+    assert "stale" in format_health_report([record]) and "0/1 links OK" in format_health_report([record])
+
+    # 다시 받기에 성공하면 오류 기록이 지워짐
+    server.images['/photo.jpg'] = (make_jpeg('red'), '"v1"')
+    record = cache.fetch(url)
+    assert (record['status'], record['http_status'], record['error']) == ('ok', 304, None)
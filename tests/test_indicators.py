@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import IndicatorEngine, ema, rsi, sma
+
+
+def make_prices(n=300, seed=0):
+    values = 100 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.01, n)))
+    return pd.Series(values, index=pd.bdate_range("2023-01-02", periods=n))
+
+
+@pytest.mark.parametrize("func, params", [(sma, {'window': 20}), (ema, {'span': 20}), (rsi, {'window': 14})])
+@pytest.mark.parametrize("split", [1, 2, 150, 299])
+def test_incremental_matches_full(func, params, split):
+    values = make_prices().to_numpy()
+    full, _ = func(values, **params)
+    head, state = func(values[:split], **params)
+    # 나머지를 한 봉씩 이어서 계산
+    parts = [head]
+    for i in range(split, len(values)):
+        part, state = func(values[i:i + 1], state=state, **params)
+        parts.append(part)
+    for name, expected in full.items():
+        np.testing.assert_allclose(np.concatenate([p[name] for p in parts]), expected, rtol=1e-9)
+
+
+def test_rsi_single_bar_returns_state():
+    result, state = rsi(np.array([10.0]))
+    assert np.isnan(result['RSI']).all() and len(result['RSI']) == 1
+    assert state is not None and state[0] == 10.0
+
+
+def test_engine_recomputes_when_history_is_revised():
+    prices = make_prices()
+    engine = IndicatorEngine()
+    engine.compute("AAA", "SMA", prices.iloc[:-5])
+    engine.compute("AAA", "SMA", prices)
+    assert (engine.full_computes, engine.incremental_updates) == (1, 1)
+
+    # 과거 봉 하나만 바뀌고 마지막 봉은 그대로인 경우도 전체 재계산
+    revised = prices.copy()
+    revised.iloc[10] *= 1.1
+    frame = engine.compute("AAA", "SMA", revised)
+    assert engine.full_computes == 2
+    expected, _ = sma(revised.to_numpy(), window=20)
+    np.testing.assert_allclose(frame['SMA'].to_numpy(), expected['SMA'])
+
+
+@pytest.mark.parametrize("name", ['SMA', 'EMA', 'Bollinger', 'RSI', 'MACD', 'Volatility', 'Drawdown'])
+def test_engine_shifted_window_matches_cold_engine(name):
+    prices = make_prices()
+    warm = IndicatorEngine()
+    warm.compute("AAA", name, prices.iloc[:250])
+    # 기간 시작이 5봉 뒤로 밀리고 새 봉 하나가 늘어난 요청
+    shifted = prices.iloc[5:251]
+    pd.testing.assert_frame_equal(warm.compute("AAA", name, shifted), IndicatorEngine().compute("AAA", name, shifted))
@@ -0,0 +1,48 @@
+import threading
+import time
+
+import pytest
+
+from market_data import FetchPolicy, MarketDataProvider, SyntheticProvider
+
+
+class HangingProvider(MarketDataProvider):
+    """release가 set될 때까지 응답하지 않는 공급자."""
+    name = "hanging"
+
+    def __init__(self, policy):
+        super().__init__(policy)
+        self.release = threading.Event()
+
+    def _fetch(self, tickers, start, end):
+        self.release.wait()
+        return SyntheticProvider()._fetch(tickers, start, end)
+
+
+def test_hung_fetch_keeps_its_slot_until_it_finishes():
+    provider = HangingProvider(FetchPolicy(retries=0, timeout=0.1, max_concurrency=2))
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            provider.download(["AAA"], "2024-01-01", "2024-02-01")
+    # 멈춘 요청 두 개가 슬롯을 모두 차지하므로 새 요청은 작업 스레드에 들어가지 못함
+    calls = provider.calls
+    with pytest.raises(TimeoutError, match="동시 요청"):
+        provider.download(["AAA"], "2024-01-01", "2024-02-01")
+    assert provider.calls == calls
+
+    provider.release.set()
+    time.sleep(0.1)
+    assert not provider.download(["AAA"], "2024-01-01", "2024-02-01").empty
+
+
+def test_timeout_bounds_retries_and_backoff():
+    provider = SyntheticProvider(latency=0.5, policy=FetchPolicy(retries=5, backoff=0.1, timeout=0.3))
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        provider.download(["AAA"], "2024-01-01", "2024-02-01", timeout=1.0)
+    assert time.monotonic() - started < 1.2
+
+
+def test_base_provider_is_abstract():
+    with pytest.raises(TypeError):
+        MarketDataProvider()
@@ -0,0 +1,79 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from price_store import PriceStore
+
+
+class FakeDownloader:
+    """yf.download처럼 (티커, 항목) 컬럼 DataFrame을 돌려주는 가짜 다운로더. scale로 수정 주가를 흉내 냅니다."""
+
+    def __init__(self):
+        self.scale = 1.0
+        self.requests = []
+        # 이 시작일로 오는 요청은 실패시킴
+        self.fail_from = None
+
+    def __call__(self, tickers, start=None, end=None, **kwargs):
+        self.requests.append((tuple(tickers), pd.Timestamp(start).date(), pd.Timestamp(end).date()))
+        if pd.Timestamp(start).date() == self.fail_from:
+            raise ConnectionError("down")
+        index = pd.bdate_range(start, end, inclusive='left', name='Date')
+        # 날짜마다 고정된 가격 (요청 구간과 관계없이 같은 날은 같은 값)
+        close = (100.0 + (index - pd.Timestamp("2024-01-01")).days.to_numpy()) * self.scale
+        return pd.concat({ticker: pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close},
+                                               index=index) for ticker in tickers}, axis=1)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceStore(str(tmp_path))
+
+
+def test_sync_fetches_only_new_days(store):
+    downloader = FakeDownloader()
+    store.sync(["AAA"], date(2024, 1, 1), date(2024, 2, 1), downloader=downloader)
+    store.sync(["AAA"], date(2024, 1, 1), date(2024, 3, 1), downloader=downloader)
+
+    # 두 번째 요청은 마지막 저장일(1월 31일)부터만 받음
+    assert downloader.requests[1][1] == date(2024, 1, 31)
+    assert len(downloader.requests) == 2
+    loaded = store.load("AAA", date(2024, 1, 1), date(2024, 3, 1))
+    assert loaded.index[0] == pd.Timestamp("2024-01-01")
+    assert loaded.index[-1] == pd.Timestamp("2024-02-29")
+
+
+def test_sync_refetches_full_history_after_adjustment(store):
+    downloader = FakeDownloader()
+    store.sync(["AAA"], date(2024, 1, 1), date(2024, 2, 1), downloader=downloader)
+
+    # 2:1 분할 뒤 공급자가 과거 가격까지 절반으로 수정해 돌려줌
+    downloader.scale = 0.5
+    store.sync(["AAA"], date(2024, 1, 1), date(2024, 3, 1), downloader=downloader)
+
+    assert downloader.requests[-1][1:] == (date(2024, 1, 1), date(2024, 3, 1))
+    loaded = store.load("AAA", date(2024, 1, 1), date(2024, 3, 1))
+    expected = downloader(["AAA"], date(2024, 1, 1), date(2024, 3, 1))["AAA"]["Close"]
+    np.testing.assert_allclose(loaded["Close"].to_numpy(), expected.to_numpy())
+    assert store.coverage(["AAA"])["AAA"] == (date(2024, 1, 1), date(2024, 3, 1))
+
+
+@pytest.mark.parametrize("raise_errors", [False, True])
+def test_failed_refetch_keeps_stored_rows(store, raise_errors):
+    downloader = FakeDownloader()
+    store.sync(["AAA"], date(2024, 1, 1), date(2024, 2, 1), downloader=downloader)
+    before = store.load("AAA", date(2024, 1, 1), date(2024, 2, 1))
+
+    # 수정 주가가 감지되지만 전체 기간 다시 받기는 실패
+    downloader.scale = 0.5
+    downloader.fail_from = date(2024, 1, 1)
+    if raise_errors:
+        with pytest.raises(ConnectionError):
+            store.sync(["AAA"], date(2024, 1, 1), date(2024, 3, 1), downloader=downloader, raise_errors=True)
+    else:
+        store.sync(["AAA"], date(2024, 1, 1), date(2024, 3, 1), downloader=downloader)
+
+    pd.testing.assert_frame_equal(store.load("AAA", date(2024, 1, 1), date(2024, 2, 1)), before)
+    assert store.coverage(["AAA"])["AAA"] == (date(2024, 1, 1), date(2024, 2, 1))
@@ -0,0 +1,55 @@
+import sqlite3
+import time
+
+import pytest
+
+from quiz_store import QuizSession, QuizStore
+
+QUESTION = {'correct_a_sign': "양수", 'correct_b_sign': "음수", 'correct_c_sign': "0"}
+
+
+def test_timer_flushes_idle_buffer(tmp_path):
+    store = QuizStore(str(tmp_path), batch_size=100, flush_interval=0.2)
+    quiz = QuizSession("s1", difficulty="쉬움")
+    correct = store.record_answer(quiz, QUESTION, {'a': "양수", 'b': "양수", 'c': "0"})
+    assert correct == {'a': True, 'b': False, 'c': True}
+    assert store.totals() == (0, 0, 0)
+
+    # 다른 요청이 없어도 flush_interval 뒤에는 기록됨
+    deadline = time.monotonic() + 5
+    while store.totals()[0] == 0 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert store.totals() == (1, 1, 0)
+
+
+def test_totals_cover_all_students(tmp_path):
+    store = QuizStore(str(tmp_path), batch_size=1000)
+    for i in range(250):
+        store.record_answer(QuizSession(f"s{i}", student=f"학생{i}", difficulty="쉬움"), QUESTION,
+                            {'a': "양수", 'b': "음수", 'c': "0" if i % 2 else "양수"})
+    store.flush()
+    assert store.totals() == (250, 250, 125)
+    assert len(store.student_summary(limit=200)) == 200
+
+
+def test_failed_flush_keeps_pending_rows(tmp_path, monkeypatch):
+    store = QuizStore(str(tmp_path), batch_size=100, flush_interval=60)
+    quiz = QuizSession("s1", difficulty="쉬움", question_number=1)
+    store.save_session(quiz)
+    store.record_answer(quiz, QUESTION, {'a': "양수", 'b': "음수", 'c': "0"})
+
+    def locked():
+        raise sqlite3.OperationalError("database is locked")
+
+    connect = store._connect
+    monkeypatch.setattr(store, '_connect', locked)
+    with pytest.raises(sqlite3.OperationalError):
+        store.flush()
+
+    # 실패한 뒤 쌓인 상태가 더 최신이므로 그것을 씀
+    quiz.question_number = 2
+    store.save_session(quiz)
+    monkeypatch.setattr(store, '_connect', connect)
+    store.flush()
+    assert store.totals() == (1, 1, 1)
+    assert store.load_session("s1").question_number == 2
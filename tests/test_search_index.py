@@ -0,0 +1,13 @@
+from search_index import _JAMO_PREFIX, tokenize
+
+
+def test_tokenize_adds_jamo_bigrams_for_each_hangul_word():
+    tokens = tokenize("에펠 탑 Louvre")
+    assert {"에펠", "탑", "lo", "re"} <= set(tokens)
+    jamo_tokens = [token for token in tokens if token.startswith(_JAMO_PREFIX)]
+    # "에펠"(자모 5개 -> 2-gram 4개)과 "탑"(자모 3개 -> 2-gram 2개) 모두 자모 2-gram을 만듦
+    assert len(jamo_tokens) == 6
+
+
+def test_tokenize_without_jamo():
+    assert not [token for token in tokenize("에펠 탑", jamo=False) if token.startswith(_JAMO_PREFIX)]
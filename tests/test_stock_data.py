@@ -0,0 +1,82 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from frame_cache import SharedFrameCache
+from price_store import PriceStore
+from stock_data import DEFAULT_BATCH_SIZE, CacheStats, download_stock_data
+
+
+class FakeDownloader:
+    """yf.download처럼 (티커, 항목) 컬럼 DataFrame을 돌려주는 가짜 다운로더. missing의 티커는 응답에서 빠집니다."""
+
+    def __init__(self, missing=(), error=None):
+        self.missing = set(missing)
+        self.error = error
+        self.batches = []
+
+    def __call__(self, tickers, start=None, end=None, **kwargs):
+        self.batches.append(list(tickers))
+        if self.error is not None:
+            raise self.error
+        index = pd.bdate_range(start, end, inclusive='left', name='Date')
+        close = [100.0 + i for i in range(len(index))]
+        return pd.concat({ticker: pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close},
+                                               index=index)
+                          for ticker in tickers if ticker not in self.missing}, axis=1)
+
+
+def test_sync_requests_tickers_in_batches(tmp_path):
+    downloader = FakeDownloader()
+    tickers = [f"T{i:02d}" for i in range(45)]
+    PriceStore(str(tmp_path)).sync(tickers, date(2024, 1, 1), date(2024, 2, 1), downloader=downloader)
+
+    assert DEFAULT_BATCH_SIZE == 20
+    assert [len(batch) for batch in downloader.batches] == [20, 20, 5]
+    assert [t for batch in downloader.batches for t in batch] == tickers
+
+
+def test_partial_failure_returns_none_for_missing_tickers():
+    downloader = FakeDownloader(missing={"BBB"})
+    result = download_stock_data(["AAA", "BBB", "CCC"], date(2024, 1, 1), date(2024, 2, 1), downloader=downloader)
+
+    assert list(result) == ["AAA", "BBB", "CCC"]
+    assert result["BBB"] is None
+    assert list(result["AAA"].columns) == ['Open', 'High', 'Low', 'Close', 'Price']
+    assert len(result["CCC"]) == 23
+
+
+def test_failed_request_returns_none_or_raises():
+    downloader = FakeDownloader(error=ConnectionError("down"))
+    result = download_stock_data(["AAA", "BBB"], date(2024, 1, 1), date(2024, 2, 1), downloader=downloader)
+    assert result == {"AAA": None, "BBB": None}
+
+    with pytest.raises(ConnectionError):
+        download_stock_data(["AAA"], date(2024, 1, 1), date(2024, 2, 1), downloader=downloader, raise_errors=True)
+
+
+def test_sync_keeps_stored_rows_when_a_batch_fails(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.sync(["AAA"], date(2024, 1, 1), date(2024, 2, 1), downloader=FakeDownloader())
+    store.sync(["AAA", "BBB"], date(2024, 1, 1), date(2024, 3, 1), downloader=FakeDownloader(error=TimeoutError()))
+
+    assert store.coverage(["AAA", "BBB"]) == {"AAA": (date(2024, 1, 1), date(2024, 2, 1))}
+    assert len(store.load("AAA", date(2024, 1, 1), date(2024, 2, 1))) == 23
+
+
+def test_cache_stats_counts_hits_and_misses():
+    stats = CacheStats()
+    assert stats.hit_rate == 0.0
+    cache = SharedFrameCache(stats=stats)
+    downloader = FakeDownloader()
+
+    def load(ticker):
+        return download_stock_data([ticker], date(2024, 1, 1), date(2024, 2, 1), downloader=downloader)[ticker]
+
+    for ticker in ["AAA", "BBB", "AAA", "AAA"]:
+        cache.get_or_load(ticker, lambda: load(ticker))
+
+    assert (stats.requests, stats.misses, stats.hits) == (4, 2, 2)
+    assert stats.hit_rate == 0.5
+    assert len(downloader.batches) == 2